@@ -0,0 +1 @@
+"""Benchmarks and load harnesses for the weather services."""
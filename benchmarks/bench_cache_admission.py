@@ -0,0 +1,117 @@
+"""Hit ratio of the weather cache with LRU vs. TinyLFU admission.
+
+Replays city lookups through ``TTLCache`` the way ``WeatherAPI`` does (a get,
+then a set on a miss) and reports the hit ratio and per-lookup cost of each
+policy. The synthetic trace draws cities with Zipfian popularity and mixes
+in bursts of one-off cities, like a large ``/multi-weather`` call; recorded
+traces are text files with one city per line or JSON lines with a ``city``
+field (a JSON access log, for instance)::
+
+    python -m benchmarks.bench_cache_admission --cache-size 500
+    python -m benchmarks.bench_cache_admission --trace access.log --trace cities.txt
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from benchmarks.common import city_names, zipf_sampler
+from src.utils.cache import TTLCache
+
+
+def zipf_trace(
+    lookups: int, cities: int, exponent: float, scan_every: int, scan_length: int, seed: int = 7
+) -> List[str]:
+    """Zipfian lookups with a burst of ``scan_length`` unseen cities every ``scan_every``."""
+
+    sample = zipf_sampler(city_names(cities), exponent=exponent, seed=seed)
+    trace: List[str] = []
+    scans = 0
+    while len(trace) < lookups:
+        for _ in range(scan_every or lookups):
+            trace.append(sample())
+        if scan_every:
+            trace.extend(f"scan-{scans}-{index}" for index in range(scan_length))
+            scans += 1
+    return trace[:lookups]
+
+
+def load_trace(path: Path) -> List[str]:
+    trace: List[str] = []
+    with open(path, encoding="utf-8") as stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    city = json.loads(line).get("city")
+                except ValueError:
+                    continue
+                if city:
+                    trace.append(str(city).strip().lower())
+            else:
+                trace.append(line.lower())
+    return trace
+
+
+def replay(trace: Iterable[str], cache_size: int, admission: str) -> Tuple[float, float, TTLCache]:
+    """Return (hit ratio, µs per lookup, cache) for one policy."""
+
+    cache = TTLCache(maxsize=cache_size, ttl=3600, stale_ttl=0, admission=admission)
+    lookups = 0
+    started = time.perf_counter()
+    for city in trace:
+        key = ("weather", city)
+        if cache.get(key) is None:
+            cache.set(key, city)
+        lookups += 1
+    elapsed = time.perf_counter() - started
+    stats = cache.stats()
+    return stats["hits"] / max(lookups, 1), elapsed / max(lookups, 1) * 1e6, cache
+
+
+def report(label: str, trace: List[str], cache_size: int) -> None:
+    print(f"\n{label}: {len(trace)} lookups, {len(set(trace))} distinct cities, cache {cache_size}")
+    print(f"{'policy':<10}{'hit ratio':>11}{'µs/lookup':>11}{'rejected':>10}")
+    for admission in ("lru", "tinylfu"):
+        ratio, cost, cache = replay(trace, cache_size, admission)
+        rejected = cache.stats().get("rejected", 0)
+        print(f"{admission:<10}{ratio:>11.3f}{cost:>11.2f}{rejected:>10}")
+        if admission == "tinylfu":
+            hot = ", ".join(f"{key[1]} ({count})" for key, count in cache.heavy_hitters(5))
+            print(f"  heavy hitters: {hot}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-size", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--cities", type=int, default=20_000)
+    parser.add_argument("--exponent", type=float, default=0.9, help="Zipf exponent")
+    parser.add_argument("--scan-every", type=int, default=2_000, help="lookups between scans (0: none)")
+    parser.add_argument("--scan-length", type=int, default=500)
+    parser.add_argument("--trace", type=Path, action="append", default=[], help="recorded trace file")
+    args = parser.parse_args(argv)
+
+    report(
+        f"zipf {args.exponent}",
+        zipf_trace(args.lookups, args.cities, args.exponent, 0, 0),
+        args.cache_size,
+    )
+    if args.scan_every:
+        report(
+            f"zipf {args.exponent} + scans of {args.scan_length}",
+            zipf_trace(args.lookups, args.cities, args.exponent, args.scan_every, args.scan_length),
+            args.cache_size,
+        )
+    for path in args.trace:
+        report(str(path), load_trace(path), args.cache_size)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
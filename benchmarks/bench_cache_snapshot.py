@@ -0,0 +1,81 @@
+"""Snapshot and warm-start load time of the weather cache.
+
+Fills a cache with ``--entries`` synthetic cities (current weather plus a
+share of 40-entry forecasts), writes a snapshot and loads it into an empty
+cache, reporting file size and timings. A second load runs with half of the
+entries expired to show that they are skipped without being decoded::
+
+    python -m benchmarks.bench_cache_snapshot --entries 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.common import city_names, synthetic_current, synthetic_forecast
+from src.utils import cache_snapshot
+from src.utils.cache import TTLCache
+from src.utils.cache_snapshot import CacheSnapshotter
+from src.utils.decoding import decode_current, decode_forecast
+
+
+def _fill(entries: int, forecast_share: float, expired_share: float) -> TTLCache:
+    cache = TTLCache(maxsize=entries, ttl=300, stale_ttl=0)
+    cities = city_names(entries)
+    forecasts = int(entries * forecast_share)
+    # Decoding is shared between cities; the cache holds references.
+    current = decode_current(json.dumps(synthetic_current(cities[0])).encode())
+    forecast = decode_forecast(json.dumps(synthetic_forecast(cities[0])).encode())
+    expired = int(entries * expired_share)
+    for index, city in enumerate(cities):
+        ttl = -1 if index < expired else 300
+        if index < forecasts:
+            cache.set(("forecast", city), forecast, ttl=ttl)
+        else:
+            cache.set(("weather", city), current, ttl=ttl)
+    return cache
+
+
+def _measure(label: str, cache: TTLCache, path: Path, repeat: int) -> None:
+    snapshotter = CacheSnapshotter(cache, path)
+    saves, loads = [], []
+    loaded = 0
+    for _ in range(repeat):
+        path.unlink(missing_ok=True)
+        started = time.perf_counter()
+        snapshotter.save()
+        saves.append(time.perf_counter() - started)
+
+        target = TTLCache(maxsize=cache.maxsize, ttl=300, stale_ttl=0)
+        started = time.perf_counter()
+        loaded = CacheSnapshotter(target, path).load()
+        loads.append(time.perf_counter() - started)
+    print(
+        f"{label:<22}{snapshotter.saved:>9}{path.stat().st_size / 1e6:>9.1f}"
+        f"{min(saves) * 1000:>10.0f}{loaded:>9}{min(loads) * 1000:>10.0f}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--forecast-share", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    codec = "msgpack" if cache_snapshot.msgspec is not None else "json"
+    print(f"codec: {codec}")
+    print(f"{'cache':<22}{'saved':>9}{'MB':>9}{'save ms':>10}{'loaded':>9}{'load ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "snapshot.bin"
+        _measure("all fresh", _fill(args.entries, args.forecast_share, 0.0), path, args.repeat)
+        _measure("half expired", _fill(args.entries, args.forecast_share, 0.5), path, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Parse cost per payload: typed ``msgspec`` decoding vs. the dict path.
+
+    python -m benchmarks.bench_decoding
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Callable, List
+
+from benchmarks.common import synthetic_current, synthetic_forecast
+from src.utils import decoding
+
+
+def _dict_current(raw: bytes):
+    return decoding.parse_current(decoding.load_payload(raw))
+
+
+def _dict_forecast(raw: bytes):
+    return [decoding.parse_forecast_entry(item) for item in decoding.load_payload(raw).get("list", [])]
+
+
+def _per_call_us(func: Callable[[bytes], object], raw: bytes, number: int) -> float:
+    best = min(timeit.repeat(lambda: func(raw), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if decoding.msgspec is None:
+        raise SystemExit("msgspec is not installed; only the dict path is available.")
+
+    current = json.dumps(synthetic_current("benchmark city")).encode()
+    forecast = json.dumps(synthetic_forecast("benchmark city", entries=40)).encode()
+    assert decoding.decode_current(current) == _dict_current(current)
+    assert decoding.decode_forecast(forecast) == _dict_forecast(forecast)
+
+    rows = [
+        ("current", current, _dict_current, decoding.decode_current, args.number),
+        ("forecast (40)", forecast, _dict_forecast, decoding.decode_forecast, max(args.number // 10, 1)),
+    ]
+    print(f"{'payload':<16}{'bytes':>8}{'dict µs':>12}{'typed µs':>12}{'speedup':>10}")
+    for name, raw, slow, fast, number in rows:
+        slow_us = _per_call_us(slow, raw, number)
+        fast_us = _per_call_us(fast, raw, number)
+        print(f"{name:<16}{len(raw):>8}{slow_us:>12.2f}{fast_us:>12.2f}{slow_us / fast_us:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
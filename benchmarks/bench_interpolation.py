@@ -0,0 +1,81 @@
+"""Throughput and accuracy of cache-based weather interpolation.
+
+Fills a cache with ``--stations`` synthetic observations of a smooth
+temperature field (warmer towards the equator, with regional waves). It then
+estimates ``--points`` random points in one batch and reports the time per
+batch, the share of points estimated, and the mean absolute error against
+the true field::
+
+    python -m benchmarks.bench_interpolation --stations 5000 --points 10000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.utils import interpolation
+from src.utils.cache import TTLCache
+from src.utils.interpolation import WeatherInterpolator
+from src.utils.models import WeatherData
+
+
+def field(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    return 30 * np.cos(lat) - 5 + 3 * np.sin(6 * lon) * np.cos(4 * lat)
+
+
+def _cache(stations: int, rng: np.random.Generator) -> TTLCache:
+    cache = TTLCache(maxsize=stations, ttl=600)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-0.9, 0.9, stations)))
+    longitudes = rng.uniform(-180, 180, stations)
+    for index, (lat, lon, temp) in enumerate(zip(latitudes, longitudes, field(latitudes, longitudes))):
+        cache.set(
+            ("weather", f"station-{index}"),
+            WeatherData(
+                f"station-{index}", float(temp), float(temp), 1013, 60, 4.0, "", "01d", 0, 0, 0, 0.0,
+                latitude=float(lat), longitude=float(lon),
+            ),
+        )
+    return cache
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--max-km", type=float, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(7)
+    backend = "cKDTree" if interpolation.cKDTree is not None else "numpy brute force"
+    print(f"neighbour search: {backend}")
+    print(f"{'stations':>9}{'points':>9}{'build ms':>10}{'batch ms':>10}{'estimated':>11}{'MAE °C':>9}{'confidence':>12}")
+    for stations in args.stations:
+        interpolator = WeatherInterpolator(_cache(stations, rng), max_distance_km=args.max_km)
+        started = time.perf_counter()
+        interpolator.index()
+        build = time.perf_counter() - started
+
+        latitudes = np.degrees(np.arcsin(rng.uniform(-0.9, 0.9, args.points)))
+        longitudes = rng.uniform(-180, 180, args.points)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            columns = interpolator.estimate_many(latitudes, longitudes)
+            timings.append(time.perf_counter() - started)
+        estimated = columns["estimated"]
+        error = np.abs(columns["temperature"][estimated] - field(latitudes, longitudes)[estimated])
+        print(
+            f"{stations:>9}{args.points:>9}{build * 1000:>10.1f}{min(timings) * 1000:>10.1f}"
+            f"{estimated.mean():>11.1%}{error.mean():>9.2f}{columns['confidence'][estimated].mean():>12.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Per-request cost of access logging: synchronous vs. queued, text vs. JSON.
+
+Several threads emit one access-log record per simulated request, as the
+web services do, into a sink that blocks for ``--sink-latency``
+microseconds per write (a slow pipe or disk). The time each request spends
+inside the logging call is reported for every mode::
+
+    python -m benchmarks.bench_logging --threads 8 --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from src.utils import logging_utils
+from src.utils.logging_utils import ACCESS_LOGGER, configure_logging, request_id
+
+MODES = {
+    "text, sync": dict(fmt="text", use_queue=False, access_sample=1.0),
+    "json, sync": dict(fmt="json", use_queue=False, access_sample=1.0),
+    "json, queued": dict(fmt="json", use_queue=True, access_sample=1.0),
+    "json, queued, 10%": dict(fmt="json", use_queue=True, access_sample=0.1),
+}
+
+
+class SlowSink:
+    """A stream whose writes block like a congested pipe."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _reset() -> None:
+    logging_utils.shutdown_logging()
+    for name in ("weather_app", ACCESS_LOGGER):
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.filters.clear()
+
+
+def _run(threads: int, requests: int) -> List[float]:
+    access_log = logging.getLogger(ACCESS_LOGGER)
+    samples: List[float] = []
+    lock = threading.Lock()
+
+    def client() -> None:
+        local: List[float] = []
+        for index in range(requests):
+            token = request_id.set(uuid.uuid4().hex)
+            started = time.perf_counter()
+            access_log.info(
+                "%s %s %s %.1fms",
+                "GET",
+                "/weather",
+                200,
+                1.5,
+                extra={"method": "GET", "path": "/weather", "status": 200, "duration_ms": 1.5, "client": "10.0.0.1"},
+            )
+            local.append(time.perf_counter() - started)
+            request_id.reset(token)
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return samples
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per thread")
+    parser.add_argument("--sink-latency", type=float, default=50, help="microseconds per write")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<20}{'mean µs':>10}{'p99 µs':>10}{'written':>10}{'dropped':>10}{'flush s':>10}")
+    original_stderr = sys.stderr
+    for mode, options in MODES.items():
+        sink = SlowSink(args.sink_latency / 1e6)
+        _reset()
+        sys.stderr = sink
+        try:
+            configure_logging(**options)
+        finally:
+            sys.stderr = original_stderr
+        samples = _run(args.threads, args.requests)
+        dropped = logging_utils.dropped_records() if options["use_queue"] else 0
+        started = time.perf_counter()
+        _reset()
+        flush = time.perf_counter() - started
+        samples.sort()
+        print(
+            f"{mode:<20}{statistics.fmean(samples) * 1e6:>10.1f}"
+            f"{samples[int(len(samples) * 0.99)] * 1e6:>10.1f}"
+            f"{sink.lines:>10}{dropped:>10}{flush:>10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
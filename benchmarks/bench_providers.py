@@ -0,0 +1,93 @@
+"""Latency of single-provider, failover and raced lookups with local providers.
+
+Two in-process stand-in providers with different latency distributions
+(fixed latency plus an exponential tail) answer ``--requests`` weather
+lookups from ``--threads`` threads. Each setup is reported with its
+latency percentiles, error share, and how often each provider won::
+
+    python -m benchmarks.bench_providers --requests 400 --failure-rate 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.utils.exceptions import WeatherError
+from src.utils.providers import LocalProvider, ProviderPool
+
+
+def _providers(args: argparse.Namespace, failure_rate: float) -> List[LocalProvider]:
+    return [
+        LocalProvider("primary", latency=args.primary_ms / 1000, jitter=args.primary_tail_ms / 1000,
+                      failure_rate=failure_rate, seed=1),
+        LocalProvider("secondary", latency=args.secondary_ms / 1000, jitter=args.secondary_tail_ms / 1000, seed=2),
+    ]
+
+
+def _run(pool: ProviderPool, race: bool, requests: int, threads: int, timeout: float) -> Dict[str, float]:
+    samples: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def client(offset: int) -> None:
+        nonlocal errors
+        local, failed = [], 0
+        for index in range(offset, requests, threads):
+            started = time.perf_counter()
+            try:
+                pool.fetch("weather", {"q": f"city-{index % 50}"}, timeout, race=race)
+            except WeatherError:
+                failed += 1
+            local.append(time.perf_counter() - started)
+        with lock:
+            samples.extend(local)
+            errors += failed
+
+    workers = [threading.Thread(target=client, args=(offset,)) for offset in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    samples.sort()
+    return {
+        "p50": statistics.median(samples) * 1000,
+        "p95": samples[int(len(samples) * 0.95)] * 1000,
+        "p99": samples[int(len(samples) * 0.99)] * 1000,
+        "errors": errors / len(samples),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--primary-ms", type=float, default=30)
+    parser.add_argument("--primary-tail-ms", type=float, default=40)
+    parser.add_argument("--secondary-ms", type=float, default=45)
+    parser.add_argument("--secondary-tail-ms", type=float, default=10)
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="primary's failure share")
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    setups = [
+        ("primary only", lambda: _providers(args, args.failure_rate)[:1], False),
+        ("failover", lambda: _providers(args, args.failure_rate), False),
+        ("race", lambda: _providers(args, args.failure_rate), True),
+    ]
+    print(f"{'setup':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}  wins")
+    for label, build, race in setups:
+        pool = ProviderPool(build())
+        result = _run(pool, race, args.requests, args.threads, args.timeout)
+        wins = ", ".join(f"{name} {stats['wins']}" for name, stats in pool.stats().items())
+        print(
+            f"{label:<14}{result['p50']:>9.1f}{result['p95']:>9.1f}{result['p99']:>9.1f}"
+            f"{result['errors']:>9.1%}  {wins if race else '-'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""Latency of the voice flow: sequential vs. pipelined, cold vs. cached phrases.
+
+Speech engines are replaced by stubs that sleep for a duration proportional
+to the words spoken, and the weather API by a replay archive with simulated
+upstream latency, so the numbers reflect the pipeline's structure rather
+than the machine's audio stack::
+
+    python -m benchmarks.bench_voice_pipeline --latency 400 --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from benchmarks.common import seed_archive
+from src.apps.voice_app import describe_weather, run_pipeline
+from src.utils.cache import TTLCache
+from src.utils.speech import PhraseCache
+from src.utils.transport import ReplayTransport
+from src.utils.weather_api import WeatherAPI
+
+
+class StubSynthesizer:
+    """Speaks at ``words_per_second`` after a fixed synthesis overhead."""
+
+    def __init__(self, words_per_second: float, overhead: float) -> None:
+        self.words_per_second = words_per_second
+        self.overhead = overhead
+        self.spoken: List[tuple] = []
+
+    def _duration(self, text: str) -> float:
+        return len(text.split()) / self.words_per_second
+
+    def say(self, text: str) -> None:
+        self.spoken.append((time.perf_counter(), text))
+        time.sleep(self.overhead + self._duration(text))
+
+    def render(self, text: str) -> Optional[bytes]:
+        time.sleep(self.overhead)
+        return text.encode()
+
+    def play(self, audio: bytes) -> None:
+        text = audio.decode()
+        self.spoken.append((time.perf_counter(), text))
+        time.sleep(self._duration(text))
+
+    def voice_key(self) -> str:
+        return "stub"
+
+
+class StubRecognizer:
+    def __init__(self, city: str, seconds: float) -> None:
+        self.city = city
+        self.seconds = seconds
+
+    def listen(self, before_listening: Optional[Callable[[], None]] = None) -> str:
+        if before_listening is not None:
+            before_listening()
+        time.sleep(self.seconds)
+        return self.city
+
+
+def sequential(api: WeatherAPI, recognizer: StubRecognizer, speaker: PhraseCache) -> None:
+    """The previous flow: acknowledge, then fetch, then speak."""
+
+    recognizer.listen(before_listening=lambda: speaker.say("Please say the city name"))
+    speaker.say(f"Fetching weather for {recognizer.city}")
+    data = api.get_current_weather(recognizer.city)
+    speaker.say(describe_weather(data))
+
+
+def _time_to_summary(synth: StubSynthesizer, started: float) -> float:
+    summary_at = next(at for at, text in synth.spoken if text.startswith("Weather in"))
+    return summary_at - started
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=400, help="upstream latency in ms")
+    parser.add_argument("--words-per-second", type=float, default=3.0)
+    parser.add_argument("--overhead", type=float, default=0.15, help="synthesis start-up cost in s")
+    parser.add_argument("--listen", type=float, default=0.5, help="recognition time in s")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    city = "Delhi"
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = seed_archive(Path(tmp) / "archive.sqlite3", [city])
+        results = {"sequential": [], "pipelined": []}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for _ in range(args.runs):
+                for mode in results:
+                    # A zero TTL makes every run pay the upstream latency.
+                    api = WeatherAPI(
+                        transport=ReplayTransport(archive, latency=args.latency),
+                        cache=TTLCache(ttl=0),
+                    )
+                    synth = StubSynthesizer(args.words_per_second, args.overhead)
+                    speaker = PhraseCache(synth)
+                    recognizer = StubRecognizer(city, args.listen)
+                    started = time.perf_counter()
+                    if mode == "sequential":
+                        sequential(api, recognizer, speaker)
+                    else:
+                        run_pipeline(api, recognizer, speaker, executor)
+                    results[mode].append(_time_to_summary(synth, started))
+
+        print(f"{'flow':<12}{'to summary (s)':>16}")
+        for mode, samples in results.items():
+            print(f"{mode:<12}{statistics.median(samples):>16.3f}")
+
+        synth = StubSynthesizer(args.words_per_second, args.overhead)
+        phrases = Path(tmp) / "voice"
+        timings = []
+        # A new PhraseCache per run, like a new voice_app process.
+        for _ in range(3):
+            speaker = PhraseCache(synth, directory=phrases)
+            started = time.perf_counter()
+            speaker.say("Please say the city name", cache=True)
+            timings.append(time.perf_counter() - started)
+        print(f"\nprompt: first run {timings[0]:.3f}s, later runs {statistics.median(timings[1:]):.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Compare gunicorn worker models: memory per worker and throughput.
+
+Starts the production profile (``gunicorn_config.py``) once per worker class
+against a replay archive with simulated upstream latency, drives it with
+concurrent keep-alive clients and reports requests/s, latency percentiles and
+per-worker RSS/PSS/USS (from ``/proc``, Linux only)::
+
+    python -m benchmarks.bench_worker_models --models sync gthread gevent
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import PROJECT_ROOT, city_names, seed_archive
+
+
+def _children(pid: int) -> List[int]:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in path.read_text().split()] if path.exists() else []
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    values: Dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        values[name] = int(value.split()[0])
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def _drive(port: int, cities: List[str], clients: int, duration: float) -> List[float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local: List[float] = []
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            conn.request("GET", f"/weather?city={rng.choice(cities)}")
+            response = conn.getresponse()
+            response.read()
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def run_model(model: str, args: argparse.Namespace, workdir: Path, port: int) -> Dict[str, float]:
+    env = {
+        **os.environ,
+        "WEATHER_TRANSPORT": "replay",
+        "WEATHER_ARCHIVE": str(workdir / "archive.sqlite3"),
+        "WEATHER_REPLAY_LATENCY": str(args.upstream_ms),
+        "WEATHER_HISTORY_DB": str(workdir / f"history-{model}.sqlite3"),
+        "WEATHER_CACHE_TTL": "0",  # every request pays the simulated upstream latency
+        "GUNICORN_WORKER_CLASS": model,
+        "GUNICORN_WORKERS": str(args.workers),
+        "GUNICORN_THREADS": str(args.threads),
+        "PORT": str(port),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn_config.py", "src.apps.flask_app:app"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port)
+        time.sleep(1.0)
+        cities = city_names(args.cities)
+        started = time.perf_counter()
+        latencies = _drive(port, cities, args.clients, args.duration)
+        elapsed = time.perf_counter() - started
+        workers = [_memory_kb(pid) for pid in _children(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies.sort()
+    count = len(latencies) or 1
+    return {
+        "req_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(count * 0.99) - 1] * 1000 if latencies else 0.0,
+        "rss_mb": statistics.mean(w["rss"] for w in workers) / 1024 if workers else 0.0,
+        "pss_mb": statistics.mean(w["pss"] for w in workers) / 1024 if workers else 0.0,
+        "uss_mb": statistics.mean(w["uss"] for w in workers) / 1024 if workers else 0.0,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", nargs="+", default=["sync", "gthread"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--cities", type=int, default=500)
+    parser.add_argument("--upstream-ms", type=float, default=50.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        seed_archive(workdir / "archive.sqlite3", city_names(args.cities)).close()
+        print(f"{'model':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+        for offset, model in enumerate(args.models):
+            result = run_model(model, args, workdir, args.port + offset)
+            print(
+                f"{model:<10}{result['req_s']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+                f"{result['rss_mb']:>10.1f}{result['pss_mb']:>10.1f}{result['uss_mb']:>10.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Shared helpers for benchmarks: synthetic payloads and local archives."""
+from __future__ import annotations
+
+import bisect
+import json
+import random
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+
+from src.utils.transport import Archive, request_key
+from src.utils.weather_api import WeatherAPI
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def city_names(count: int) -> List[str]:
+    return [f"city-{index:05d}" for index in range(count)]
+
+
+def synthetic_current(city: str) -> Dict[str, Any]:
+    """Return a plausible OpenWeatherMap ``/weather`` payload for ``city``."""
+
+    seed = zlib.crc32(city.encode())
+    rng = random.Random(seed)
+    return {
+        "coord": {"lat": rng.uniform(-60, 70), "lon": rng.uniform(-180, 180)},
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "main": {
+            "temp": round(rng.uniform(-10, 40), 2),
+            "feels_like": round(rng.uniform(-12, 42), 2),
+            "pressure": rng.randint(980, 1040),
+            "humidity": rng.randint(10, 100),
+        },
+        "wind": {"speed": round(rng.uniform(0, 20), 2)},
+        "clouds": {"all": rng.randint(0, 100)},
+        "rain": {"1h": round(rng.uniform(0, 5), 2)} if seed % 3 == 0 else {},
+        "dt": 1_700_000_000 + seed % 86_400,
+        "sys": {"sunrise": 1_700_000_000, "sunset": 1_700_040_000},
+        "name": city.title(),
+        "cod": 200,
+    }
+
+
+def synthetic_forecast(city: str, entries: int = 40) -> Dict[str, Any]:
+    rng = random.Random(zlib.crc32(city.encode()))
+    return {
+        "cod": "200",
+        "list": [
+            {
+                "dt": 1_700_000_000 + index * 10_800,
+                "main": {
+                    "temp": round(rng.uniform(-10, 40), 2),
+                    "feels_like": round(rng.uniform(-12, 42), 2),
+                    "humidity": rng.randint(10, 100),
+                },
+                "wind": {"speed": round(rng.uniform(0, 15), 2)},
+                "weather": [{"id": 500, "description": "light rain", "icon": "10d"}],
+            }
+            for index in range(entries)
+        ],
+        "city": {"name": city.title()},
+    }
+
+
+def seed_archive(path: Union[str, Path], cities: Sequence[str], elapsed_ms: float = 80.0) -> Archive:
+    """Write synthetic responses for ``cities`` into a replay archive."""
+
+    archive = Archive(path)
+    url = f"{WeatherAPI.BASE_URL}/weather"
+    forecast_url = f"{WeatherAPI.BASE_URL}/forecast"
+    for city in cities:
+        params = {"q": city, "units": "metric", "lang": "en"}
+        archive.put(request_key(url, params), 200, json.dumps(synthetic_current(city)).encode(), elapsed_ms)
+        archive.put(
+            request_key(forecast_url, params),
+            200,
+            json.dumps(synthetic_forecast(city)).encode(),
+            elapsed_ms,
+        )
+    return archive
+
+
+def zipf_sampler(items: Sequence[str], exponent: float = 1.1, seed: int = 7):
+    """Return a function drawing ``items`` with Zipfian popularity."""
+
+    rng = random.Random(seed)
+    weights = [1 / (rank ** exponent) for rank in range(1, len(items) + 1)]
+    total = sum(weights)
+    cumulative = []
+    running = 0.0
+    for weight in weights:
+        running += weight / total
+        cumulative.append(running)
+
+    def sample() -> str:
+        return items[min(bisect.bisect_left(cumulative, rng.random()), len(items) - 1)]
+
+    return sample
@@ -0,0 +1,290 @@
+"""Long-running soak test of the web services with memory and leak tracking.
+
+Serves ``flask_app`` and/or ``fastapi_service`` in this process against a
+replay archive (a local stand-in for OpenWeatherMap), drives them with
+keep-alive clients requesting cities with Zipfian popularity, and samples
+RSS, tracemalloc totals, the largest allocation growth sites and cache sizes
+at a fixed interval. After the warm-up period, the growth of RSS and traced
+memory is fitted with a least-squares line. The run fails (exit status 1)
+if either slope exceeds ``--max-slope`` MB per hour::
+
+    python -m benchmarks.soak --duration 7200 --services flask fastapi
+    python -m benchmarks.soak --duration 120 --sample-interval 5 --warmup 30
+
+A short cache TTL (``--cache-ttl``) keeps entries expiring and refilling
+throughout the run, so unbounded caches show up as a slope. Project modules
+read their settings from the environment at import time, so they are only
+imported once the soak configuration has been set.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+MB = 1024 * 1024
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (Linux ``/proc``; peak RSS elsewhere)."""
+
+    try:
+        with open("/proc/self/statm") as stream:
+            return int(stream.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def slope_per_hour(points: Sequence[Tuple[float, float]]) -> float:
+    """Least-squares slope of ``(seconds, megabytes)`` points, in MB/hour."""
+
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    if not var_t:
+        return 0.0
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return cov / var_t * 3600
+
+
+class Target:
+    """One service under test: where it listens and how to read its caches."""
+
+    def __init__(
+        self,
+        name: str,
+        port: int,
+        paths: Callable[[random.Random, Callable[[], str]], Tuple[str, str, Optional[bytes]]],
+        cache_sizes: Callable[[], Dict[str, int]],
+        stop: Callable[[], None],
+    ) -> None:
+        self.name = name
+        self.port = port
+        self.paths = paths
+        self.cache_sizes = cache_sizes
+        self.stop = stop
+
+
+def _flask_requests(rng: random.Random, city: Callable[[], str]) -> Tuple[str, str, Optional[bytes]]:
+    roll = rng.random()
+    if roll < 0.6:
+        return "GET", f"/weather?city={city()}", None
+    if roll < 0.75:
+        return "GET", f"/forecast?city={city()}&hours=6", None
+    if roll < 0.85:
+        body = json.dumps({"cities": [city() for _ in range(rng.randint(2, 20))]}).encode()
+        return "POST", "/multi-weather", body
+    if roll < 0.95:
+        return "GET", f"/history?city={city()}&resolution=hour", None
+    # Unknown cities exercise the error paths.
+    return "GET", f"/weather?city=nowhere-{rng.randint(0, 10**6)}", None
+
+
+def _fastapi_requests(rng: random.Random, city: Callable[[], str]) -> Tuple[str, str, Optional[bytes]]:
+    if rng.random() < 0.95:
+        return "GET", f"/weather/{city()}", None
+    return "GET", f"/weather/nowhere-{rng.randint(0, 10**6)}", None
+
+
+def start_flask(port: int) -> Target:
+    import logging
+
+    from werkzeug.serving import make_server
+
+    from src.apps.flask_app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def cache_sizes() -> Dict[str, int]:
+        return {
+            "weather_cache": len(app.extensions["weather_api"].cache),
+            "rank_cache": len(app.extensions["weather_ranker"].cache),
+            "rate_limit_clients": app.extensions["rate_limiter"].stats()["clients"],
+        }
+
+    return Target("flask", port, _flask_requests, cache_sizes, server.shutdown)
+
+
+def start_fastapi(port: int) -> Target:
+    import uvicorn
+
+    from src.apps import fastapi_service
+
+    server = uvicorn.Server(uvicorn.Config(fastapi_service.app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def cache_sizes() -> Dict[str, int]:
+        return {"weather_cache": len(fastapi_service.api.cache)}
+
+    def stop() -> None:
+        server.should_exit = True
+
+    return Target("fastapi", port, _fastapi_requests, cache_sizes, stop)
+
+
+def drive(
+    target: Target, cities: List[str], clients: int, stop: threading.Event, counts: Dict[str, int]
+) -> List[threading.Thread]:
+    from benchmarks.common import zipf_sampler
+
+    lock = threading.Lock()
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        city = zipf_sampler(cities, seed=seed)
+        conn = http.client.HTTPConnection("127.0.0.1", target.port, timeout=30)
+        while not stop.is_set():
+            method, path, body = target.paths(rng, city)
+            headers = {"Content-Type": "application/json"} if body else {}
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                status = conn.getresponse()
+                status.read()
+                key = f"{target.name}.{status.status // 100}xx"
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", target.port, timeout=30)
+                key = f"{target.name}.errors"
+            with lock:
+                counts[key] = counts.get(key, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(seed,), daemon=True) for seed in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def top_growth(snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot, limit: int) -> List[str]:
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    stats = snapshot.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), "lineno")
+    return [
+        f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} {stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d})"
+        for stat in stats[:limit]
+        if stat.size_diff > 0
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", nargs="+", choices=["flask", "fastapi"], default=["flask", "fastapi"])
+    parser.add_argument("--duration", type=float, default=3600, help="seconds to run")
+    parser.add_argument("--warmup", type=float, default=300, help="seconds excluded from the slope fit")
+    parser.add_argument("--sample-interval", type=float, default=30)
+    parser.add_argument("--max-slope", type=float, default=5.0, help="allowed growth in MB/hour")
+    parser.add_argument("--clients", type=int, default=8, help="clients per service")
+    parser.add_argument("--cities", type=int, default=5000)
+    parser.add_argument("--upstream-ms", type=float, default=20.0)
+    parser.add_argument("--cache-ttl", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--output", help="append one JSON sample per line to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        os.environ.update(
+            {
+                "WEATHER_TRANSPORT": "replay",
+                "WEATHER_ARCHIVE": str(workdir / "archive.sqlite3"),
+                "WEATHER_REPLAY_LATENCY": str(args.upstream_ms),
+                "WEATHER_HISTORY_DB": str(workdir / "history.sqlite3"),
+                "WEATHER_CACHE_TTL": str(args.cache_ttl),
+                "WEATHER_RATE_LIMIT": "0",
+                "WEATHER_MAX_IN_FLIGHT": "0",
+            }
+        )
+        os.environ.setdefault("WEATHER_ACCESS_LOG_SAMPLE", "0")
+        from benchmarks.common import city_names, seed_archive
+
+        seed_archive(workdir / "archive.sqlite3", city_names(args.cities)).close()
+
+        tracemalloc.start()
+        starters = {"flask": start_flask, "fastapi": start_fastapi}
+        targets = [starters[name](args.port + offset) for offset, name in enumerate(args.services)]
+
+        stop = threading.Event()
+        counts: Dict[str, int] = {}
+        cities = city_names(args.cities)
+        for target in targets:
+            drive(target, cities, args.clients, stop, counts)
+
+        started = time.monotonic()
+        baseline: Optional[tracemalloc.Snapshot] = None
+        samples: List[Dict[str, Any]] = []
+        output = open(args.output, "a", encoding="utf-8") if args.output else None
+        print(f"{'elapsed s':>10}{'RSS MB':>10}{'traced MB':>11}{'requests':>10}  caches")
+        try:
+            while True:
+                elapsed = time.monotonic() - started
+                if baseline is None and elapsed >= args.warmup:
+                    baseline = tracemalloc.take_snapshot()
+                traced, _ = tracemalloc.get_traced_memory()
+                sample = {
+                    "elapsed": round(elapsed, 1),
+                    "rss_mb": round(rss_bytes() / MB, 2),
+                    "traced_mb": round(traced / MB, 2),
+                    "requests": dict(counts),
+                    "caches": {target.name: target.cache_sizes() for target in targets},
+                }
+                samples.append(sample)
+                if output is not None:
+                    output.write(json.dumps(sample) + "\n")
+                    output.flush()
+                print(
+                    f"{sample['elapsed']:>10.0f}{sample['rss_mb']:>10.1f}{sample['traced_mb']:>11.1f}"
+                    f"{sum(counts.values()):>10}  {json.dumps(sample['caches'])}"
+                )
+                if elapsed >= args.duration:
+                    break
+                time.sleep(min(args.sample_interval, max(args.duration - elapsed, 0.1)))
+        finally:
+            stop.set()
+            for target in targets:
+                target.stop()
+            if output is not None:
+                output.close()
+
+        steady = [sample for sample in samples if sample["elapsed"] >= args.warmup]
+        rss_slope = slope_per_hour([(s["elapsed"], s["rss_mb"]) for s in steady])
+        traced_slope = slope_per_hour([(s["elapsed"], s["traced_mb"]) for s in steady])
+        print(f"\nrequests: {json.dumps(dict(sorted(counts.items())))}")
+        print(f"after {args.warmup:.0f}s warm-up: RSS {rss_slope:+.2f} MB/h, traced {traced_slope:+.2f} MB/h")
+        if baseline is not None:
+            print("largest growth since warm-up:")
+            for line in top_growth(tracemalloc.take_snapshot(), baseline, 10):
+                print(f"  {line}")
+        tracemalloc.stop()
+
+    if len(steady) < 3:
+        print("not enough samples after warm-up to judge growth")
+        return 0
+    if max(rss_slope, traced_slope) > args.max_slope:
+        print(f"FAIL: memory grows faster than {args.max_slope} MB/h")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,44 @@
 # gunicorn_config.py
-workers = 4
+"""Production gunicorn profile for ``src.apps.flask_app:app``.
+
+The app is preloaded in the master so imports, the rendered landing page and
+other read-only state are shared copy-on-write by every worker; per-process
+resources are rebuilt in ``post_fork``. Tunables (environment variables):
+
+- ``GUNICORN_WORKER_CLASS``: ``sync``, ``gthread`` (default) or an async
+  class such as ``gevent`` (requires ``pip install gevent``).
+- ``GUNICORN_WORKERS``, ``GUNICORN_THREADS``, ``GUNICORN_WORKER_CONNECTIONS``.
+"""
+import gc
+import os
+
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+# gunicorn silently upgrades "sync" to "gthread" when threads > 1.
+threads = int(os.getenv("GUNICORN_THREADS", "8")) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+preload_app = True
 timeout = 120
 keepalive = 5
-bind = '0.0.0.0:8000'
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+
+def when_ready(server):
+    # Move everything allocated during preload out of the GC's tracked
+    # generations so collections in workers don't touch (and copy) it.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from src.apps.flask_app import app, reinit_after_fork
+
+    reinit_after_fork(app)
+
+
+def worker_exit(server, worker):
+    from src.apps.flask_app import app
+    from src.utils.logging_utils import shutdown_logging
+
+    app.extensions["weather_api"].close()
+    # Write out any records still queued for the background log writer.
+    shutdown_logging()
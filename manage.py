@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -59,11 +60,14 @@ def ensure_env(meta: Dict[str, object]) -> None:
 
     sys.path.insert(0, str(PROJECT_ROOT))
     from src.config.settings import get_settings
+    from src.utils.providers import DEFAULT_PROVIDERS, parse_provider_names
 
     settings = get_settings()
-    if not settings.has_openweather_key:
+    needs_openweather = "openweathermap" in parse_provider_names(DEFAULT_PROVIDERS)
+    if needs_openweather and not settings.has_openweather_key and not settings.is_replay:
         raise SystemExit(
-            "OPENWEATHER_API_KEY is missing. Set it in .env or environment variables."
+            "OPENWEATHER_API_KEY is missing. Set it in .env or environment variables, "
+            "or pick keyless providers with WEATHER_PROVIDERS."
         )
     if meta.get("needs_openai") and not settings.has_openai_key:
         raise SystemExit(
@@ -71,6 +75,33 @@ def ensure_env(meta: Dict[str, object]) -> None:
         )
 
 
+def apply_transport_args(args: argparse.Namespace) -> None:
+    """Export transport flags so the app subprocess inherits them."""
+
+    if getattr(args, "transport", None):
+        os.environ["WEATHER_TRANSPORT"] = args.transport
+    if getattr(args, "archive", None):
+        os.environ["WEATHER_ARCHIVE"] = args.archive
+    if getattr(args, "replay_latency", None):
+        os.environ["WEATHER_REPLAY_LATENCY"] = args.replay_latency
+
+
+def add_transport_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--transport",
+        choices=["live", "record", "replay"],
+        help="HTTP transport for OpenWeatherMap calls (env: WEATHER_TRANSPORT)",
+    )
+    parser.add_argument(
+        "--archive",
+        help="Record/replay archive path (env: WEATHER_ARCHIVE)",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        help="Replay delay in ms, or 'recorded' (env: WEATHER_REPLAY_LATENCY)",
+    )
+
+
 def run_app(name: str, extra_args: list[str]) -> int:
     meta = APP_DEFINITIONS[name]
     ensure_env(meta)
@@ -119,9 +150,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     subparsers.add_parser("list", help="List all available app targets")
-    subparsers.add_parser("menu", help="Show interactive menu to launch apps")
+    menu_parser = subparsers.add_parser("menu", help="Show interactive menu to launch apps")
+    add_transport_args(menu_parser)
 
     run_parser = subparsers.add_parser("run", help="Run a specific app target")
+    add_transport_args(run_parser)
     run_parser.add_argument("app", choices=APP_DEFINITIONS.keys())
     run_parser.add_argument(
         "app_args",
@@ -134,6 +167,7 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
+    apply_transport_args(args)
     if args.command == "list":
         for name, meta in APP_DEFINITIONS.items():
             print(f"{name:<12} {meta['description']}")
@@ -150,11 +184,9 @@ def main(argv: list[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
-    import os
-    
     if os.environ.get("RENDER"):
         # Non-interactive environment → run Flask instead of menu
-        from app import app
+        from src.apps.flask_app import app
         app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
     else:
         # Local interactive menu
@@ -1,56 +1,197 @@
-"""Advanced Rich-powered terminal weather app (Prompt 2)."""
+"""Advanced Rich-powered terminal weather app (Prompt 2).
+
+Cities are fetched concurrently through one shared ``WeatherAPI`` and each
+panel is printed as soon as its data arrives. With ``--live`` the panels
+form a dashboard that refreshes every ``--interval`` seconds; only panels
+whose contents changed are rebuilt, and the screen is redrawn only when
+something changed.
+"""
 from __future__ import annotations
 
-from typing import Iterable
+import argparse
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
-from src.utils import WeatherAPI, WeatherError
+from src.utils import WeatherAPI, WeatherData, WeatherError
+from src.utils.cache import DEFAULT_CACHE_TTL, TTLCache
+from src.utils.city_sets import get_city_set
 from src.utils.rich_helpers import format_temperature
 
 console = Console()
 
+PANEL_WIDTH = 34
+MAX_WORKERS = 16
+
+Row = Tuple[str, str]
 
-def render_city_weather(city: str) -> None:
-    api = WeatherAPI()
-    try:
-        data = api.get_current_weather(city)
-    except WeatherError as exc:
-        console.print(Panel(str(exc), title=f"Error: {city}", border_style="red"))
-        return
+
+def weather_rows(data: WeatherData, compact: bool = False) -> List[Row]:
+    if compact:
+        # Short enough for a 50-city wall display.
+        return [
+            ("Temperature", f"{data.temperature:.1f}"),
+            ("Humidity", f"{data.humidity}%"),
+            ("Wind", f"{data.wind_speed:.1f} m/s"),
+            ("Sky", data.description),
+        ]
+    return [
+        ("Temperature", f"{data.temperature:.1f}"),
+        ("Feels Like", f"{data.feels_like:.1f}°C"),
+        ("Pressure", f"{data.pressure} hPa"),
+        ("Humidity", f"{data.humidity}%"),
+        ("Sunrise", data.sunrise_time.strftime("%H:%M")),
+        ("Sunset", data.sunset_time.strftime("%H:%M")),
+    ]
+
+
+def build_panel(
+    city: str, result: Union[WeatherData, WeatherError], compact: bool = False
+) -> Panel:
+    if isinstance(result, WeatherError):
+        return Panel(str(result), title=f"Error: {city}", border_style="red", width=PANEL_WIDTH)
 
     rows = Table.grid(padding=(0, 2))
-    rows.add_row("Temperature", format_temperature(data.temperature))
-    rows.add_row("Feels Like", f"{data.feels_like:.1f}°C")
-    rows.add_row("Pressure", f"{data.pressure} hPa")
-    rows.add_row("Humidity", f"{data.humidity}%")
-    rows.add_row("Sunrise", data.sunrise_time.strftime("%H:%M"))
-    rows.add_row("Sunset", data.sunset_time.strftime("%H:%M"))
-
-    console.print(
-        Panel(
-            rows,
-            title=f"╭ Weather for {data.city} ╮",
-            border_style="bright_blue",
-        )
+    for label, value in weather_rows(result, compact):
+        if label == "Temperature":
+            rows.add_row(label, format_temperature(result.temperature))
+        else:
+            rows.add_row(label, value)
+    return Panel(
+        rows,
+        title=result.city if compact else f"╭ Weather for {result.city} ╮",
+        border_style="bright_blue",
+        width=PANEL_WIDTH,
     )
 
 
-def main() -> None:
-    console.print("Enter city names separated by commas (e.g., Delhi, Mumbai, Pune)")
-    raw = input("Cities: ")
-    cities: Iterable[str] = (
-        city.strip() for city in raw.split(",") if city.strip()
+def render_city_weather(city: str, api: Optional[WeatherAPI] = None) -> None:
+    api = api or WeatherAPI()
+    try:
+        data: Union[WeatherData, WeatherError] = api.get_current_weather(city)
+    except WeatherError as exc:
+        data = exc
+    console.print(build_panel(city, data))
+
+
+def render_cities(api: WeatherAPI, cities: List[str]) -> None:
+    """Print one panel per city, in the order the fetches complete."""
+
+    for city, result in api.iter_current_weather(cities, max_workers=MAX_WORKERS):
+        console.print(build_panel(city, result))
+
+
+class Dashboard:
+    """Grid of city panels that tracks which panels changed."""
+
+    def __init__(self, cities: List[str], interval: float) -> None:
+        self.cities = cities
+        self.interval = interval
+        self._panels: Dict[str, RenderableType] = {
+            city: Panel(Text("Loading…", style="dim"), title=city, width=PANEL_WIDTH)
+            for city in cities
+        }
+        self._contents: Dict[str, object] = {}
+        self.errors = 0
+        self.updated_at: Optional[datetime] = None
+
+    def update(self, city: str, result: Union[WeatherData, WeatherError]) -> bool:
+        """Record ``result`` for ``city``; return True if its panel changed."""
+
+        contents = str(result) if isinstance(result, WeatherError) else weather_rows(result, True)
+        if self._contents.get(city) == contents:
+            return False
+        self._contents[city] = contents
+        self._panels[city] = build_panel(city, result, compact=True)
+        return True
+
+    def __rich__(self) -> RenderableType:
+        columns = max(1, console.width // PANEL_WIDTH)
+        grid = Table.grid()
+        for _ in range(columns):
+            grid.add_column(width=PANEL_WIDTH)
+        panels = [self._panels[city] for city in self.cities]
+        for start in range(0, len(panels), columns):
+            grid.add_row(*panels[start : start + columns])
+
+        status = f"{len(self.cities)} cities"
+        if self.updated_at is not None:
+            status += f" · updated {self.updated_at:%H:%M:%S}"
+        if self.errors:
+            status += f" · {self.errors} errors"
+        status += f" · refreshing every {self.interval:g}s · Ctrl+C to quit"
+        return Group(grid, Text(status, style="dim"))
+
+
+def run_dashboard(api: WeatherAPI, cities: List[str], interval: float) -> None:
+    dashboard = Dashboard(cities, interval)
+    with Live(dashboard, console=console, auto_refresh=False, screen=True) as live:
+        live.refresh()
+        while True:
+            started = time.monotonic()
+            errors = 0
+            for city, result in api.iter_current_weather(cities, max_workers=MAX_WORKERS):
+                errors += isinstance(result, WeatherError)
+                if dashboard.update(city, result):
+                    live.refresh()
+            dashboard.errors = errors
+            dashboard.updated_at = datetime.now()
+            live.refresh()
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rich terminal weather for several cities")
+    parser.add_argument("cities", nargs="*", help="City names (prompted for if omitted)")
+    parser.add_argument("--set", dest="city_set", help="Use a named city set, e.g. world-capitals")
+    parser.add_argument("--live", action="store_true", help="Keep a live dashboard on screen")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help="Dashboard refresh interval in seconds (default: %(default)s)",
     )
+    return parser.parse_args(argv)
+
 
-    any_city = False
-    for city in cities:
-        any_city = True
-        render_city_weather(city)
-    if not any_city:
+def unique_cities(cities: Iterable[str]) -> List[str]:
+    return list({city.strip().lower(): city.strip() for city in cities if city.strip()}.values())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.city_set:
+        try:
+            cities = get_city_set(args.city_set)
+        except ValueError as exc:
+            console.print(str(exc), style="bold red")
+            return
+    elif args.cities:
+        cities = unique_cities(part for arg in args.cities for part in arg.split(","))
+    else:
+        console.print("Enter city names separated by commas (e.g., Delhi, Mumbai, Pune)")
+        cities = unique_cities(input("Cities: ").split(","))
+
+    if not cities:
         console.print("No cities provided.", style="bold red")
+        return
+
+    if not args.live:
+        render_cities(WeatherAPI(), cities)
+        return
+
+    # Entries expire before the next refresh so each pass shows fresh data.
+    api = WeatherAPI(cache=TTLCache(ttl=args.interval / 2))
+    try:
+        run_dashboard(api, cities, args.interval)
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
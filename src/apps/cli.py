@@ -1,20 +1,145 @@
-"""Project CLI entry point (Prompt 10)."""
+"""Project CLI entry point (Prompt 10).
+
+Besides single lookups, ``--batch FILE`` (or ``-`` for stdin) fetches many
+cities concurrently and streams one CSV/JSONL row per city as results
+arrive. With ``--checkpoint``, completed cities are recorded so a re-run
+skips them and appends to the same output.
+"""
 from __future__ import annotations
 
 import argparse
+import csv
+import json
 import logging
-from typing import List
+import sys
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO
 
 from src.utils import WeatherAPI, WeatherError, configure_logging
 
+BATCH_FIELDS = [
+    "city",
+    "name",
+    "temperature",
+    "feels_like",
+    "humidity",
+    "pressure",
+    "wind_speed",
+    "description",
+    "observed_at",
+    "error",
+]
+
 
 def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Weather CLI powered by OpenWeatherMap")
-    parser.add_argument("city", help="City name to query")
-    parser.add_argument("--units", choices=["metric", "imperial"], help="Override temperature units")
+    parser.add_argument("city", nargs="?", help="City name to query")
+    parser.add_argument("--units", choices=["metric", "imperial", "standard"], help="Override temperature units")
     parser.add_argument("--lang", help="Override response language")
     parser.add_argument("--debug", action="store_true", help="Enable verbose logging")
-    return parser.parse_args(argv)
+
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", metavar="FILE", help="Read city names, one per line, from FILE ('-' for stdin)")
+    batch.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Batch output format")
+    batch.add_argument("--output", metavar="FILE", help="Write batch results to FILE instead of stdout")
+    batch.add_argument("--concurrency", type=int, default=8, help="Concurrent lookups (default: %(default)s)")
+    batch.add_argument("--rate", type=float, default=0.0, help="Max lookups started per second (0 = unlimited)")
+    batch.add_argument("--checkpoint", metavar="FILE", help="Record finished cities in FILE and skip them on re-runs")
+    args = parser.parse_args(argv)
+    if not args.city and not args.batch:
+        parser.error("provide a city or --batch FILE")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def read_cities(stream: TextIO) -> Iterator[str]:
+    """Yield city names from ``stream``, skipping blank lines and ``#`` comments."""
+
+    for line in stream:
+        city = line.strip()
+        if city and not city.startswith("#"):
+            yield city
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path:
+        return set()
+    try:
+        with open(path, encoding="utf-8") as stream:
+            return {line.strip() for line in stream if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def batch_row(city: str, result: Any) -> Dict[str, Any]:
+    if isinstance(result, WeatherError):
+        return {"city": city, "error": str(result)}
+    return {
+        "city": city,
+        "name": result.city,
+        "temperature": result.temperature,
+        "feels_like": result.feels_like,
+        "humidity": result.humidity,
+        "pressure": result.pressure,
+        "wind_speed": result.wind_speed,
+        "description": result.description,
+        "observed_at": result.observed_at,
+    }
+
+
+def row_writer(stream: TextIO, fmt: str, write_header: bool) -> Callable[[Dict[str, Any]], None]:
+    if fmt == "jsonl":
+        return lambda row: stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+    writer = csv.DictWriter(stream, fieldnames=BATCH_FIELDS)
+    if write_header:
+        writer.writeheader()
+    return writer.writerow
+
+
+def run_batch(args: argparse.Namespace, api: WeatherAPI, logger: logging.Logger) -> int:
+    done = load_checkpoint(args.checkpoint)
+    skipped = 0
+
+    def pending(cities: Iterable[str]) -> Iterator[str]:
+        nonlocal skipped
+        for city in cities:
+            if city.lower() in done:
+                skipped += 1
+                continue
+            yield city
+
+    fetched = failed = 0
+    with ExitStack() as stack:
+        source = sys.stdin if args.batch == "-" else stack.enter_context(open(args.batch, encoding="utf-8"))
+        if args.output:
+            # Checkpointed runs append, so a resumed run continues the output.
+            mode = "a" if args.checkpoint else "w"
+            output = stack.enter_context(open(args.output, mode, encoding="utf-8", newline=""))
+            write_header = output.tell() == 0
+        else:
+            output, write_header = sys.stdout, True
+        checkpoint = (
+            stack.enter_context(open(args.checkpoint, "a", encoding="utf-8")) if args.checkpoint else None
+        )
+        write = row_writer(output, args.format, write_header)
+
+        cities = pending(read_cities(source))
+        # Limited where lookups are started, so finished rows aren't held back.
+        for city, result in api.iter_current_weather(cities, max_workers=args.concurrency, rate=args.rate):
+            write(batch_row(city, result))
+            output.flush()
+            if isinstance(result, WeatherError):
+                failed += 1
+                continue
+            fetched += 1
+            if checkpoint is not None:
+                # Written after the row, so a crash can only repeat a city.
+                checkpoint.write(city.lower() + "\n")
+                checkpoint.flush()
+
+    logger.info("Fetched %d cities, %d failed, %d skipped from checkpoint", fetched, failed, skipped)
+    return 1 if failed else 0
 
 
 def main(argv: List[str] | None = None) -> int:
@@ -22,6 +147,9 @@ def main(argv: List[str] | None = None) -> int:
     logger = configure_logging(logging.DEBUG if args.debug else logging.INFO)
     api = WeatherAPI(units=args.units, language=args.lang)
 
+    if args.batch:
+        return run_batch(args, api, logger)
+
     try:
         data = api.get_current_weather(args.city)
     except WeatherError as exc:
@@ -1,20 +1,45 @@
 """FastAPI weather microservice (Prompt 6)."""
 from __future__ import annotations
 
+import logging
 import time
-from functools import lru_cache
+import uuid
+from urllib.parse import unquote
 
-from fastapi import FastAPI, HTTPException
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from src.utils import WeatherAPI, WeatherError
+from src.config.settings import get_settings
+from src.utils import DeadlineExceeded, WeatherAPI, WeatherError
+from src.utils.admission import (
+    DEFAULT_REQUEST_DEADLINE,
+    SHED_RETRY_AFTER,
+    AdmissionController,
+    deadline,
+)
+from src.utils.cache_snapshot import CacheSnapshotter
+from src.utils.logging_utils import ACCESS_LOGGER, configure_logging, request_id
+from src.utils.metrics import metrics
+from src.utils.weather_api import ForecastEntry, WeatherData
 
 app = FastAPI(
     title="Weather Microservice",
     description="Production-ready FastAPI weather endpoint backed by OpenWeatherMap.",
     version="1.0.0",
 )
+configure_logging()
+access_log = logging.getLogger(ACCESS_LOGGER)
 api = WeatherAPI()
+if get_settings().cache_snapshot:
+    snapshots = CacheSnapshotter(api.cache, get_settings().cache_snapshot)
+    snapshots.load()
+    api.add_listener(snapshots.mark_dirty)
+admission = AdmissionController()
+metrics.register_gauge("admission.in_flight", lambda: admission.in_flight)
 
 
 class WeatherResponse(BaseModel):
@@ -26,19 +51,164 @@ class WeatherResponse(BaseModel):
     clouds: int
 
 
+class ForecastResponse(BaseModel):
+    timestamp: int
+    temp: float
+    feels_like: float
+    description: str
+
+
+class BundleResponse(BaseModel):
+    weather: WeatherResponse
+    forecast: List[ForecastResponse]
+
+
 class ErrorResponse(BaseModel):
     detail: str
 
 
-def _cache_bucket() -> int:
-    """Return a rolling bucket that changes every 5 minutes."""
+def _to_response(data: WeatherData) -> WeatherResponse:
+    return WeatherResponse(
+        city=data.city,
+        temp=data.temperature,
+        feels_like=data.feels_like,
+        humidity=data.humidity,
+        precipitation=data.precipitation,
+        clouds=data.clouds,
+    )
+
+
+def _to_bundle(data: WeatherData, entries: List[ForecastEntry]) -> BundleResponse:
+    return BundleResponse(
+        weather=_to_response(data),
+        forecast=[
+            ForecastResponse(
+                timestamp=entry.timestamp,
+                temp=entry.temperature,
+                feels_like=entry.feels_like,
+                description=entry.description,
+            )
+            for entry in entries
+        ],
+    )
+
+
+def _stale_body(path: str, city: str, hours: int) -> Optional[BaseModel]:
+    data = api.get_stale_weather(city)
+    if data is None or not path.startswith("/bundle/"):
+        return None if data is None else _to_response(data)
+    entries = api.get_stale_forecast(city, hours=hours)
+    return None if entries is None else _to_bundle(data, entries)
+
+
+def _shed_response(city: Optional[str], path: str = "/weather/", hours: int = 12) -> JSONResponse:
+    """Answer without upstream work: stale data if cached, else a 503."""
+
+    body = _stale_body(path, city, hours) if city else None
+    if body is not None:
+        metrics.increment("admission.degraded")
+        return JSONResponse(
+            jsonable_encoder(body), headers={"X-Weather-Stale": "1", "Cache-Control": "no-store"}
+        )
+    metrics.increment("admission.shed")
+    return JSONResponse(
+        {"detail": "Service is overloaded, please retry."},
+        status_code=503,
+        headers={"Retry-After": str(SHED_RETRY_AFTER)},
+    )
+
+
+def _path_city(request: Request) -> Optional[str]:
+    path = request.url.path
+    for prefix in ("/weather/", "/bundle/"):
+        if path.startswith(prefix):
+            return unquote(path[len(prefix):])
+    return None
+
+
+def _query_hours(request: Request) -> int:
+    try:
+        return min(max(int(request.query_params.get("hours", 12)), 1), 48)
+    except ValueError:
+        return 12
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Shed requests over the in-flight cap and bound the rest by a deadline."""
+
+    if not request.url.path.startswith(("/weather", "/bundle/")):
+        return await call_next(request)
+    if not admission.try_acquire():
+        return _shed_response(_path_city(request), request.url.path, _query_hours(request))
+    try:
+        # The endpoint runs in a copy of this context, deadline included.
+        with deadline(DEFAULT_REQUEST_DEADLINE):
+            return await call_next(request)
+    finally:
+        admission.release()
+
+
+@app.middleware("http")
+async def log_request(request: Request, call_next):
+    """Tag the request with an ID and write a structured access log line."""
+
+    supplied = request.headers.get("x-request-id", "")
+    rid = supplied if 0 < len(supplied) <= 64 and supplied.isprintable() else uuid.uuid4().hex
+    token = request_id.set(rid)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+        response.headers["X-Request-ID"] = rid
+        access_log.info(
+            "%s %s %s %.1fms",
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration_ms,
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+                "client": request.client.host if request.client else None,
+            },
+        )
+        return response
+    finally:
+        request_id.reset(token)
+
+
+@app.get(
+    "/weather",
+    response_model=WeatherResponse,
+    responses={400: {"model": ErrorResponse, "description": "Bad request"}},
+)
+def weather_by_coords(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+):
+    """Return weather for the geohash tile containing ``lat``/``lon``."""
 
-    return int(time.time() // 300)
+    try:
+        data = api.get_current_weather_by_coords(lat, lon)
+    except DeadlineExceeded:
+        return _shed_response(None)
+    except WeatherError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _to_response(data)
 
 
-@lru_cache(maxsize=256)
-def _cached_weather(city: str, bucket: int):
-    return api.get_current_weather(city)
+@app.get("/metrics")
+def metrics_endpoint() -> Dict[str, Any]:
+    return {
+        "counters": metrics.snapshot(),
+        "cache": api.cache.stats(),
+        "http": api.transport.pool_stats(),
+        "providers": api.providers.stats(),
+        "admission": admission.stats(),
+    }
 
 
 @app.get(
@@ -52,20 +222,33 @@ def _cached_weather(city: str, bucket: int):
 def weather(city: str):
     """Return weather data for the provided city."""
 
-    bucket = _cache_bucket()
+    # ``api`` keeps each city for the cache TTL in a bounded LRU, so
+    # expired entries don't linger the way per-bucket memoization did.
     try:
-        data = _cached_weather(city.lower(), bucket)
+        data = api.get_current_weather(city)
+    except DeadlineExceeded:
+        return _shed_response(city)
     except WeatherError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    return WeatherResponse(
-        city=data.city,
-        temp=data.temperature,
-        feels_like=data.feels_like,
-        humidity=data.humidity,
-        precipitation=data.precipitation,
-        clouds=data.clouds,
-    )
+    return _to_response(data)
+
+
+@app.get(
+    "/bundle/{city}",
+    response_model=BundleResponse,
+    responses={400: {"model": ErrorResponse, "description": "Bad request"}},
+)
+def bundle(city: str, hours: int = Query(12, ge=1, le=48)):
+    """Return current weather and the forecast for ``city`` in one response."""
+
+    try:
+        data, entries = api.get_weather_bundle(city, hours=hours)
+    except DeadlineExceeded:
+        return _shed_response(city, "/bundle/", hours)
+    except WeatherError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _to_bundle(data, entries)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,44 @@
 """Flask weather web app (Prompt 5) now hosting unified landing page."""
 from __future__ import annotations
 
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, abort, g, jsonify, render_template, request, stream_with_context
 from dotenv import load_dotenv
+from werkzeug.middleware.proxy_fix import ProxyFix
 
-from src.utils import WeatherAPI, WeatherError, detect_city
+from src.config.settings import get_settings
+from src.utils import DeadlineExceeded, WeatherAPI, WeatherError, detect_city
+from src.utils.admission import (
+    DEFAULT_REQUEST_DEADLINE,
+    SHED_RETRY_AFTER,
+    AdmissionController,
+    reset_deadline,
+    set_deadline,
+    time_remaining,
+)
+from src.utils import analytics as analytics_utils
+from src.utils.analytics import derive_forecasts, derive_weather, summarize
+from src.utils.cache_snapshot import CacheSnapshotter
+from src.utils.city_sets import get_city_set
 from src.utils.exceptions import LocationDetectionError
+from src.utils import logging_utils
+from src.utils.history import RESOLUTIONS, HistoryStore
+from src.utils.interpolation import WeatherInterpolator
+from src.utils.logging_utils import ACCESS_LOGGER, configure_logging, request_id
+from src.utils.metrics import metrics
+from src.utils.static_assets import AssetBundle, PrecompressedAsset
 from src.utils.openai_helper import generate_weather_tip
+from src.utils.ranking import CityRanker
+from src.utils.rate_limit import FairQueue, SlidingWindowLimiter
+from src.utils.subscriptions import SubscriptionHub
 from src.utils.weather_api import ForecastEntry, WeatherData
 
 # Load environment variables (IMPORTANT for Render)
@@ -17,10 +46,48 @@ load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 TEMPLATE_DIR = BASE_DIR / "templates"
+STATIC_DIR = BASE_DIR / "static"
 
+# Fingerprinted assets never change under the same URL; the landing page
+# itself is revalidated with its ETag so deploys are picked up immediately.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, max-age=0, must-revalidate"
 
-def serialize_weather(data: WeatherData) -> Dict[str, Any]:
-    return {
+NDJSON_MIMETYPE = "application/x-ndjson"
+MAX_SUBSCRIBED_CITIES = 20
+MAX_ANALYTICS_CITIES = 500
+MAX_RANKED_CITIES = 1000
+MAX_RANK_LIMIT = 100
+MAX_ESTIMATE_POINTS = 10000
+SSE_HEARTBEAT_SECONDS = 15
+
+# Routes charged against the per-client rate limit; the landing page, static
+# assets, health check and metrics are free.
+RATE_LIMITED_ENDPOINTS = {
+    "weather_endpoint",
+    "multi_weather",
+    "analytics",
+    "rank",
+    "subscribe",
+    "forecast",
+    "bundle",
+    "estimate",
+    "history_endpoint",
+    "ai_advice",
+    "detect_city_endpoint",
+}
+# Routes that don't hold upstream slots, admission or a deadline while they
+# run: subscriptions share one poller per city and history is served from
+# the local store.
+UNQUEUED_ENDPOINTS = {"subscribe", "history_endpoint"}
+# A multi-city request never holds more slots than it has fetch workers.
+MAX_UPSTREAM_WEIGHT = 8
+
+
+def serialize_weather(
+    data: WeatherData, derived: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    fields = {
         "city": data.city,
         "temperature": data.temperature,
         "feels_like": data.feels_like,
@@ -33,10 +100,15 @@ def serialize_weather(data: WeatherData) -> Dict[str, Any]:
         "icon": data.icon,
         "clouds": data.clouds,
     }
+    if derived is not None:
+        fields["derived"] = derived
+    return fields
 
 
-def serialize_forecast(entries: List[ForecastEntry]) -> List[Dict[str, Any]]:
-    return [
+def serialize_forecast(
+    entries: List[ForecastEntry], derived: Optional[List[Dict[str, float]]] = None
+) -> List[Dict[str, Any]]:
+    serialized = [
         {
             "time": entry.time.strftime("%H:%M"),
             "temperature": entry.temperature,
@@ -46,34 +118,417 @@ def serialize_forecast(entries: List[ForecastEntry]) -> List[Dict[str, Any]]:
         }
         for entry in entries
     ]
+    if derived is not None:
+        for fields, extra in zip(serialized, derived):
+            fields["derived"] = extra
+    return serialized
+
+
+def serialize_city_result(
+    city: str, result: Union[WeatherData, WeatherError]
+) -> Dict[str, Any]:
+    if isinstance(result, WeatherError):
+        return {"city": city, "error": str(result)}
+    return {"city": city, "data": serialize_weather(result)}
+
+
+def wants_derived() -> bool:
+    """Return True when the client asked for heat index, dew point etc."""
+
+    return request.args.get("derived", "").lower() in {"1", "true", "yes"}
+
+
+def wants_ndjson() -> bool:
+    """Return True when the client asked for a streamed NDJSON response."""
+
+    if request.args.get("stream", "").lower() in {"1", "true", "yes"}:
+        return True
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def parse_coords() -> Optional[Tuple[float, float]]:
+    """Return ``(lat, lon)`` from the query string, or None if absent.
+
+    Raises ``ValueError`` when only one is given or either is invalid.
+    """
+
+    lat = request.args.get("lat", "").strip()
+    lon = request.args.get("lon", "").strip()
+    if not lat and not lon:
+        return None
+    if not lat or not lon:
+        raise ValueError("Provide both lat and lon.")
+    return float(lat), float(lon)
+
+
+def rank_params() -> Dict[str, Any]:
+    """Merge ``/rank`` query parameters with an optional JSON body."""
+
+    body = request.get_json(silent=True) if request.method == "POST" else None
+    return {**request.args.to_dict(), **(body if isinstance(body, dict) else {})}
+
+
+def rank_cities(params: Dict[str, Any]) -> List[str]:
+    """Return the cities to rank; raises ``ValueError`` for an unknown set."""
+
+    if params.get("set"):
+        return get_city_set(str(params["set"]))
+    cities = params.get("cities") or []
+    if isinstance(cities, str):
+        cities = cities.split(",")
+    return [str(city) for city in cities]
+
+
+def incoming_request_id() -> str:
+    """Reuse a sane ``X-Request-ID`` from the caller, or make a new one."""
+
+    supplied = request.headers.get("X-Request-ID", "")
+    if 0 < len(supplied) <= 64 and supplied.isprintable():
+        return supplied
+    return uuid.uuid4().hex
+
+
+def client_id() -> str:
+    """Identify the caller by an issued API key if given, otherwise by address."""
+
+    api_key = request.headers.get("X-API-Key", "").strip()
+    # Unknown keys are ignored, or a fresh key per request would dodge the limit.
+    if api_key and api_key in get_settings().client_api_keys:
+        return f"key:{api_key}"
+    return f"ip:{request.remote_addr or 'unknown'}"
+
+
+def request_cost() -> int:
+    """Rate-limit cost of the current request: one per city it looks up."""
+
+    endpoint = request.endpoint
+    if endpoint in {"multi_weather", "analytics"}:
+        payload = request.get_json(silent=True)
+        cities = payload.get("cities") if isinstance(payload, dict) else None
+        count = len(cities) if isinstance(cities, list) else 0
+    elif endpoint == "rank":
+        try:
+            count = len(rank_cities(rank_params()))
+        except ValueError:
+            count = 0
+    elif endpoint == "subscribe":
+        count = sum(1 for city in request.args.get("cities", "").split(",") if city.strip())
+    else:
+        count = 1
+    return max(count, 1)
+
+
+def service_unavailable(message: str) -> Response:
+    response = jsonify({"error": message})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(SHED_RETRY_AFTER)
+    return response
+
+
+def stale_response(api: WeatherAPI) -> Optional[Response]:
+    """Answer ``/weather``, ``/forecast`` or ``/bundle`` by city from expired cache entries.
+
+    Returns None when the route or query has nothing cached to fall back on.
+    """
+
+    city = request.args.get("city", "").strip()
+    if not city:
+        return None
+    if request.endpoint == "weather_endpoint":
+        try:
+            client = api.with_locale(request.args.get("units"), request.args.get("lang"))
+        except ValueError:
+            return None
+        data = client.get_stale_weather(city)
+        body = None if data is None else serialize_weather(data)
+    elif request.endpoint == "forecast":
+        try:
+            hours = min(int(request.args.get("hours", 6)), 12)
+        except ValueError:
+            return None
+        entries = api.get_stale_forecast(city, hours=hours)
+        body = None if entries is None else {"city": city, "forecast": serialize_forecast(entries)}
+    elif request.endpoint == "bundle":
+        try:
+            hours = min(int(request.args.get("hours", 6)), 12)
+            client = api.with_locale(request.args.get("units"), request.args.get("lang"))
+        except ValueError:
+            return None
+        data = client.get_stale_weather(city)
+        entries = client.get_stale_forecast(city, hours=hours)
+        if data is None or entries is None:
+            return None
+        body = {
+            "city": data.city,
+            "weather": serialize_weather(data),
+            "forecast": serialize_forecast(entries),
+        }
+    else:
+        return None
+    if body is None:
+        return None
+    response = jsonify(body)
+    response.headers["X-Weather-Stale"] = "1"
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def parse_timestamp(value: Optional[str], default: int) -> int:
+    """Parse epoch seconds or an ISO 8601 datetime from a query parameter."""
+
+    if not value:
+        return default
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def send_precompressed(asset: PrecompressedAsset, cache_control: str) -> Response:
+    """Serve ``asset`` with content negotiation and ETag revalidation."""
+
+    headers = {
+        "ETag": f'"{asset.etag}"',
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if request.if_none_match.contains(asset.etag):
+        return Response(status=304, headers=headers)
+
+    body, encoding = asset.negotiate(request.headers.get("Accept-Encoding", ""))
+    response = Response(body, content_type=asset.content_type, headers=headers)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
 
 
 def create_app() -> Flask:
-    app = Flask(__name__, template_folder=str(TEMPLATE_DIR))
+    app = Flask(__name__, template_folder=str(TEMPLATE_DIR), static_folder=None)
+    assets = AssetBundle(STATIC_DIR)
+    app.jinja_env.globals["asset_url"] = assets.url
+    settings = get_settings()
+    configure_logging()
+    access_log = logging.getLogger(ACCESS_LOGGER)
+    if settings.trusted_proxies:
+        # Take the client address from X-Forwarded-For set by our proxies.
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=settings.trusted_proxies)
 
     # Initialize API inside app context
     api = WeatherAPI()
+    app.extensions["weather_api"] = api
+    if settings.cache_snapshot:
+        # Loaded before forking, so every worker starts with the hot cities.
+        snapshots = CacheSnapshotter(api.cache, settings.cache_snapshot)
+        snapshots.load()
+        api.add_listener(snapshots.mark_dirty)
+        app.extensions["cache_snapshots"] = snapshots
+    hub = SubscriptionHub(api, serializer=serialize_weather)
+    app.extensions["weather_hub"] = hub
+    ranker = CityRanker(api)
+    app.extensions["weather_ranker"] = ranker
+    interpolator = WeatherInterpolator(api.cache)
+    app.extensions["weather_interpolator"] = interpolator
+
+    # Every upstream observation is appended to the local history store.
+    history = HistoryStore(settings.history_db)
+    api.add_listener(history.record)
+    app.extensions["weather_history"] = history
+
+    # The landing page is static, so render and compress it once. Under a
+    # preloading server this happens in the master and is shared by every
+    # worker.
+    try:
+        with app.app_context():
+            landing_html = render_template("index.html")
+    except Exception:
+        # If template fails, still return 200
+        landing_html = "OK"
+    landing_page = PrecompressedAsset.build(landing_html, "text/html; charset=utf-8")
+
+    limiter = SlidingWindowLimiter()
+    upstream = FairQueue()
+    admission = AdmissionController()
+    app.extensions["rate_limiter"] = limiter
+    app.extensions["upstream_queue"] = upstream
+    app.extensions["admission"] = admission
+    metrics.register_gauge("admission.in_flight", lambda: admission.in_flight)
+    metrics.register_gauge("log.dropped", logging_utils.dropped_records)
+
+    @app.before_request
+    def start_request():
+        g.started_at = time.perf_counter()
+        g.request_id_token = request_id.set(incoming_request_id())
+
+    def shed_response() -> Response:
+        """Answer without upstream work: stale data if cached, else a 503."""
+
+        response = stale_response(api)
+        if response is not None:
+            metrics.increment("admission.degraded")
+            return response
+        metrics.increment("admission.shed")
+        return service_unavailable("Service is overloaded, please retry.")
+
+    @app.before_request
+    def admit_request():
+        if request.endpoint not in RATE_LIMITED_ENDPOINTS:
+            return None
+        client = client_id()
+        cost = request_cost()
+        if limiter.limit > 0:
+            decision = limiter.acquire(client, cost)
+            g.rate_limit = decision
+            if not decision.allowed:
+                metrics.increment("ratelimit.rejected")
+                if cost > decision.limit:
+                    message = f"This request costs {cost}; the limit is {decision.limit} per {limiter.window:g}s."
+                else:
+                    message = "Rate limit exceeded."
+                return jsonify({"error": message}), 429
+        if request.endpoint in UNQUEUED_ENDPOINTS:
+            return None
+        # Shed instead of queueing once this worker is saturated.
+        if not admission.try_acquire():
+            return shed_response()
+        g.admitted = True
+        g.deadline_token = set_deadline(DEFAULT_REQUEST_DEADLINE)
+        wait = min(upstream.timeout, max(time_remaining() or 0.0, 0.0))
+        g.upstream_slots = upstream.acquire(client, min(cost, MAX_UPSTREAM_WEIGHT), timeout=wait)
+        if not g.upstream_slots:
+            metrics.increment("fairqueue.timeouts")
+            return shed_response()
+        return None
+
+    @app.after_request
+    def add_rate_limit_headers(response: Response) -> Response:
+        decision = g.get("rate_limit")
+        if decision is not None:
+            response.headers.update(decision.headers())
+        return response
+
+    @app.after_request
+    def log_request(response: Response) -> Response:
+        response.headers["X-Request-ID"] = request_id.get() or ""
+        if request.endpoint != "healthz":
+            duration_ms = (time.perf_counter() - g.started_at) * 1000
+            access_log.info(
+                "%s %s %s %.1fms",
+                request.method,
+                request.path,
+                response.status_code,
+                duration_ms,
+                extra={
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "duration_ms": round(duration_ms, 2),
+                    "client": request.remote_addr,
+                },
+            )
+        return response
+
+    @app.teardown_request
+    def release_upstream(exc: Optional[BaseException]) -> None:
+        # Streamed responses keep the request context, and so their slots,
+        # until the last line has been sent.
+        upstream.release(g.pop("upstream_slots", 0))
+        if g.pop("admitted", False):
+            admission.release()
+        token = g.pop("deadline_token", None)
+        if token is not None:
+            reset_deadline(token)
+        token = g.pop("request_id_token", None)
+        if token is not None:
+            request_id.reset(token)
 
-    # Health check (Render needs this)
     @app.route("/", methods=["GET", "HEAD"])
     def health():
-        try:
-            return render_template("index.html")
-        except Exception:
-            # If template fails, still return 200
-            return "OK", 200
+        return send_precompressed(landing_page, REVALIDATE_CACHE)
+
+    # Health check (Render needs this); deliberately does no work.
+    @app.route("/healthz", methods=["GET", "HEAD"])
+    def healthz():
+        return "ok", 200, {"Content-Type": "text/plain", "Cache-Control": "no-store"}
+
+    @app.route("/static/<path:filename>", methods=["GET", "HEAD"])
+    def static_asset(filename: str):
+        asset = assets.get(filename)
+        if asset is None:
+            abort(404)
+        return send_precompressed(asset, IMMUTABLE_CACHE)
 
     @app.get("/weather")
     def weather_endpoint():
         city = request.args.get("city", "").strip()
-        if not city:
-            return jsonify({"error": "City query parameter is required."}), 400
         try:
-            data = api.get_current_weather(city)
-            return jsonify(serialize_weather(data))
+            coords = parse_coords()
+        except ValueError as exc:
+            return jsonify({"error": f"Invalid coordinates: {exc}"}), 400
+        if not city and coords is None:
+            return jsonify({"error": "City or lat/lon query parameters are required."}), 400
+        try:
+            client = api.with_locale(request.args.get("units"), request.args.get("lang"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        try:
+            if coords is not None:
+                data = client.get_current_weather_by_coords(*coords)
+            else:
+                data = client.get_current_weather(city)
+            derived = derive_weather([data], client.units)[0] if wants_derived() else None
+            return jsonify(serialize_weather(data, derived))
+        except ValueError as exc:
+            return jsonify({"error": f"Invalid coordinates: {exc}"}), 400
+        except DeadlineExceeded:
+            return shed_response()
         except WeatherError as exc:
             return jsonify({"error": str(exc)}), 400
 
+    @app.route("/estimate", methods=["GET", "POST"])
+    def estimate():
+        """Interpolate weather at coordinates from fresh cached stations.
+
+        GET takes ``lat``/``lon``; with ``fallback=1`` a point without a
+        confident estimate is fetched upstream instead. POST takes
+        ``{"points": [[lat, lon], ...]}`` and never calls upstream.
+        """
+
+        try:
+            min_confidence = float(request.args.get("min_confidence", 0))
+            if request.method == "GET":
+                coords = parse_coords()
+                if coords is None:
+                    return jsonify({"error": "lat and lon query parameters are required."}), 400
+                points = [coords]
+            else:
+                payload = request.get_json(silent=True) or {}
+                points = payload.get("points") if isinstance(payload, dict) else None
+                if not isinstance(points, list) or not points:
+                    return jsonify({"error": "Provide a non-empty list of [lat, lon] points."}), 400
+                if len(points) > MAX_ESTIMATE_POINTS:
+                    return jsonify({"error": f"At most {MAX_ESTIMATE_POINTS} points per request."}), 400
+                points = [(float(point[0]), float(point[1])) for point in points]
+            latitudes = [point[0] for point in points]
+            longitudes = [point[1] for point in points]
+            columns = interpolator.estimate_many(latitudes, longitudes, min_confidence)
+        except (ValueError, TypeError, IndexError) as exc:
+            return jsonify({"error": f"Invalid coordinates: {exc}"}), 400
+
+        estimates = interpolator.rows(columns, latitudes, longitudes)
+        if request.method == "POST":
+            return jsonify({"results": [asdict(item) for item in estimates]})
+
+        item = estimates[0]
+        if item.estimated or request.args.get("fallback", "").lower() not in {"1", "true", "yes"}:
+            return jsonify(asdict(item))
+        try:
+            data = api.get_current_weather_by_coords(*points[0])
+        except DeadlineExceeded:
+            return shed_response()
+        except WeatherError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify({**serialize_weather(data), "estimated": False, "confidence": 1.0})
+
     @app.post("/multi-weather")
     def multi_weather():
         payload = request.get_json(silent=True) or {}
@@ -81,22 +536,158 @@ def create_app() -> Flask:
         if not isinstance(cities, list) or not cities:
             return jsonify({"error": "Provide a non-empty list of cities."}), 400
 
-        results = []
-        for city in cities:
-            city_name = str(city).strip()
-            if not city_name:
-                continue
+        city_names = [name for name in (str(city).strip() for city in cities) if name]
+
+        if wants_ndjson():
+            # One line per city, emitted as soon as that city's fetch
+            # completes. A long list can outlast the request deadline, so
+            # each city gets a deadline of its own.
+            def generate():
+                cities = api.iter_current_weather(city_names, city_deadline=DEFAULT_REQUEST_DEADLINE)
+                for city_name, result in cities:
+                    yield json.dumps(serialize_city_result(city_name, result)) + "\n"
+
+            response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+            response.headers["Cache-Control"] = "no-store"
+            response.headers["X-Accel-Buffering"] = "no"
+            return response
+
+        fetched = dict(api.iter_current_weather(city_names))
+        # Answered in request order, unlike the stream.
+        return jsonify({"results": [serialize_city_result(name, fetched[name]) for name in city_names]})
+
+    @app.post("/analytics")
+    def analytics():
+        """Derived metrics for many cities, computed in one vectorized pass."""
+
+        payload = request.get_json(silent=True) or {}
+        cities = payload.get("cities", [])
+        if not isinstance(cities, list) or not cities:
+            return jsonify({"error": "Provide a non-empty list of cities."}), 400
+        if len(cities) > MAX_ANALYTICS_CITIES:
+            return jsonify({"error": f"Provide at most {MAX_ANALYTICS_CITIES} cities."}), 400
+        try:
+            client = api.with_locale(request.args.get("units"), request.args.get("lang"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        city_names = [name for name in (str(city).strip() for city in cities) if name]
+        fetched, errors = [], []
+        for city_name, result in client.iter_current_weather(city_names):
+            if isinstance(result, WeatherError):
+                errors.append(serialize_city_result(city_name, result))
+            else:
+                fetched.append((city_name, result))
+
+        derived = derive_weather([data for _, data in fetched], client.units)
+        results = [
+            {"city": city_name, "data": serialize_weather(data, extra)}
+            for (city_name, data), extra in zip(fetched, derived)
+        ]
+        return jsonify(
+            {"units": client.units, "results": results + errors, "summary": summarize(derived)}
+        )
+
+    @app.route("/rank", methods=["GET", "POST"])
+    def rank():
+        """Top-N cities by a metric, from a city list or a named set."""
+
+        params = rank_params()
+        try:
+            cities = rank_cities(params)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        try:
+            limit = int(params.get("n", 10))
+        except (TypeError, ValueError):
+            return jsonify({"error": "n must be an integer."}), 400
+        if not cities:
+            return jsonify({"error": "Provide cities or a named city set."}), 400
+        if len(cities) > MAX_RANKED_CITIES:
+            return jsonify({"error": f"Rank at most {MAX_RANKED_CITIES} cities."}), 400
+        order = str(params.get("order", "desc")).lower()
+        if order not in {"asc", "desc"}:
+            return jsonify({"error": "order must be asc or desc."}), 400
+
+        try:
+            ranking = ranker.rank(
+                cities,
+                metric=str(params.get("metric", "temperature")),
+                limit=min(limit, MAX_RANK_LIMIT),
+                ascending=order == "asc",
+                units=params.get("units"),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(
+            {
+                "metric": ranking.metric,
+                "units": ranking.units,
+                "order": order,
+                "considered": ranking.considered,
+                "results": [
+                    {
+                        "rank": position,
+                        "city": entry.city,
+                        "value": entry.value,
+                        "data": serialize_weather(entry.data),
+                    }
+                    for position, entry in enumerate(ranking.entries, start=1)
+                ],
+                "errors": [{"city": city, "error": message} for city, message in ranking.errors.items()],
+            }
+        )
+
+    @app.get("/subscribe")
+    def subscribe():
+        """Server-sent events stream of changed fields for the given cities."""
+
+        cities = [c for c in request.args.get("cities", "").split(",") if c.strip()]
+        if not cities:
+            return jsonify({"error": "Provide a comma-separated list of cities."}), 400
+        if len(cities) > MAX_SUBSCRIBED_CITIES:
+            return jsonify({"error": f"Subscribe to at most {MAX_SUBSCRIBED_CITIES} cities."}), 400
+
+        subscription = hub.subscribe(cities)
+
+        def generate():
             try:
-                data = api.get_current_weather(city_name)
-                results.append({"city": city_name, "data": serialize_weather(data)})
-            except WeatherError as exc:
-                results.append({"city": city_name, "error": str(exc)})
-        return jsonify({"results": results})
+                yield "retry: 5000\n\n"
+                while True:
+                    event = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                    if event is None:
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield f"event: weather\ndata: {json.dumps(event)}\n\n"
+            finally:
+                subscription.close()
+
+        response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-store"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
 
     @app.get("/forecast")
     def forecast():
         city = request.args.get("city", "").strip()
         hours = min(int(request.args.get("hours", 6)), 12)
+        try:
+            coords = parse_coords()
+        except ValueError as exc:
+            return jsonify({"error": f"Invalid coordinates: {exc}"}), 400
+
+        if coords is not None:
+            try:
+                entries = api.get_hourly_forecast_by_coords(*coords, hours=hours)
+            except ValueError as exc:
+                return jsonify({"error": f"Invalid coordinates: {exc}"}), 400
+            except DeadlineExceeded:
+                return shed_response()
+            except WeatherError as exc:
+                return jsonify({"error": str(exc)}), 400
+            city = city or f"{coords[0]:.3f}, {coords[1]:.3f}"
+            derived = derive_forecasts([entries])[0] if wants_derived() else None
+            return jsonify({"city": city, "forecast": serialize_forecast(entries, derived)})
 
         if not city:
             try:
@@ -106,10 +697,69 @@ def create_app() -> Flask:
 
         try:
             entries = api.get_hourly_forecast(city, hours=hours)
-            return jsonify({"city": city, "forecast": serialize_forecast(entries)})
+            derived = derive_forecasts([entries])[0] if wants_derived() else None
+            return jsonify({"city": city, "forecast": serialize_forecast(entries, derived)})
+        except DeadlineExceeded:
+            return shed_response()
         except WeatherError as exc:
             return jsonify({"error": str(exc)}), 400
 
+    @app.get("/bundle")
+    def bundle():
+        """Current weather and forecast for one city in a single response."""
+
+        city = request.args.get("city", "").strip()
+        try:
+            hours = min(int(request.args.get("hours", 6)), 12)
+            client = api.with_locale(request.args.get("units"), request.args.get("lang"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        if not city:
+            try:
+                city = detect_city()
+            except LocationDetectionError as exc:
+                return jsonify({"error": str(exc)}), 400
+
+        try:
+            data, entries = client.get_weather_bundle(city, hours=hours)
+        except DeadlineExceeded:
+            return shed_response()
+        except WeatherError as exc:
+            return jsonify({"error": str(exc)}), 400
+        if wants_derived():
+            derived = derive_weather([data], client.units)[0]
+            forecast_derived = derive_forecasts([entries], client.units)[0]
+        else:
+            derived = forecast_derived = None
+        return jsonify(
+            {
+                "city": data.city,
+                "weather": serialize_weather(data, derived),
+                "forecast": serialize_forecast(entries, forecast_derived),
+            }
+        )
+
+    @app.get("/history")
+    def history_endpoint():
+        city = request.args.get("city", "").strip()
+        if not city:
+            return jsonify({"error": "City query parameter is required."}), 400
+        resolution = request.args.get("resolution", "raw")
+        if resolution not in RESOLUTIONS:
+            return jsonify({"error": f"resolution must be one of {', '.join(RESOLUTIONS)}."}), 400
+        now = int(time.time())
+        try:
+            end = parse_timestamp(request.args.get("end"), now)
+            start = parse_timestamp(request.args.get("start"), end - 86400)
+            limit = min(int(request.args.get("limit", 1000)), 10_000)
+        except ValueError:
+            return jsonify({"error": "start/end must be epoch seconds or ISO 8601; limit an integer."}), 400
+
+        rows = history.query(city, start, end, resolution=resolution, limit=limit)
+        return jsonify(
+            {"city": city, "start": start, "end": end, "resolution": resolution, "observations": rows}
+        )
+
     @app.post("/ai-advice")
     def ai_advice():
         payload = request.get_json(silent=True) or {}
@@ -121,11 +771,30 @@ def create_app() -> Flask:
             data = api.get_current_weather(city)
             tip = generate_weather_tip(data)
             return jsonify({"city": city, "advice": tip})
+        except DeadlineExceeded:
+            return shed_response()
         except WeatherError as exc:
             return jsonify({"error": str(exc)}), 400
         except Exception as exc:
             return jsonify({"error": f"AI service unavailable: {exc}"}), 502
 
+    @app.get("/metrics")
+    def metrics_endpoint():
+        return jsonify(
+            {
+                "counters": metrics.snapshot(),
+                "cache": api.cache.stats(),
+                "hot_cities": api.hot_cities(),
+                "http": api.transport.pool_stats(),
+                "providers": api.providers.stats(),
+                "subscriptions": hub.stats(),
+                "history_dropped": history.dropped,
+                "rate_limit": limiter.stats(),
+                "upstream": upstream.stats(),
+                "admission": admission.stats(),
+            }
+        )
+
     @app.get("/detect-city")
     def detect_city_endpoint():
         try:
@@ -137,4 +806,22 @@ def create_app() -> Flask:
     return app
 
 
+def reinit_after_fork(app: Flask) -> None:
+    """Re-create per-process state in a worker forked from a preloaded app.
+
+    HTTP sessions, SQLite connections, locks and background threads are not
+    safe to inherit across ``fork()``; read-only data such as the rendered
+    landing page is kept and shared copy-on-write.
+    """
+
+    logging_utils.after_fork()
+    analytics_utils.after_fork()
+    api = app.extensions["weather_api"]
+    api.after_fork()
+    app.extensions["weather_hub"].after_fork()
+    app.extensions["weather_history"].after_fork()
+    if "cache_snapshots" in app.extensions:
+        app.extensions["cache_snapshots"].after_fork()
+
+
 app = create_app()
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import List
 
 from rich.console import Console
 from rich.table import Table
 
 from src.utils import (
+    ForecastEntry,
     WeatherAPI,
     WeatherError,
     LocationDetectionError,
@@ -17,13 +19,7 @@ console = Console()
 API = WeatherAPI()
 
 
-def format_hourly(city: str, hours: int = 12) -> None:
-    try:
-        forecast = API.get_hourly_forecast(city, hours=hours)
-    except WeatherError as exc:
-        console.print(f"Unable to fetch hourly forecast: {exc}", style="red")
-        return
-
+def format_hourly(city: str, forecast: List[ForecastEntry], hours: int = 12) -> None:
     table = Table(title=f"Next {hours} Hours in {city}")
     table.add_column("Time")
     table.add_column("Temp (°C)")
@@ -53,8 +49,9 @@ def main() -> None:
         console.print("City is required to continue.", style="red")
         return
 
+    # Current weather and forecast arrive together from one bundle call.
     try:
-        data = API.get_current_weather(city)
+        data, forecast = API.get_weather_bundle(city, hours=12)
     except WeatherError as exc:
         console.print(f"Error fetching weather: {exc}", style="red")
         return
@@ -63,7 +60,7 @@ def main() -> None:
         f"[bold blue]{data.city}[/bold blue]: {data.description.title()}, "
         f"Temp {data.temperature:.1f}°C, Feels {data.feels_like:.1f}°C, Wind {data.wind_speed:.1f} m/s",
     )
-    format_hourly(data.city)
+    format_hourly(data.city, forecast)
 
 
 if __name__ == "__main__":
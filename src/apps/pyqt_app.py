@@ -1,9 +1,13 @@
 """PyQt5 weather application with dark theme (Prompt 4)."""
 from __future__ import annotations
 
+from functools import partial
+from typing import Dict, List
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-from src.utils import WeatherAPI, WeatherError
+from src.utils import WeatherAPI
+from src.utils.fetch_service import FetchService
 
 ICON_MAP = {
     "01": "☀",
@@ -17,25 +21,28 @@ ICON_MAP = {
     "50": "🌫",
 }
 
+# Type-ahead lookups start once this many characters have been typed.
+TYPEAHEAD_MIN_CHARS = 3
+REFRESH_CHOICES = ("30", "60", "120", "300")
+BOARD_HEADERS = ("City", "Temperature", "Humidity", "Wind", "Description")
+
 
-class WeatherFetcher(QtCore.QObject):
-    """Logic class that interacts with the WeatherAPI."""
+class Dispatcher(QtCore.QObject):
+    """Runs callables on the GUI thread; safe to call from worker threads."""
 
-    weather_ready = QtCore.pyqtSignal(object)
-    error = QtCore.pyqtSignal(str)
+    call = QtCore.pyqtSignal(object)
 
     def __init__(self) -> None:
         super().__init__()
-        self.api = WeatherAPI()
+        self.call.connect(self._run)
 
-    @QtCore.pyqtSlot(str)
-    def fetch(self, city: str) -> None:
-        try:
-            data = self.api.get_current_weather(city)
-        except WeatherError as exc:
-            self.error.emit(str(exc))
-            return
-        self.weather_ready.emit(data)
+    @QtCore.pyqtSlot(object)
+    def _run(self, callback) -> None:
+        callback()
+
+    def __call__(self, callback) -> None:
+        # Emitting from another thread queues the slot on the GUI thread.
+        self.call.emit(callback)
 
 
 class WeatherWindow(QtWidgets.QMainWindow):
@@ -44,7 +51,7 @@ class WeatherWindow(QtWidgets.QMainWindow):
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("PyQt5 Weather App")
-        self.resize(460, 320)
+        self.resize(560, 380)
 
         self._setup_palette()
         self._init_widgets()
@@ -62,8 +69,14 @@ class WeatherWindow(QtWidgets.QMainWindow):
         self.setPalette(palette)
 
     def _init_widgets(self) -> None:
+        tabs = QtWidgets.QTabWidget()
+        self.setCentralWidget(tabs)
+
         central = QtWidgets.QWidget()
-        self.setCentralWidget(central)
+        tabs.addTab(central, "Search")
+        board = QtWidgets.QWidget()
+        tabs.addTab(board, "Cities")
+        self._init_board(board)
 
         layout = QtWidgets.QVBoxLayout(central)
 
@@ -108,30 +121,71 @@ class WeatherWindow(QtWidgets.QMainWindow):
 
         self.search_button.clicked.connect(self._handle_search)
         self.input_field.returnPressed.connect(self._handle_search)
+        self.input_field.textEdited.connect(self._handle_typing)
+
+    def _init_board(self, parent: QtWidgets.QWidget) -> None:
+        layout = QtWidgets.QVBoxLayout(parent)
+        controls = QtWidgets.QHBoxLayout()
+        self.board_cities = QtWidgets.QLineEdit("Delhi, Mumbai, London, New York, Tokyo")
+        self.board_interval = QtWidgets.QComboBox()
+        self.board_interval.addItems(REFRESH_CHOICES)
+        self.board_interval.setCurrentText("60")
+        self.board_button = QtWidgets.QPushButton("Start")
+        controls.addWidget(self.board_cities)
+        controls.addWidget(QtWidgets.QLabel("Every (s):"))
+        controls.addWidget(self.board_interval)
+        controls.addWidget(self.board_button)
+
+        self.board = QtWidgets.QTableWidget(0, len(BOARD_HEADERS))
+        self.board.setHorizontalHeaderLabels(BOARD_HEADERS)
+        self.board.horizontalHeader().setStretchLastSection(True)
+        self.board.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.board_status = QtWidgets.QLabel("Auto-refresh is off")
+
+        layout.addLayout(controls)
+        layout.addWidget(self.board)
+        layout.addWidget(self.board_status)
+
+        self._board_rows: Dict[str, int] = {}
+        self.board_timer = QtCore.QTimer(self)
+        self.board_timer.timeout.connect(self.refresh_board)
+        self.board_button.clicked.connect(self._toggle_board)
 
     def _init_worker(self) -> None:
-        self.worker = WeatherFetcher()
-        self.thread = QtCore.QThread()
-        self.worker.moveToThread(self.thread)
-        self.worker.weather_ready.connect(self._update_weather)
-        self.worker.error.connect(self._show_error)
-        self.thread.start()
+        self.api = WeatherAPI()
+        self.dispatcher = Dispatcher()
+        self.fetcher = FetchService(self.dispatcher)
 
     # ------------------------------------------------------------------
+    def _query(self, city: str):
+        return ("current", city.lower()), partial(self.api.get_current_weather, city)
+
     def _handle_search(self) -> None:
         city = self.input_field.text().strip()
         if not city:
             self.status_label.setText("Enter a city name.")
             return
         self.status_label.setText("Fetching weather...")
-        QtCore.QMetaObject.invokeMethod(
-            self.worker,
-            "fetch",
-            QtCore.Qt.QueuedConnection,
-            QtCore.Q_ARG(str, city),
+        key, func = self._query(city)
+        # A pending type-ahead query must not fire after this one.
+        self.fetcher.cancel("search")
+        self.fetcher.submit(key, func, self._update_weather, self._show_error, channel="search")
+
+    def _handle_typing(self, text: str) -> None:
+        city = text.strip()
+        if len(city) < TYPEAHEAD_MIN_CHARS:
+            self.fetcher.cancel("search")
+            return
+        key, func = self._query(city)
+        # Type-ahead failures (a half-typed name) only update the status line.
+        self.fetcher.debounce(
+            "search",
+            key,
+            func,
+            self._update_weather,
+            lambda exc: self.status_label.setText(f"No match for {city!r}"),
         )
 
-    @QtCore.pyqtSlot(object)
     def _update_weather(self, data) -> None:
         icon_key = data.icon[:2]
         self.icon_label.setText(ICON_MAP.get(icon_key, "🌍"))
@@ -142,14 +196,80 @@ class WeatherWindow(QtWidgets.QMainWindow):
         )
         self.status_label.setText(f"Updated: {data.city}")
 
-    @QtCore.pyqtSlot(str)
-    def _show_error(self, message: str) -> None:
+    def _show_error(self, exc: Exception) -> None:
+        message = str(exc)
         QtWidgets.QMessageBox.critical(self, "Weather Error", message)
         self.status_label.setText("Error: " + message)
 
+    # ------------------------------------------------------------------
+    def _board_city_names(self) -> List[str]:
+        names = (city.strip() for city in self.board_cities.text().split(","))
+        return list({name.lower(): name for name in names if name}.values())
+
+    def _toggle_board(self) -> None:
+        if self.board_timer.isActive():
+            self.board_timer.stop()
+            self.board_button.setText("Start")
+            self.board_status.setText("Auto-refresh is off")
+            return
+        self.board_button.setText("Stop")
+        self.refresh_board()
+
+    def refresh_board(self) -> None:
+        cities = self._board_city_names()
+        if [name.lower() for name in cities] != list(self._board_rows):
+            self.board.setRowCount(0)
+            self._board_rows = {}
+            for row, city in enumerate(cities):
+                self.board.insertRow(row)
+                self.board.setItem(row, 0, QtWidgets.QTableWidgetItem(city))
+                self._board_rows[city.lower()] = row
+        for city in cities:
+            key, func = self._query(city)
+            # One channel per row: a slow answer from the previous round
+            # never overwrites a newer one.
+            self.fetcher.submit(
+                key,
+                func,
+                partial(self._update_board_row, city),
+                partial(self._board_row_error, city),
+                channel=f"board:{city.lower()}",
+                use_cache=False,
+            )
+        interval = int(self.board_interval.currentText())
+        self.board_timer.start(interval * 1000)
+        self.board_status.setText(f"Refreshing {len(cities)} cities every {interval}s")
+
+    def _set_board_row(self, city: str, values: List[str]) -> None:
+        row = self._board_rows.get(city.lower())
+        if row is None:
+            return
+        for column, value in enumerate(values):
+            item = self.board.item(row, column)
+            # Only cells whose text changed are touched.
+            if item is None:
+                self.board.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+            elif item.text() != value:
+                item.setText(value)
+
+    def _update_board_row(self, city: str, data) -> None:
+        self._set_board_row(
+            city,
+            [
+                data.city,
+                f"{data.temperature:.1f}°C",
+                f"{data.humidity}%",
+                f"{data.wind_speed:.1f} m/s",
+                data.description,
+            ],
+        )
+
+    def _board_row_error(self, city: str, exc: Exception) -> None:
+        self._set_board_row(city, [city, "--", "--", "--", str(exc)])
+
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:  # noqa: N802
-        self.thread.quit()
-        self.thread.wait()
+        self.board_timer.stop()
+        self.fetcher.shutdown()
         super().closeEvent(event)
 
 
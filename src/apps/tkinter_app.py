@@ -1,11 +1,14 @@
 """Tkinter GUI weather app (Prompt 3)."""
 from __future__ import annotations
 
-import threading
+import queue
 import tkinter as tk
+from functools import partial
 from tkinter import messagebox, ttk
+from typing import Callable, Dict, List, Optional
 
-from src.utils import WeatherAPI, WeatherError
+from src.utils import WeatherAPI
+from src.utils.fetch_service import FetchService
 
 ICON_MAP = {
     "01": "☀️",
@@ -19,35 +22,64 @@ ICON_MAP = {
     "50": "🌫️",
 }
 
+# Type-ahead lookups start once this many characters have been typed.
+TYPEAHEAD_MIN_CHARS = 3
+DISPATCH_POLL_MS = 30
+REFRESH_CHOICES = (30, 60, 120, 300)
+BOARD_COLUMNS = ("temperature", "humidity", "wind", "description")
+
 
 class WeatherApp(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
         self.title("Tkinter Weather App")
-        self.geometry("420x320")
+        self.geometry("520x380")
         self.configure(padx=20, pady=20)
 
         self.api = WeatherAPI()
+        # Tk is not thread-safe: workers hand callbacks to this queue and the
+        # event loop drains it.
+        self._calls: "queue.SimpleQueue[Callable[[], None]]" = queue.SimpleQueue()
+        self.fetcher = FetchService(self._calls.put)
         self.city_var = tk.StringVar()
         self.status_var = tk.StringVar(value="Enter a city and press Search")
+        self.board_cities_var = tk.StringVar(value="Delhi, Mumbai, London, New York, Tokyo")
+        self.board_interval_var = tk.IntVar(value=60)
+        self.board_status_var = tk.StringVar(value="Auto-refresh is off")
+        self._board_rows: Dict[str, str] = {}
+        self._board_job: Optional[str] = None
 
         self._build_layout()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(DISPATCH_POLL_MS, self._drain_calls)
 
     # ------------------------------------------------------------------
     def _build_layout(self) -> None:
-        input_frame = ttk.Frame(self)
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill="both", expand=True)
+
+        search_tab = ttk.Frame(notebook, padding=10)
+        board_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(search_tab, text="Search")
+        notebook.add(board_tab, text="Cities")
+        self._build_search_tab(search_tab)
+        self._build_board_tab(board_tab)
+
+    def _build_search_tab(self, parent: ttk.Frame) -> None:
+        input_frame = ttk.Frame(parent)
         input_frame.pack(fill="x", pady=(0, 15))
 
         ttk.Label(input_frame, text="City:").pack(side="left")
         city_entry = ttk.Entry(input_frame, textvariable=self.city_var)
         city_entry.pack(side="left", fill="x", expand=True, padx=(8, 8))
         city_entry.bind("<Return>", lambda _: self.fetch_weather())
+        city_entry.bind("<KeyRelease>", self._on_typing)
 
         ttk.Button(input_frame, text="Search", command=self.fetch_weather).pack(side="right")
 
-        self.progress = ttk.Progressbar(self, mode="indeterminate")
+        self.progress = ttk.Progressbar(parent, mode="indeterminate")
 
-        self.card = ttk.LabelFrame(self, text="Weather Details", padding=15)
+        self.card = ttk.LabelFrame(parent, text="Weather Details", padding=15)
         self.card.pack(fill="both", expand=True)
 
         self.icon_label = ttk.Label(self.card, text="", font=("Segoe UI", 28))
@@ -62,10 +94,66 @@ class WeatherApp(tk.Tk):
         for label in self.info_labels.values():
             label.pack(anchor="w", pady=2)
 
-        self.status_label = ttk.Label(self, textvariable=self.status_var)
+        self.status_label = ttk.Label(parent, textvariable=self.status_var)
         self.status_label.pack(pady=(10, 0))
 
+    def _build_board_tab(self, parent: ttk.Frame) -> None:
+        controls = ttk.Frame(parent)
+        controls.pack(fill="x", pady=(0, 10))
+        ttk.Entry(controls, textvariable=self.board_cities_var).pack(
+            side="left", fill="x", expand=True, padx=(0, 8)
+        )
+        ttk.Label(controls, text="Every (s):").pack(side="left")
+        ttk.Combobox(
+            controls,
+            textvariable=self.board_interval_var,
+            values=REFRESH_CHOICES,
+            width=5,
+            state="readonly",
+        ).pack(side="left", padx=(4, 8))
+        self.board_button = ttk.Button(controls, text="Start", command=self.toggle_board)
+        self.board_button.pack(side="right")
+
+        self.board = ttk.Treeview(parent, columns=BOARD_COLUMNS, height=10)
+        self.board.heading("#0", text="City")
+        self.board.column("#0", width=120)
+        for column in BOARD_COLUMNS:
+            self.board.heading(column, text=column.title())
+            self.board.column(column, width=90, anchor="center")
+        self.board.pack(fill="both", expand=True)
+
+        ttk.Label(parent, textvariable=self.board_status_var).pack(pady=(8, 0))
+
     # ------------------------------------------------------------------
+    def _drain_calls(self) -> None:
+        while True:
+            try:
+                callback = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            callback()
+        self.after(DISPATCH_POLL_MS, self._drain_calls)
+
+    def _query(self, city: str):
+        return ("current", city.lower()), partial(self.api.get_current_weather, city)
+
+    def _on_typing(self, event: tk.Event) -> None:
+        if event.keysym == "Return":
+            return
+        city = self.city_var.get().strip()
+        if len(city) < TYPEAHEAD_MIN_CHARS:
+            self.fetcher.cancel("search")
+            return
+        key, func = self._query(city)
+        # Type-ahead failures (a half-typed name) only update the status line.
+        self.fetcher.debounce(
+            "search",
+            key,
+            func,
+            self._update_view,
+            lambda exc: self.status_var.set(f"No match for {city!r}"),
+        )
+
     def fetch_weather(self) -> None:
         city = self.city_var.get().strip()
         if not city:
@@ -76,17 +164,13 @@ class WeatherApp(tk.Tk):
         self.progress.pack(fill="x", pady=(0, 10))
         self.progress.start()
 
-        threading.Thread(target=self._fetch_async, args=(city,), daemon=True).start()
+        key, func = self._query(city)
+        # A pending type-ahead query must not fire after this one.
+        self.fetcher.cancel("search")
+        self.fetcher.submit(key, func, self._update_view, self._handle_error, channel="search")
 
-    def _fetch_async(self, city: str) -> None:
-        try:
-            data = self.api.get_current_weather(city)
-        except WeatherError as exc:
-            self.after(0, lambda: self._handle_error(str(exc)))
-            return
-        self.after(0, lambda: self._update_view(data))
-
-    def _handle_error(self, message: str) -> None:
+    def _handle_error(self, exc: Exception) -> None:
+        message = str(exc)
         self.progress.stop()
         self.progress.pack_forget()
         self.status_var.set("Error: " + message)
@@ -104,6 +188,72 @@ class WeatherApp(tk.Tk):
         self.info_labels["description"].config(text=f"Description: {data.description.title()}")
         self.status_var.set(f"Weather updated for {data.city}")
 
+    # ------------------------------------------------------------------
+    def _board_cities(self) -> List[str]:
+        names = (city.strip() for city in self.board_cities_var.get().split(","))
+        return list({name.lower(): name for name in names if name}.values())
+
+    def toggle_board(self) -> None:
+        if self._board_job is not None:
+            self.after_cancel(self._board_job)
+            self._board_job = None
+            self.board_button.config(text="Start")
+            self.board_status_var.set("Auto-refresh is off")
+            return
+        self.board_button.config(text="Stop")
+        self.refresh_board()
+
+    def refresh_board(self) -> None:
+        cities = self._board_cities()
+        wanted = {city.lower() for city in cities}
+        for row in list(self._board_rows):
+            if row not in wanted:
+                self.board.delete(row)
+                del self._board_rows[row]
+        for city in cities:
+            key, func = self._query(city)
+            # One channel per row: a slow answer from the previous round
+            # never overwrites a newer one.
+            self.fetcher.submit(
+                key,
+                func,
+                partial(self._update_board_row, city),
+                partial(self._board_row_error, city),
+                channel=f"board:{city.lower()}",
+                use_cache=False,
+            )
+        interval = max(int(self.board_interval_var.get()), 5)
+        self.board_status_var.set(f"Refreshing {len(cities)} cities every {interval}s")
+        self._board_job = self.after(interval * 1000, self.refresh_board)
+
+    def _set_board_row(self, city: str, text: str, values: tuple) -> None:
+        row = city.lower()
+        if self._board_rows.get(row) is None:
+            self.board.insert("", "end", iid=row, text=text, values=values)
+        elif self.board.item(row, "values") != tuple(str(value) for value in values):
+            # Only rows whose values changed are touched.
+            self.board.item(row, text=text, values=values)
+        self._board_rows[row] = text
+
+    def _update_board_row(self, city: str, data) -> None:
+        self._set_board_row(
+            city,
+            data.city,
+            (
+                f"{data.temperature:.1f} °C",
+                f"{data.humidity}%",
+                f"{data.wind_speed:.1f} m/s",
+                data.description,
+            ),
+        )
+
+    def _board_row_error(self, city: str, exc: Exception) -> None:
+        self._set_board_row(city, city, ("--", "--", "--", str(exc)))
+
+    def _on_close(self) -> None:
+        self.fetcher.shutdown()
+        self.destroy()
+
 
 def run() -> None:
     app = WeatherApp()
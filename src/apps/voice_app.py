@@ -1,51 +1,85 @@
-"""Voice-controlled weather app (Prompt 8)."""
+"""Voice-controlled weather app (Prompt 8).
+
+The weather lookup starts as soon as the city has been recognized and runs
+while the acknowledgement is being spoken, so the summary follows the
+acknowledgement almost immediately. Speech engines are created on first
+use, and fixed phrases are rendered once and replayed afterwards, also in
+later runs (see ``WEATHER_VOICE_CACHE``).
+"""
 from __future__ import annotations
 
-import speech_recognition as sr
-import pyttsx3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
 
+from src.config.settings import get_settings
 from src.utils import WeatherAPI, WeatherError, VoiceInputError
+from src.utils.speech import GoogleRecognizer, PhraseCache, Pyttsx3Synthesizer, Recognizer
+from src.utils.weather_api import WeatherData
 
-recognizer = sr.Recognizer()
-engine = pyttsx3.init()
+PROMPT = "Please say the city name"
 
 
-def speak(text: str) -> None:
-    engine.say(text)
-    engine.runAndWait()
+@lru_cache(maxsize=None)
+def default_speaker() -> PhraseCache:
+    return PhraseCache(Pyttsx3Synthesizer(), directory=get_settings().voice_cache or None)
 
 
-def listen_for_city() -> str:
-    with sr.Microphone() as source:
-        speak("Please say the city name")
-        audio = recognizer.listen(source, timeout=5, phrase_time_limit=5)
-    try:
-        return recognizer.recognize_google(audio)
-    except sr.UnknownValueError as exc:
-        raise VoiceInputError("Could not understand audio.") from exc
-    except sr.RequestError as exc:
-        raise VoiceInputError("Speech API unavailable.") from exc
+@lru_cache(maxsize=None)
+def default_recognizer() -> Recognizer:
+    return GoogleRecognizer()
 
 
-def main() -> None:
-    api = WeatherAPI()
+def speak(text: str, cache: bool = False) -> None:
+    default_speaker().say(text, cache=cache)
+
+
+def listen_for_city(
+    recognizer: Optional[Recognizer] = None, speaker: Optional[PhraseCache] = None
+) -> str:
+    recognizer = recognizer or default_recognizer()
+    speaker = speaker or default_speaker()
+    return recognizer.listen(before_listening=lambda: speaker.say(PROMPT, cache=True))
+
+
+def describe_weather(data: WeatherData) -> str:
+    return (
+        f"Weather in {data.city}: {data.description}. Temperature {data.temperature:.1f} degrees, "
+        f"feels like {data.feels_like:.1f}. Humidity {data.humidity} percent. Wind {data.wind_speed:.1f} meters per second."
+    )
+
+
+def run_pipeline(
+    api: WeatherAPI,
+    recognizer: Recognizer,
+    speaker: PhraseCache,
+    executor: ThreadPoolExecutor,
+) -> Optional[WeatherData]:
+    """Listen for one city and speak its weather; return the data if found."""
+
     try:
-        city = listen_for_city()
+        city = listen_for_city(recognizer, speaker)
     except VoiceInputError as exc:
-        speak(str(exc))
-        return
+        speaker.say(str(exc), cache=True)
+        return None
 
-    speak(f"Fetching weather for {city}")
+    # Start the lookup first so it overlaps with the acknowledgement.
+    lookup = executor.submit(api.get_current_weather, city)
+    speaker.say(f"Fetching weather for {city}")
     try:
-        data = api.get_current_weather(city)
+        data = lookup.result()
     except WeatherError as exc:
-        speak(f"Error fetching weather: {exc}")
-        return
+        speaker.say(f"Error fetching weather: {exc}")
+        return None
 
-    speak(
-        f"Weather in {data.city}: {data.description}. Temperature {data.temperature:.1f} degrees, "
-        f"feels like {data.feels_like:.1f}. Humidity {data.humidity} percent. Wind {data.wind_speed:.1f} meters per second."
-    )
+    speaker.say(describe_weather(data))
+    return data
+
+
+def main() -> None:
+    api = WeatherAPI()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-fetch") as executor:
+        run_pipeline(api, default_recognizer(), default_speaker(), executor)
 
 
 if __name__ == "__main__":
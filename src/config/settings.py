@@ -8,10 +8,11 @@ from typing import Optional
 
 import os
 
-#from dotenv import load_dotenv
+from dotenv import load_dotenv
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 ENV_FILE = ROOT_DIR / ".env"
+DATA_DIR = ROOT_DIR / "data"
 
 if ENV_FILE.exists():
     load_dotenv(ENV_FILE)
@@ -28,11 +29,35 @@ class Settings:
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     default_units: str = os.getenv("OPENWEATHER_UNITS", "metric")
     language: str = os.getenv("OPENWEATHER_LANG", "en")
+    history_db: str = os.getenv("WEATHER_HISTORY_DB", str(DATA_DIR / "history.sqlite3"))
+    # Empty disables warm-start cache snapshots.
+    cache_snapshot: str = os.getenv("WEATHER_CACHE_SNAPSHOT", str(DATA_DIR / "cache_snapshot.bin"))
+    # Rendered voice prompts; empty keeps them in memory only.
+    voice_cache: str = os.getenv("WEATHER_VOICE_CACHE", str(DATA_DIR / "voice"))
+    transport: str = os.getenv("WEATHER_TRANSPORT", "live").strip().lower()
+    transport_archive: str = os.getenv(
+        "WEATHER_ARCHIVE", str(DATA_DIR / "weather_archive.sqlite3")
+    )
+    replay_latency: str = os.getenv("WEATHER_REPLAY_LATENCY", "")
+    http_pool_size: int = int(os.getenv("WEATHER_HTTP_POOL_SIZE", "32"))
+    http_per_thread_sessions: bool = os.getenv("WEATHER_HTTP_PER_THREAD", "") in {"1", "true", "yes"}
+    # Number of reverse proxies in front of the web app whose
+    # X-Forwarded-For entries identify the client (1 on Render).
+    trusted_proxies: int = int(os.getenv("WEATHER_TRUSTED_PROXIES", "0"))
+    # Comma-separated client API keys that get their own rate-limit bucket;
+    # any other X-API-Key is ignored and the caller is limited by address.
+    client_api_keys: frozenset = frozenset(
+        key.strip() for key in os.getenv("WEATHER_API_KEYS", "").split(",") if key.strip()
+    )
 
     @property
     def has_openweather_key(self) -> bool:
         return bool(self.openweather_api_key)
 
+    @property
+    def is_replay(self) -> bool:
+        return self.transport == "replay"
+
     @property
     def has_openai_key(self) -> bool:
         return bool(self.openai_api_key)
@@ -1,6 +1,7 @@
 """Utility helpers for the weather project."""
 
 from .exceptions import (
+    DeadlineExceeded,
     LocationDetectionError,
     MissingAPIKeyError,
     NetworkError,
@@ -25,6 +26,7 @@ __all__ = [
     "WeatherAPIError",
     "MissingAPIKeyError",
     "NetworkError",
+    "DeadlineExceeded",
     "VoiceInputError",
     "LocationDetectionError",
 ]
@@ -0,0 +1,105 @@
+"""Request deadlines and bounded admission for the web services.
+
+A deadline is stored in a context variable when a request is admitted and
+read by ``WeatherAPI._request``, which shortens its upstream timeout to the
+time left and fails fast with ``DeadlineExceeded`` once it has passed. Work
+handed to thread pools must run in a copy of the caller's context (see
+``WeatherAPI.iter_current_weather``) to see the deadline.
+
+:class:`AdmissionController` caps how many requests a worker runs at once.
+Requests over the cap are not queued; the caller sheds them, serving stale
+cached data where it has some and a fast 503 otherwise.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, Optional
+
+from src.utils.exceptions import DeadlineExceeded
+
+DEFAULT_REQUEST_DEADLINE = float(os.getenv("WEATHER_REQUEST_DEADLINE", "10"))
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("WEATHER_MAX_IN_FLIGHT", "6"))
+# Seconds a shed client is asked to wait before retrying.
+SHED_RETRY_AFTER = 2
+
+_deadline: ContextVar[Optional[float]] = ContextVar("weather_deadline", default=None)
+
+
+def set_deadline(seconds: Optional[float]) -> "Token[Optional[float]]":
+    """Give the current context ``seconds`` to finish (None for no limit)."""
+
+    return _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def reset_deadline(token: "Token[Optional[float]]") -> None:
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def upstream_timeout(default: float) -> float:
+    """Return the timeout for an upstream call made now.
+
+    Raises ``DeadlineExceeded`` if the deadline has already passed.
+    """
+
+    remaining = time_remaining()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded.")
+    return min(default, remaining)
+
+
+class AdmissionController:
+    """Non-blocking cap on the number of requests in flight."""
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.shed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.max_in_flight > 0 and self._in_flight >= self.max_in_flight:
+                self.shed += 1
+                return False
+            self._in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
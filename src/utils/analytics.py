@@ -0,0 +1,247 @@
+"""Vectorized derived metrics: dew point, heat index, wind chill and comfort.
+
+The formulas work on NumPy arrays of metric observations (°C, %, m/s), so a
+batch of thousands of cities or forecast steps is computed in one pass
+instead of row by row. Batches of at least ``WEATHER_ANALYTICS_POOL_THRESHOLD``
+rows (far beyond what the web routes accept, but reachable from batch jobs
+calling :func:`compute_batch` or ``derive_*`` directly) are split across a
+process pool that is started on first use and reused afterwards.
+
+``derive_weather`` and ``derive_forecasts`` accept records in any supported
+unit system and return temperature-like fields in that same system.
+"""
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.models import ForecastEntry, WeatherData
+from src.utils.units import CANONICAL_UNITS, UNIT_SYSTEMS
+
+PROCESS_POOL_THRESHOLD = int(os.getenv("WEATHER_ANALYTICS_POOL_THRESHOLD", "200000"))
+POOL_PROCESSES = int(os.getenv("WEATHER_ANALYTICS_PROCESSES", "0")) or os.cpu_count() or 1
+
+DERIVED_FIELDS = ("dew_point", "heat_index", "wind_chill", "apparent_temperature", "comfort")
+# Fields expressed as temperatures, converted back to the caller's units.
+TEMPERATURE_FIELDS = ("dew_point", "heat_index", "wind_chill", "apparent_temperature")
+
+# Comfortable ranges used by the comfort score.
+COMFORT_TEMPERATURE = (18.0, 24.0)
+COMFORT_HUMIDITY = (30.0, 60.0)
+COMFORT_WIND = 8.0
+
+Columns = Dict[str, np.ndarray]
+
+
+def dew_point(temperature: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """Magnus-formula dew point in °C."""
+
+    a, b = 17.625, 243.04
+    gamma = np.log(np.clip(humidity, 1.0, 100.0) / 100.0) + a * temperature / (b + temperature)
+    return b * gamma / (a - gamma)
+
+
+def heat_index(temperature: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """NWS heat index (Rothfusz regression with adjustments) in °C."""
+
+    t = temperature * 9 / 5 + 32
+    rh = np.clip(humidity, 0.0, 100.0)
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 6.83783e-3 * t * t
+        - 5.481717e-2 * rh * rh
+        + 1.22874e-3 * t * t * rh
+        + 8.5282e-4 * t * rh * rh
+        - 1.99e-6 * t * t * rh * rh
+    )
+    dry = (rh < 13) & (t >= 80) & (t <= 112)
+    full = full - np.where(
+        dry, (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17), 0.0
+    )
+    humid = (rh > 85) & (t >= 80) & (t <= 87)
+    full = full + np.where(humid, (rh - 85) / 10 * (87 - t) / 5, 0.0)
+    result = np.where((simple + t) / 2 >= 80, full, simple)
+    return (result - 32) * 5 / 9
+
+
+def wind_chill(temperature: np.ndarray, wind_speed: np.ndarray) -> np.ndarray:
+    """NWS/Environment Canada wind chill in °C; the air temperature where it does not apply."""
+
+    kmh = np.maximum(wind_speed, 0.0) * 3.6
+    factor = kmh ** 0.16
+    chill = 13.12 + 0.6215 * temperature - 11.37 * factor + 0.3965 * temperature * factor
+    return np.where((temperature <= 10) & (kmh > 4.8), chill, temperature)
+
+
+def compute(temperature: np.ndarray, humidity: np.ndarray, wind_speed: np.ndarray) -> Columns:
+    """Return every derived field for metric input columns."""
+
+    temperature = np.asarray(temperature, dtype=np.float64)
+    humidity = np.asarray(humidity, dtype=np.float64)
+    wind_speed = np.asarray(wind_speed, dtype=np.float64)
+
+    heat = heat_index(temperature, humidity)
+    chill = wind_chill(temperature, wind_speed)
+    apparent = np.where(temperature >= 26.7, heat, chill)
+
+    low, high = COMFORT_TEMPERATURE
+    humidity_low, humidity_high = COMFORT_HUMIDITY
+    penalty = (
+        4.0 * np.abs(apparent - np.clip(apparent, low, high))
+        + 0.5 * np.abs(humidity - np.clip(humidity, humidity_low, humidity_high))
+        + 3.0 * np.maximum(wind_speed - COMFORT_WIND, 0.0)
+    )
+    return {
+        "dew_point": dew_point(temperature, humidity),
+        "heat_index": heat,
+        "wind_chill": chill,
+        "apparent_temperature": apparent,
+        "comfort": np.clip(100.0 - penalty, 0.0, 100.0),
+    }
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _compute_chunk(chunk: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> Columns:
+    return compute(*chunk)
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned rather than forked: the web apps run background
+                # threads that must not be copied into a child.
+                _pool = ProcessPoolExecutor(
+                    max_workers=POOL_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes, if any were started."""
+
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def after_fork() -> None:
+    """Forget a pool inherited from the parent (call in the child)."""
+
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+atexit.register(shutdown_pool)
+
+
+def compute_batch(temperature: np.ndarray, humidity: np.ndarray, wind_speed: np.ndarray) -> Columns:
+    """Like :func:`compute`, split across the shared process pool for very large batches."""
+
+    if len(temperature) < PROCESS_POOL_THRESHOLD or POOL_PROCESSES < 2:
+        return compute(temperature, humidity, wind_speed)
+
+    chunks = list(
+        zip(
+            np.array_split(np.asarray(temperature, dtype=np.float64), POOL_PROCESSES),
+            np.array_split(np.asarray(humidity, dtype=np.float64), POOL_PROCESSES),
+            np.array_split(np.asarray(wind_speed, dtype=np.float64), POOL_PROCESSES),
+        )
+    )
+    parts = list(_process_pool().map(_compute_chunk, chunks))
+    return {name: np.concatenate([part[name] for part in parts]) for name in DERIVED_FIELDS}
+
+
+def _to_metric(
+    temperature: np.ndarray, wind_speed: np.ndarray, units: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    (scale, offset), wind_scale = UNIT_SYSTEMS[units]
+    return (temperature - offset) / scale, wind_speed / wind_scale
+
+
+def _rows(columns: Columns, units: str) -> List[Dict[str, float]]:
+    (scale, offset), _ = UNIT_SYSTEMS[units]
+    rounded = {
+        name: np.round(values * scale + offset if name in TEMPERATURE_FIELDS else values, 2).tolist()
+        for name, values in columns.items()
+    }
+    names = list(rounded)
+    return [dict(zip(names, row)) for row in zip(*rounded.values())]
+
+
+def _derive(
+    temperature: Sequence[float],
+    humidity: Sequence[float],
+    wind_speed: Sequence[float],
+    units: str,
+) -> List[Dict[str, float]]:
+    temperature_c, wind_ms = _to_metric(
+        np.asarray(temperature, dtype=np.float64), np.asarray(wind_speed, dtype=np.float64), units
+    )
+    columns = compute_batch(temperature_c, np.asarray(humidity, dtype=np.float64), wind_ms)
+    return _rows(columns, units)
+
+
+def derive_weather(
+    records: Sequence[WeatherData], units: str = CANONICAL_UNITS
+) -> List[Dict[str, float]]:
+    """Derived fields for each of ``records`` (observations in ``units``)."""
+
+    return _derive(
+        [record.temperature for record in records],
+        [record.humidity for record in records],
+        [record.wind_speed for record in records],
+        units,
+    )
+
+
+def derive_forecasts(
+    series: Sequence[Sequence[ForecastEntry]], units: str = CANONICAL_UNITS
+) -> List[List[Dict[str, float]]]:
+    """Derived fields for several forecast series, computed in one pass."""
+
+    flat = [entry for entries in series for entry in entries]
+    rows = _derive(
+        [entry.temperature for entry in flat],
+        [entry.humidity for entry in flat],
+        [entry.wind_speed for entry in flat],
+        units,
+    )
+    result, start = [], 0
+    for entries in series:
+        result.append(rows[start : start + len(entries)])
+        start += len(entries)
+    return result
+
+
+def summarize(rows: Sequence[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Min, mean and max of each derived field across ``rows``."""
+
+    if not rows:
+        return {}
+    summary = {}
+    for name in DERIVED_FIELDS:
+        values = np.fromiter((row[name] for row in rows), dtype=np.float64, count=len(rows))
+        summary[name] = {
+            "min": round(float(values.min()), 2),
+            "mean": round(float(values.mean()), 2),
+            "max": round(float(values.max()), 2),
+        }
+    return summary
@@ -0,0 +1,150 @@
+"""Thread-safe in-memory caches for weather lookups."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.utils.tinylfu import TinyLFU
+
+DEFAULT_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "300"))
+# How long expired entries are kept for :meth:`TTLCache.get_stale`.
+DEFAULT_STALE_TTL = float(os.getenv("WEATHER_CACHE_STALE_TTL", "3600"))
+# Admission policy of WeatherAPI's cache: "tinylfu" or "lru".
+DEFAULT_CACHE_ADMISSION = os.getenv("WEATHER_CACHE_ADMISSION", "tinylfu").strip().lower()
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Expiry times are wall-clock timestamps so that entries keep their meaning
+    if they are ever written out and read back by another process. Expired
+    entries are retained for another ``stale_ttl`` seconds (still subject to
+    LRU eviction) so an overloaded service can fall back to them.
+
+    With ``admission="tinylfu"``, a full cache only admits a new key if it
+    has been requested more often than the least recently used entry, unless
+    that entry has already expired.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = DEFAULT_CACHE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        admission: str = "lru",
+    ) -> None:
+        if admission not in {"lru", "tinylfu"}:
+            raise ValueError(f"Unknown cache admission policy {admission!r}.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.admission: Optional[TinyLFU] = TinyLFU(maxsize) if admission == "tinylfu" else None
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` if missing/expired."""
+
+        with self._lock:
+            if self.admission is not None:
+                self.admission.record(key)
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            now = time.time()
+            if expires_at <= now:
+                if expires_at + self.stale_ttl <= now:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return ``key``'s value even if expired, unless past ``stale_ttl``.
+
+        Does not count as a hit or miss.
+        """
+
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] + self.stale_ttl <= time.time():
+                return None
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if (
+                self.admission is not None
+                and key not in self._data
+                and len(self._data) >= self.maxsize
+            ):
+                victim = next(iter(self._data))
+                if self._data[victim][0] > now and not self.admission.admit(key, victim):
+                    return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def entries(self) -> List[Tuple[Hashable, float, Any]]:
+        """Return ``(key, expires_at, value)`` for every entry, oldest first."""
+
+        with self._lock:
+            return [(key, expires_at, value) for key, (expires_at, value) in self._data.items()]
+
+    def restore(self, entries: Iterable[Tuple[Hashable, float, Any]]) -> int:
+        """Insert entries with their original expiry times; return the count.
+
+        Entries are inserted in order, so passing :meth:`entries` output
+        preserves recency. Ones already past their stale window are skipped
+        and existing keys are left untouched.
+        """
+
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, expires_at, value in entries:
+                if expires_at + self.stale_ttl <= now or key in self._data:
+                    continue
+                self._data[key] = (expires_at, value)
+                restored += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return restored
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def heavy_hitters(self, limit: int = 10) -> List[Tuple[Hashable, int]]:
+        """Most requested keys with estimated counts (TinyLFU caches only)."""
+
+        if self.admission is None:
+            return []
+        with self._lock:
+            return self.admission.heavy_hitters(limit)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+        if self.admission is not None:
+            stats.update(self.admission.stats())
+        return stats
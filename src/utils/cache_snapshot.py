@@ -0,0 +1,251 @@
+"""Warm-start snapshots of the weather cache.
+
+A snapshot is a single binary file::
+
+    header   magic, codec, entry count, schema length
+    schema   JSON list of the WeatherData/ForecastEntry field names
+    index    one (expires_at, offset, length) record per entry
+    payload  one encoded [endpoint, key, kind, values] record per entry
+
+Loading maps the file with ``mmap`` and reads the fixed-size index first, so
+entries past their stale window are skipped without decoding their payload.
+Entries keep their original wall-clock expiry times: a city cached four
+minutes before a restart is fresh for one more minute afterwards. Payloads
+are MessagePack when ``msgspec`` is installed and JSON otherwise; a
+snapshot written with a codec or schema this process can't read is ignored.
+"""
+from __future__ import annotations
+
+import atexit
+import gc
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Hashable, Iterator, List, Optional, Tuple, Union
+
+from src.utils.cache import TTLCache
+from src.utils.models import ForecastEntry, WeatherData
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+logger = logging.getLogger("weather_app.cache_snapshot")
+
+DEFAULT_SNAPSHOT_INTERVAL = float(os.getenv("WEATHER_CACHE_SNAPSHOT_INTERVAL", "60"))
+
+MAGIC = b"WXCACHE1"
+HEADER = struct.Struct("<8sB3xII")
+INDEX_ENTRY = struct.Struct("<dQI")
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+WEATHER_FIELDS = [field.name for field in fields(WeatherData)]
+FORECAST_FIELDS = [field.name for field in fields(ForecastEntry)]
+SCHEMA = json.dumps({"weather": WEATHER_FIELDS, "forecast": FORECAST_FIELDS}).encode()
+
+Entry = Tuple[Hashable, float, Any]
+
+
+def _codec() -> int:
+    return CODEC_MSGPACK if msgspec is not None else CODEC_JSON
+
+
+def _encoder(codec: int):
+    if codec == CODEC_MSGPACK:
+        return msgspec.msgpack.Encoder().encode
+    return lambda record: json.dumps(record, separators=(",", ":")).encode()
+
+
+def _decoder(codec: int):
+    if codec == CODEC_MSGPACK:
+        return msgspec.msgpack.Decoder().decode
+    return json.loads
+
+
+def _encode_value(value: Any) -> Optional[Tuple[str, list]]:
+    if isinstance(value, WeatherData):
+        return "w", [getattr(value, name) for name in WEATHER_FIELDS]
+    if isinstance(value, list) and all(isinstance(entry, ForecastEntry) for entry in value):
+        return "f", [[getattr(entry, name) for name in FORECAST_FIELDS] for entry in value]
+    return None
+
+
+def _decode_value(kind: str, values: list) -> Any:
+    if kind == "w":
+        return WeatherData(*values)
+    return [ForecastEntry(*entry) for entry in values]
+
+
+def write_snapshot(path: Union[str, Path], entries: List[Entry]) -> int:
+    """Atomically write ``entries`` to ``path``; return how many were written.
+
+    Only ``(str, str)`` keys with WeatherData or forecast values are kept.
+    """
+
+    path = Path(path)
+    codec = _codec()
+    encode = _encoder(codec)
+    payloads: List[Tuple[float, bytes]] = []
+    for key, expires_at, value in entries:
+        encoded = _encode_value(value)
+        if encoded is None or not (isinstance(key, tuple) and len(key) == 2):
+            continue
+        payloads.append((expires_at, encode([key[0], key[1], *encoded])))
+
+    offset = HEADER.size + len(SCHEMA) + INDEX_ENTRY.size * len(payloads)
+    index = bytearray()
+    for expires_at, payload in payloads:
+        index += INDEX_ENTRY.pack(expires_at, offset, len(payload))
+        offset += len(payload)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as stream:
+        stream.write(HEADER.pack(MAGIC, codec, len(payloads), len(SCHEMA)))
+        stream.write(SCHEMA)
+        stream.write(index)
+        for _, payload in payloads:
+            stream.write(payload)
+    # Readers see either the previous snapshot or this one, never a mix.
+    os.replace(tmp, path)
+    return len(payloads)
+
+
+def read_snapshot(path: Union[str, Path], keep_after: Optional[float] = None) -> Iterator[Entry]:
+    """Yield ``(key, expires_at, value)`` from a snapshot, in stored order.
+
+    Entries expiring at or before ``keep_after`` (a wall-clock time) are
+    skipped without being decoded. A missing, empty, foreign or unreadable
+    snapshot yields nothing.
+    """
+
+    try:
+        with open(path, "rb") as stream:
+            snapshot = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return
+    with snapshot:
+        if len(snapshot) < HEADER.size:
+            return
+        magic, codec, count, schema_length = HEADER.unpack_from(snapshot, 0)
+        schema_end = HEADER.size + schema_length
+        if magic != MAGIC or snapshot[HEADER.size:schema_end] != SCHEMA:
+            return
+        if codec == CODEC_MSGPACK and msgspec is None:
+            return
+        decode = _decoder(codec)
+        for position in range(count):
+            expires_at, offset, length = INDEX_ENTRY.unpack_from(
+                snapshot, schema_end + position * INDEX_ENTRY.size
+            )
+            if keep_after is not None and expires_at <= keep_after:
+                continue
+            endpoint, name, kind, values = decode(snapshot[offset:offset + length])
+            yield (endpoint, name), expires_at, _decode_value(kind, values)
+
+
+class CacheSnapshotter:
+    """Keeps a snapshot of ``cache`` at ``path`` up to date.
+
+    :meth:`mark_dirty` (registered as a ``WeatherAPI`` listener) starts a
+    background thread on first use that rewrites the snapshot every
+    ``interval`` seconds while the cache keeps changing; the final state is
+    written at exit. Entries already in the file but not in this process's
+    cache are carried over, so workers sharing a snapshot don't erase each
+    other's cities.
+    """
+
+    def __init__(
+        self,
+        cache: TTLCache,
+        path: Union[str, Path],
+        interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+    ) -> None:
+        self.cache = cache
+        self.path = Path(path)
+        self.interval = interval
+        self.saved = 0
+        self._dirty = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def load(self) -> int:
+        """Restore unexpired entries from the snapshot; return the count."""
+
+        # Decoding creates many long-lived objects at once; with the
+        # collector running, each allocation burst triggers another full
+        # pass over all of them.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            entries = read_snapshot(self.path, keep_after=time.time() - self.cache.stale_ttl)
+            return self.cache.restore(entries)
+        except (ValueError, TypeError, struct.error):
+            logger.warning("Ignoring unreadable cache snapshot %s", self.path, exc_info=True)
+            return 0
+        finally:
+            if collecting:
+                gc.enable()
+
+    def save(self) -> int:
+        with self._lock:
+            self._dirty = False
+            keep_after = time.time() - self.cache.stale_ttl
+            entries = [entry for entry in self.cache.entries() if entry[1] > keep_after]
+            known = {key for key, _, _ in entries}
+            try:
+                carried = [
+                    entry for entry in read_snapshot(self.path, keep_after) if entry[0] not in known
+                ]
+            except (ValueError, TypeError, struct.error):
+                carried = []
+            # Carried-over entries are treated as the least recently used.
+            merged = (carried + entries)[-self.cache.maxsize:]
+            try:
+                self.saved = write_snapshot(self.path, merged)
+            except OSError:
+                logger.warning("Failed to write cache snapshot %s", self.path, exc_info=True)
+            return self.saved
+
+    def mark_dirty(self, *_: Any) -> None:
+        self._dirty = True
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="cache-snapshot", daemon=True
+                    )
+                    self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread and write any unsaved changes."""
+
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=10)
+        if self._dirty:
+            self.save()
+
+    def after_fork(self) -> None:
+        """Drop the parent's thread and lock (call in the child)."""
+
+        self._dirty = False
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if self._dirty:
+                self.save()
@@ -0,0 +1,49 @@
+"""Named sets of cities used by rankings and dashboards."""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+CITY_SETS: Dict[str, Tuple[str, ...]] = {
+    "india-metros": (
+        "Delhi", "Mumbai", "Kolkata", "Chennai", "Bengaluru", "Hyderabad",
+        "Ahmedabad", "Pune", "Surat", "Jaipur", "Lucknow", "Kanpur",
+        "Nagpur", "Indore", "Bhopal", "Patna", "Vadodara", "Ludhiana",
+        "Agra", "Nashik", "Varanasi", "Srinagar", "Amritsar", "Chandigarh",
+        "Guwahati", "Bhubaneswar", "Kochi", "Thiruvananthapuram", "Coimbatore",
+        "Visakhapatnam",
+    ),
+    "world-capitals": (
+        "London", "Paris", "Berlin", "Madrid", "Rome", "Lisbon", "Dublin",
+        "Amsterdam", "Brussels", "Vienna", "Prague", "Warsaw", "Budapest",
+        "Athens", "Stockholm", "Oslo", "Helsinki", "Copenhagen", "Reykjavik",
+        "Moscow", "Ankara", "Cairo", "Nairobi", "Lagos", "Pretoria",
+        "Riyadh", "Tehran", "New Delhi", "Islamabad", "Dhaka", "Kathmandu",
+        "Beijing", "Tokyo", "Seoul", "Bangkok", "Hanoi", "Jakarta", "Manila",
+        "Canberra", "Wellington", "Ottawa", "Washington", "Mexico City",
+        "Havana", "Bogota", "Lima", "Santiago", "Buenos Aires", "Brasilia",
+    ),
+    "europe": (
+        "London", "Paris", "Berlin", "Madrid", "Barcelona", "Rome", "Milan",
+        "Naples", "Lisbon", "Porto", "Dublin", "Amsterdam", "Rotterdam",
+        "Brussels", "Vienna", "Zurich", "Geneva", "Munich", "Hamburg",
+        "Frankfurt", "Prague", "Warsaw", "Krakow", "Budapest", "Athens",
+        "Stockholm", "Oslo", "Helsinki", "Copenhagen", "Edinburgh",
+    ),
+    "us-largest": (
+        "New York", "Los Angeles", "Chicago", "Houston", "Phoenix",
+        "Philadelphia", "San Antonio", "San Diego", "Dallas", "Jacksonville",
+        "Austin", "Fort Worth", "San Jose", "Columbus", "Charlotte",
+        "Indianapolis", "San Francisco", "Seattle", "Denver", "Oklahoma City",
+        "Nashville", "Washington", "El Paso", "Las Vegas", "Boston",
+        "Detroit", "Portland", "Louisville", "Memphis", "Baltimore",
+    ),
+}
+
+
+def get_city_set(name: str) -> List[str]:
+    """Return the cities in the named set."""
+
+    cities = CITY_SETS.get(name.strip().lower())
+    if cities is None:
+        raise ValueError(f"Unknown city set; choose one of {', '.join(CITY_SETS)}")
+    return list(cities)
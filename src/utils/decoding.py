@@ -0,0 +1,284 @@
+"""Decoding of OpenWeatherMap payloads into ``WeatherData``/``ForecastEntry``.
+
+When ``msgspec`` is installed, raw response bytes are decoded straight into
+typed structs that mirror just the fields we use, skipping the intermediate
+dicts and per-field ``.get()``/``float()`` chains; a forecast's whole
+``list`` is decoded in the same call. Struct defaults match the dict parser,
+and any payload the typed decoder rejects (an unexpected ``null``, a
+fractional ``pressure``...) is re-parsed by the dict path so behaviour is
+unchanged.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.utils.exceptions import WeatherAPIError
+from src.utils.models import ForecastEntry, WeatherData
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+# ---------------------------------------------------------------------
+# Dict-based parsing (reference path)
+# ---------------------------------------------------------------------
+def load_payload(raw: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(raw)
+    except ValueError as exc:
+        raise WeatherAPIError("Invalid response from OpenWeatherMap.") from exc
+    if payload.get("cod") not in (200, "200"):
+        raise WeatherAPIError(payload.get("message", "Unknown error"))
+    return payload
+
+
+def parse_current(payload: Dict[str, Any]) -> WeatherData:
+    weather = payload.get("weather", [{}])[0]
+    main = payload.get("main", {})
+    wind = payload.get("wind", {})
+    sys_info = payload.get("sys", {})
+    rain = payload.get("rain", {})
+    snow = payload.get("snow", {})
+
+    precipitation = (
+        rain.get("1h")
+        or rain.get("3h")
+        or snow.get("1h")
+        or snow.get("3h")
+        or 0.0
+    )
+
+    return WeatherData(
+        city=payload.get("name", "Unknown"),
+        temperature=float(main.get("temp", 0.0)),
+        feels_like=float(main.get("feels_like", 0.0)),
+        pressure=int(main.get("pressure", 0)),
+        humidity=int(main.get("humidity", 0)),
+        wind_speed=float(wind.get("speed", 0.0)),
+        description=weather.get("description", ""),
+        icon=weather.get("icon", "01d"),
+        sunrise=int(sys_info.get("sunrise", 0)),
+        sunset=int(sys_info.get("sunset", 0)),
+        clouds=int(payload.get("clouds", {}).get("all", 0)),
+        precipitation=float(precipitation),
+        observed_at=int(payload.get("dt", 0)),
+        latitude=float(payload.get("coord", {}).get("lat", 0.0)),
+        longitude=float(payload.get("coord", {}).get("lon", 0.0)),
+        condition_id=int(weather.get("id", 0)),
+    )
+
+
+def parse_forecast_entry(payload: Dict[str, Any]) -> ForecastEntry:
+    weather = payload.get("weather", [{}])[0]
+    main = payload.get("main", {})
+    wind = payload.get("wind", {})
+
+    return ForecastEntry(
+        timestamp=int(payload.get("dt", 0)),
+        temperature=float(main.get("temp", 0.0)),
+        feels_like=float(main.get("feels_like", 0.0)),
+        description=weather.get("description", ""),
+        icon=weather.get("icon", "01d"),
+        condition_id=int(weather.get("id", 0)),
+        humidity=int(main.get("humidity", 0)),
+        wind_speed=float(wind.get("speed", 0.0)),
+    )
+
+
+def parse_onecall(payload: Dict[str, Any], city: str) -> Tuple[WeatherData, List[ForecastEntry]]:
+    """Split a One Call payload into current weather and hourly entries.
+
+    One Call responses carry no place name, so ``city`` supplies it.
+    """
+
+    current = payload.get("current", {})
+    weather = (current.get("weather") or [{}])[0]
+    rain = current.get("rain", {})
+    snow = current.get("snow", {})
+    data = WeatherData(
+        city=city,
+        temperature=float(current.get("temp", 0.0)),
+        feels_like=float(current.get("feels_like", 0.0)),
+        pressure=int(current.get("pressure", 0)),
+        humidity=int(current.get("humidity", 0)),
+        wind_speed=float(current.get("wind_speed", 0.0)),
+        description=weather.get("description", ""),
+        icon=weather.get("icon", "01d"),
+        sunrise=int(current.get("sunrise", 0)),
+        sunset=int(current.get("sunset", 0)),
+        clouds=int(current.get("clouds", 0)),
+        precipitation=float(rain.get("1h") or snow.get("1h") or 0.0),
+        observed_at=int(current.get("dt", 0)),
+        latitude=float(payload.get("lat", 0.0)),
+        longitude=float(payload.get("lon", 0.0)),
+        condition_id=int(weather.get("id", 0)),
+    )
+    entries = []
+    for item in payload.get("hourly", []):
+        condition = (item.get("weather") or [{}])[0]
+        entries.append(
+            ForecastEntry(
+                timestamp=int(item.get("dt", 0)),
+                temperature=float(item.get("temp", 0.0)),
+                feels_like=float(item.get("feels_like", 0.0)),
+                description=condition.get("description", ""),
+                icon=condition.get("icon", "01d"),
+                condition_id=int(condition.get("id", 0)),
+                humidity=int(item.get("humidity", 0)),
+                wind_speed=float(item.get("wind_speed", 0.0)),
+            )
+        )
+    return data, entries
+
+
+def decode_onecall(raw: bytes, city: str) -> Tuple[WeatherData, List[ForecastEntry]]:
+    """Decode a One Call response body (``current`` plus ``hourly``)."""
+
+    try:
+        payload = json.loads(raw)
+    except ValueError as exc:
+        raise WeatherAPIError("Invalid response from OpenWeatherMap.") from exc
+    # Successful One Call responses have no ``cod``; errors do.
+    if "current" not in payload:
+        raise WeatherAPIError(payload.get("message", "Unknown error"))
+    return parse_onecall(payload, city)
+
+
+# ---------------------------------------------------------------------
+# Typed decoding
+# ---------------------------------------------------------------------
+if msgspec is not None:
+
+    class _Condition(msgspec.Struct):
+        id: int = 0
+        description: str = ""
+        icon: str = "01d"
+
+    class _Main(msgspec.Struct):
+        temp: float = 0.0
+        feels_like: float = 0.0
+        pressure: int = 0
+        humidity: int = 0
+
+    class _Wind(msgspec.Struct):
+        speed: float = 0.0
+
+    class _Sys(msgspec.Struct):
+        sunrise: int = 0
+        sunset: int = 0
+
+    class _Clouds(msgspec.Struct):
+        all: int = 0
+
+    class _Coord(msgspec.Struct):
+        lat: float = 0.0
+        lon: float = 0.0
+
+    class _Precipitation(msgspec.Struct):
+        one_hour: Optional[float] = msgspec.field(name="1h", default=None)
+        three_hours: Optional[float] = msgspec.field(name="3h", default=None)
+
+    _NO_CONDITION = _Condition()
+
+    class _CurrentPayload(msgspec.Struct):
+        cod: Union[int, str] = 0
+        message: Union[str, int] = "Unknown error"
+        name: str = "Unknown"
+        dt: int = 0
+        coord: _Coord = msgspec.field(default_factory=_Coord)
+        weather: List[_Condition] = msgspec.field(default_factory=lambda: [_Condition()])
+        main: _Main = msgspec.field(default_factory=_Main)
+        wind: _Wind = msgspec.field(default_factory=_Wind)
+        sys: _Sys = msgspec.field(default_factory=_Sys)
+        clouds: _Clouds = msgspec.field(default_factory=_Clouds)
+        rain: _Precipitation = msgspec.field(default_factory=_Precipitation)
+        snow: _Precipitation = msgspec.field(default_factory=_Precipitation)
+
+    class _ForecastItem(msgspec.Struct):
+        dt: int = 0
+        main: _Main = msgspec.field(default_factory=_Main)
+        wind: _Wind = msgspec.field(default_factory=_Wind)
+        weather: List[_Condition] = msgspec.field(default_factory=lambda: [_Condition()])
+
+    class _ForecastPayload(msgspec.Struct):
+        cod: Union[int, str] = 0
+        message: Union[str, int] = "Unknown error"
+        list: List[_ForecastItem] = msgspec.field(default_factory=list)
+
+    _current_decoder = msgspec.json.Decoder(_CurrentPayload, strict=False)
+    _forecast_decoder = msgspec.json.Decoder(_ForecastPayload, strict=False)
+
+
+def _check_status(cod: Union[int, str], message: Any) -> None:
+    if cod not in (200, "200"):
+        raise WeatherAPIError(message)
+
+
+def decode_current(raw: bytes) -> WeatherData:
+    """Decode a ``/weather`` response body."""
+
+    if msgspec is None:
+        return parse_current(load_payload(raw))
+    try:
+        payload = _current_decoder.decode(raw)
+    except msgspec.DecodeError:
+        return parse_current(load_payload(raw))
+
+    _check_status(payload.cod, payload.message)
+    condition = payload.weather[0] if payload.weather else _NO_CONDITION
+    main = payload.main
+    rain = payload.rain
+    snow = payload.snow
+    precipitation = (
+        rain.one_hour or rain.three_hours or snow.one_hour or snow.three_hours or 0.0
+    )
+    return WeatherData(
+        city=payload.name,
+        temperature=main.temp,
+        feels_like=main.feels_like,
+        pressure=main.pressure,
+        humidity=main.humidity,
+        wind_speed=payload.wind.speed,
+        description=condition.description,
+        icon=condition.icon,
+        sunrise=payload.sys.sunrise,
+        sunset=payload.sys.sunset,
+        clouds=payload.clouds.all,
+        precipitation=float(precipitation),
+        observed_at=payload.dt,
+        latitude=payload.coord.lat,
+        longitude=payload.coord.lon,
+        condition_id=condition.id,
+    )
+
+
+def decode_forecast(raw: bytes) -> List[ForecastEntry]:
+    """Decode a ``/forecast`` response body into its entries."""
+
+    if msgspec is None:
+        return [parse_forecast_entry(item) for item in load_payload(raw).get("list", [])]
+    try:
+        payload = _forecast_decoder.decode(raw)
+    except msgspec.DecodeError:
+        return [parse_forecast_entry(item) for item in load_payload(raw).get("list", [])]
+
+    _check_status(payload.cod, payload.message)
+    entries = []
+    for item in payload.list:
+        condition = item.weather[0] if item.weather else _NO_CONDITION
+        entries.append(
+            ForecastEntry(
+                timestamp=item.dt,
+                temperature=item.main.temp,
+                feels_like=item.main.feels_like,
+                description=condition.description,
+                icon=condition.icon,
+                condition_id=condition.id,
+                humidity=item.main.humidity,
+                wind_speed=item.wind.speed,
+            )
+        )
+    return entries
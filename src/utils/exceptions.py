@@ -23,3 +23,7 @@ class VoiceInputError(WeatherError):
 
 class LocationDetectionError(WeatherError):
     """Raised when the user's location cannot be determined."""
+
+
+class DeadlineExceeded(NetworkError):
+    """Raised when a request's deadline passes before upstream answers."""
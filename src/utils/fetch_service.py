@@ -0,0 +1,175 @@
+"""Background fetching for the desktop GUIs, independent of the toolkit.
+
+GUIs must not block their event loop on the network, but naive "one thread
+per click" fetching piles up requests and lets a slow, older answer
+overwrite a newer one. :class:`FetchService` runs lookups on a bounded
+thread pool and adds:
+
+* deduplication: identical in-flight queries share one call;
+* supersession: each query belongs to a *channel* (e.g. the search box);
+  a newer query on the channel drops the older one's result, and cancels it
+  if it has not started yet;
+* debouncing for type-ahead, so only the text the user paused on is fetched;
+* a small TTL cache, so repeated queries are answered without a round trip.
+
+Callbacks always run on the GUI thread: the toolkit supplies ``dispatch``,
+a function that schedules a zero-argument callable on its event loop.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils.cache import DEFAULT_CACHE_TTL, TTLCache
+
+Dispatch = Callable[[Callable[[], None]], None]
+ResultCallback = Callable[[Any], None]
+ErrorCallback = Callable[[Exception], None]
+
+DEFAULT_DEBOUNCE = 0.4
+
+
+class FetchService:
+    """Bounded, deduplicating fetch pool whose callbacks run on the GUI thread."""
+
+    def __init__(
+        self,
+        dispatch: Dispatch,
+        max_workers: int = 4,
+        cache: Optional[TTLCache] = None,
+        debounce_delay: float = DEFAULT_DEBOUNCE,
+    ) -> None:
+        self.dispatch = dispatch
+        self.cache = cache if cache is not None else TTLCache(maxsize=256, ttl=DEFAULT_CACHE_TTL)
+        self.debounce_delay = debounce_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-fetch")
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._generations: Dict[str, int] = {}
+        self._channel_keys: Dict[str, Hashable] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+
+    def submit(
+        self,
+        key: Hashable,
+        func: Callable[[], Any],
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback] = None,
+        channel: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> None:
+        """Run ``func`` in the pool and deliver its result on the GUI thread.
+
+        ``key`` identifies the query for caching and deduplication. With a
+        ``channel``, only the most recent query on that channel is delivered.
+        """
+
+        generation = self._supersede(channel, key)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._deliver(channel, generation, lambda: on_result(cached))
+                return
+
+        with self._lock:
+            future = self._inflight.get(key)
+            started = future is None
+            if started:
+                future = self._executor.submit(func)
+                self._inflight[key] = future
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+            if channel is not None:
+                self._channel_keys[channel] = key
+        if started:
+            # Outside the lock: a finished future runs callbacks immediately.
+            future.add_done_callback(lambda done: self._finished(key, done))
+
+        def complete(done: Future) -> None:
+            if done.cancelled():
+                return
+            error = done.exception()
+            if error is None:
+                value = done.result()
+                self._deliver(channel, generation, lambda: on_result(value))
+            elif on_error is not None:
+                self._deliver(channel, generation, lambda: on_error(error))
+
+        future.add_done_callback(complete)
+
+    def debounce(
+        self,
+        channel: str,
+        key: Hashable,
+        func: Callable[[], Any],
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback] = None,
+        delay: Optional[float] = None,
+    ) -> None:
+        """Like :meth:`submit`, but only once ``channel`` is quiet for ``delay`` seconds."""
+
+        self._supersede(channel, None)
+        timer = threading.Timer(
+            self.debounce_delay if delay is None else delay,
+            self.submit,
+            args=(key, func, on_result, on_error, channel),
+        )
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.pop(channel, None)
+            self._timers[channel] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    def cancel(self, channel: str) -> None:
+        """Drop any pending or in-flight result for ``channel``."""
+
+        with self._lock:
+            timer = self._timers.pop(channel, None)
+        if timer is not None:
+            timer.cancel()
+        self._supersede(channel, None)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    def _supersede(self, channel: Optional[str], key: Optional[Hashable]) -> int:
+        """Start a new generation on ``channel``, cancelling its old query."""
+
+        if channel is None:
+            return 0
+        stale: Optional[Future] = None
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            previous = self._channel_keys.pop(channel, None)
+            if previous is not None and previous != key and self._waiters.get(previous) == 1:
+                # Nobody else is waiting for it; skip it if it hasn't started.
+                stale = self._inflight.get(previous)
+        if stale is not None:
+            stale.cancel()
+        return generation
+
+    def _finished(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._waiters.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.set(key, future.result())
+
+    def _deliver(self, channel: Optional[str], generation: int, callback: Callable[[], None]) -> None:
+        def run() -> None:
+            # Checked on the GUI thread, so a result queued just before a
+            # newer query was made is still dropped.
+            if channel is None or self._generations.get(channel) == generation:
+                callback()
+
+        self.dispatch(run)
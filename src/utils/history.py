@@ -0,0 +1,229 @@
+"""Append-only observation history backed by SQLite in WAL mode."""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.utils.weather_api import WeatherData
+
+logger = logging.getLogger("weather_app.history")
+
+RESOLUTIONS = {"raw": 0, "hour": 3600, "day": 86400}
+
+# Clustered on (city, ts) so a city's range query is one contiguous scan.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    city TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    temperature REAL NOT NULL,
+    feels_like REAL NOT NULL,
+    pressure INTEGER NOT NULL,
+    humidity INTEGER NOT NULL,
+    wind_speed REAL NOT NULL,
+    clouds INTEGER NOT NULL,
+    precipitation REAL NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (city, ts)
+) WITHOUT ROWID
+"""
+
+_STOP = object()
+
+
+def _city_key(city: str) -> str:
+    return city.strip().lower()
+
+
+class HistoryStore:
+    """Records ``WeatherData`` observations and answers range queries.
+
+    :meth:`record` only enqueues; a background thread batches inserts so the
+    request path never waits on disk. Re-recording the same observation
+    (same city and upstream timestamp) is a no-op. The writer thread starts
+    on the first record, so a store built before ``fork()`` owns no threads.
+
+    Rows are keyed by the city as it was looked up, so a query with the
+    same spelling (``london,uk``) finds them; when upstream reports another
+    name, the row is stored under that name as well.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def record(self, data: WeatherData, city: Optional[str] = None) -> None:
+        values = (
+            data.observed_at or int(time.time()),
+            data.temperature,
+            data.feels_like,
+            data.pressure,
+            data.humidity,
+            data.wind_speed,
+            data.clouds,
+            data.precipitation,
+            data.description,
+        )
+        keys = {_city_key(data.city)}
+        if city:
+            keys.add(_city_key(city))
+        self._ensure_writer()
+        for key in keys:
+            try:
+                self._queue.put_nowait((key, *values))
+            except queue.Full:
+                self.dropped += 1
+
+    def close(self) -> None:
+        """Flush pending observations and stop the writer thread."""
+
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join(timeout=10)
+
+    def after_fork(self) -> None:
+        """Drop state inherited from the parent process (call in the child)."""
+
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="history-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _run(self) -> None:
+        conn = self._connect()
+        stopping = False
+        try:
+            while not stopping:
+                batch: List[tuple] = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                if batch:
+                    try:
+                        with conn:
+                            conn.executemany(
+                                "INSERT OR IGNORE INTO observations VALUES (?,?,?,?,?,?,?,?,?,?)",
+                                batch,
+                            )
+                    except sqlite3.Error:
+                        logger.exception("Failed to write %d observations", len(batch))
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        city: str,
+        start: int,
+        end: int,
+        resolution: str = "raw",
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Return observations for ``city`` with ``start <= ts < end``.
+
+        ``resolution`` of ``"hour"`` or ``"day"`` aggregates into buckets with
+        average/min/max temperature, total precipitation (the sum of hourly
+        average rates) and averages of the other metrics.
+        """
+
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+
+        bucket = RESOLUTIONS[resolution]
+        params = (_city_key(city), start, end, limit)
+        if bucket:
+            # Each sample's precipitation is already a 1h rate, so samples are
+            # averaged within each hour and the hourly rates summed per bucket.
+            sql = f"""
+                WITH samples AS (
+                    SELECT *, (ts / {bucket}) * {bucket} AS bucket_ts
+                    FROM observations WHERE city = ? AND ts >= ? AND ts < ?
+                ),
+                hourly AS (
+                    SELECT bucket_ts, AVG(precipitation) AS precipitation
+                    FROM samples GROUP BY ts / 3600
+                ),
+                rain AS (
+                    SELECT bucket_ts, SUM(precipitation) AS total FROM hourly GROUP BY bucket_ts
+                )
+                SELECT bucket_ts,
+                       COUNT(*), AVG(temperature), MIN(temperature), MAX(temperature),
+                       AVG(feels_like), AVG(pressure), AVG(humidity), AVG(wind_speed),
+                       AVG(clouds), rain.total
+                FROM samples JOIN rain USING (bucket_ts)
+                GROUP BY bucket_ts ORDER BY bucket_ts LIMIT ?
+            """
+            columns = (
+                "timestamp", "samples", "temperature", "temperature_min", "temperature_max",
+                "feels_like", "pressure", "humidity", "wind_speed", "clouds", "precipitation",
+            )
+        else:
+            sql = """
+                SELECT ts, temperature, feels_like, pressure, humidity, wind_speed,
+                       clouds, precipitation, description
+                FROM observations
+                WHERE city = ? AND ts >= ? AND ts < ?
+                ORDER BY ts LIMIT ?
+            """
+            columns = (
+                "timestamp", "temperature", "feels_like", "pressure", "humidity",
+                "wind_speed", "clouds", "precipitation", "description",
+            )
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
@@ -0,0 +1,291 @@
+"""Weather estimates at arbitrary coordinates from cached observations.
+
+Fresh ``WeatherData`` in the weather cache (city and geohash tile lookups
+alike) are indexed by position, and temperature, humidity, pressure and
+wind speed are estimated by inverse-distance weighting (IDW) of the nearest
+stations. Stations are placed on the unit sphere, so straight-line
+distances between them order the same as great-circle distances and no
+longitude wrap-around is needed.
+
+Neighbour lookup uses ``scipy.spatial.cKDTree`` (SciPy is a requirement).
+Only if SciPy can't be imported do the nearest stations come from a chunked
+NumPy brute-force search, which is tolerable for a cache of a few thousand
+stations. Either way, a batch of points is handled in one vectorized pass.
+
+An estimate is only made when at least ``min_stations`` fresh stations lie
+within ``max_distance_km``. Its ``confidence`` (0–1) falls with distance to
+those stations and with fewer of them. Points without enough support come
+back with ``estimated`` False and NaN values, so callers can fall back to
+an upstream call.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.utils.cache import TTLCache
+from src.utils.models import WeatherData
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - depends on the environment
+    cKDTree = None
+
+EARTH_RADIUS_KM = 6371.0
+ESTIMATED_FIELDS = ("temperature", "humidity", "pressure", "wind_speed")
+
+DEFAULT_NEIGHBOURS = int(os.getenv("WEATHER_ESTIMATE_NEIGHBOURS", "8"))
+DEFAULT_MAX_DISTANCE_KM = float(os.getenv("WEATHER_ESTIMATE_MAX_KM", "75"))
+DEFAULT_MIN_STATIONS = int(os.getenv("WEATHER_ESTIMATE_MIN_STATIONS", "3"))
+# How long a built index is reused before fresh cache entries are picked up.
+DEFAULT_INDEX_REFRESH = float(os.getenv("WEATHER_ESTIMATE_REFRESH", "30"))
+IDW_POWER = 2.0
+# Stations this close are taken as-is rather than blended.
+COINCIDENT_KM = 0.5
+# Query rows per brute-force chunk, bounding its distance matrix.
+BRUTE_FORCE_CHUNK = 1024
+
+Columns = Dict[str, np.ndarray]
+
+
+@dataclass
+class Estimate:
+    """One point's estimate; the weather fields are None when not estimated."""
+
+    latitude: float
+    longitude: float
+    temperature: Optional[float]
+    humidity: Optional[float]
+    pressure: Optional[float]
+    wind_speed: Optional[float]
+    stations: int
+    nearest_km: Optional[float]
+    confidence: float
+    estimated: bool
+
+
+def to_unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Return an ``(n, 3)`` array of points on the unit sphere."""
+
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(chord: np.ndarray) -> np.ndarray:
+    """Great-circle distance for unit-sphere chords; infinite chords stay infinite."""
+
+    finite = np.isfinite(chord)
+    km = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.where(finite, chord, 0.0) / 2, 0.0, 1.0))
+    return np.where(finite, km, np.inf)
+
+
+def km_to_chord(km: float) -> float:
+    return float(2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2))
+
+
+class StationIndex:
+    """Nearest-neighbour index over a fixed set of stations."""
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float], values: Columns) -> None:
+        self.points = to_unit_vectors(np.asarray(latitudes), np.asarray(longitudes)).reshape(-1, 3)
+        self.values = values
+        self._tree = cKDTree(self.points) if cKDTree is not None and len(self.points) else None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @classmethod
+    def from_observations(cls, observations: Sequence[WeatherData]) -> "StationIndex":
+        # City and tile lookups of the same place report the same station.
+        unique = {
+            (round(item.latitude, 3), round(item.longitude, 3)): item
+            for item in observations
+            if item.latitude or item.longitude
+        }
+        stations = list(unique.values())
+        values = {
+            name: np.fromiter((getattr(item, name) for item in stations), dtype=np.float64, count=len(stations))
+            for name in ESTIMATED_FIELDS
+        }
+        return cls([item.latitude for item in stations], [item.longitude for item in stations], values)
+
+    def query(self, queries: np.ndarray, k: int, max_chord: float):
+        """Return ``(chords, indices)`` of the ``k`` nearest stations per query.
+
+        Both arrays are ``(n, k)``; missing neighbours (fewer than ``k``
+        stations, or farther than ``max_chord``) have an infinite distance.
+        """
+
+        n = len(queries)
+        k = min(k, len(self.points))
+        if not k:
+            return np.full((n, 0), np.inf), np.zeros((n, 0), dtype=np.intp)
+        if self._tree is not None:
+            chords, indices = self._tree.query(queries, k=k, distance_upper_bound=max_chord)
+            chords = np.asarray(chords, dtype=np.float64).reshape(n, k)
+            indices = np.asarray(indices).reshape(n, k)
+            # cKDTree marks missing neighbours with an index of len(points).
+            indices = np.where(np.isinf(chords), 0, indices)
+            return chords, indices
+
+        chords = np.empty((n, k))
+        indices = np.empty((n, k), dtype=np.intp)
+        points_t = np.ascontiguousarray(self.points.T)
+        for start in range(0, n, BRUTE_FORCE_CHUNK):
+            block = queries[start:start + BRUTE_FORCE_CHUNK]
+            # The nearest stations have the largest dot products, and
+            # |a - b|² = 2 - 2 a·b for unit vectors.
+            dots = block @ points_t
+            nearest = np.argpartition(dots, -k, axis=1)[:, -k:]
+            nearest_squared = np.maximum(2.0 - 2.0 * np.take_along_axis(dots, nearest, axis=1), 0.0)
+            order = np.argsort(nearest_squared, axis=1)
+            indices[start:start + len(block)] = np.take_along_axis(nearest, order, axis=1)
+            chords[start:start + len(block)] = np.sqrt(np.take_along_axis(nearest_squared, order, axis=1))
+        chords[chords > max_chord] = np.inf
+        return chords, indices
+
+    def interpolate(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        k: int = DEFAULT_NEIGHBOURS,
+        max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+        min_stations: int = DEFAULT_MIN_STATIONS,
+    ) -> Columns:
+        """Estimate every field at each point; see the module docstring."""
+
+        queries = to_unit_vectors(latitudes, longitudes).reshape(-1, 3)
+        n = len(queries)
+        chords, indices = self.query(queries, k, km_to_chord(max_distance_km))
+        distances = chord_to_km(chords)
+        valid = np.isfinite(distances)
+        stations = valid.sum(axis=1)
+
+        weights = np.where(valid, 1.0 / np.maximum(distances, COINCIDENT_KM) ** IDW_POWER, 0.0)
+        nearest_km = distances[:, 0] if distances.shape[1] else np.full(n, np.inf)
+        # A station on top of the point stands for it on its own.
+        coincident = nearest_km < COINCIDENT_KM
+        if coincident.any():
+            weights[coincident] = 0.0
+            weights[coincident, 0] = 1.0
+        total = weights.sum(axis=1)
+        estimated = (stations >= min_stations) | coincident
+        safe_total = np.where(total > 0, total, 1.0)
+
+        columns: Columns = {}
+        for name in ESTIMATED_FIELDS:
+            blended = (weights * self.values[name][indices]).sum(axis=1) / safe_total
+            columns[name] = np.where(estimated, blended, np.nan)
+
+        # Weighted mean distance relative to the search radius, scaled by
+        # how many of the ``k`` neighbours were found.
+        mean_km = (np.where(valid, distances, 0.0) * weights).sum(axis=1) / safe_total
+        support = np.minimum(stations / max(k, 1), 1.0)
+        confidence = np.clip(1.0 - mean_km / max_distance_km, 0.0, 1.0) * support
+        columns["confidence"] = np.where(estimated, np.where(coincident, 1.0, confidence), 0.0)
+        columns["stations"] = stations
+        columns["nearest_km"] = nearest_km
+        columns["estimated"] = estimated
+        return columns
+
+
+class WeatherInterpolator:
+    """Estimates weather from the fresh entries of a ``WeatherAPI`` cache.
+
+    The station index is rebuilt from the cache at most every ``refresh``
+    seconds, on the first query after that.
+    """
+
+    def __init__(
+        self,
+        cache: TTLCache,
+        k: int = DEFAULT_NEIGHBOURS,
+        max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+        min_stations: int = DEFAULT_MIN_STATIONS,
+        refresh: float = DEFAULT_INDEX_REFRESH,
+    ) -> None:
+        self.cache = cache
+        self.k = k
+        self.max_distance_km = max_distance_km
+        self.min_stations = min_stations
+        self.refresh = refresh
+        self._index: Optional[StationIndex] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def index(self) -> StationIndex:
+        index = self._index
+        if index is not None and time.monotonic() - self._built_at < self.refresh:
+            return index
+        with self._lock:
+            if self._index is None or time.monotonic() - self._built_at >= self.refresh:
+                now = time.time()
+                fresh = [
+                    value
+                    for _, expires_at, value in self.cache.entries()
+                    if expires_at > now and isinstance(value, WeatherData)
+                ]
+                self._index = StationIndex.from_observations(fresh)
+                self._built_at = time.monotonic()
+            return self._index
+
+    def estimate_many(
+        self, latitudes: Sequence[float], longitudes: Sequence[float], min_confidence: float = 0.0
+    ) -> Columns:
+        """Vectorized estimates for many points; one array per field.
+
+        Estimates below ``min_confidence`` are reported as not estimated.
+        """
+
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if latitudes.shape != longitudes.shape:
+            raise ValueError("Latitudes and longitudes must have the same length.")
+        if np.any(np.abs(latitudes) > 90) or np.any(np.abs(longitudes) > 180):
+            raise ValueError("Latitude must be within ±90 and longitude within ±180.")
+        columns = self.index().interpolate(
+            latitudes, longitudes, self.k, self.max_distance_km, self.min_stations
+        )
+        if min_confidence > 0:
+            rejected = columns["estimated"] & (columns["confidence"] < min_confidence)
+            columns["estimated"] = columns["estimated"] & ~rejected
+            for name in ESTIMATED_FIELDS:
+                columns[name] = np.where(rejected, np.nan, columns[name])
+        return columns
+
+    def estimate(self, latitude: float, longitude: float, min_confidence: float = 0.0) -> Estimate:
+        columns = self.estimate_many([latitude], [longitude], min_confidence)
+        return self.rows(columns, [latitude], [longitude])[0]
+
+    @staticmethod
+    def rows(
+        columns: Columns, latitudes: Sequence[float], longitudes: Sequence[float]
+    ) -> List[Estimate]:
+        """Split ``estimate_many`` output into one :class:`Estimate` per point."""
+
+        def finite(values: np.ndarray) -> List[Optional[float]]:
+            return [value if np.isfinite(value) else None for value in np.round(values, 2).tolist()]
+
+        rounded = {name: finite(columns[name]) for name in (*ESTIMATED_FIELDS, "nearest_km")}
+        return [
+            Estimate(
+                latitude=float(latitudes[row]),
+                longitude=float(longitudes[row]),
+                temperature=rounded["temperature"][row],
+                humidity=rounded["humidity"][row],
+                pressure=rounded["pressure"][row],
+                wind_speed=rounded["wind_speed"][row],
+                stations=int(columns["stations"][row]),
+                nearest_km=rounded["nearest_km"][row],
+                confidence=round(float(columns["confidence"][row]), 3),
+                estimated=bool(columns["estimated"][row]),
+            )
+            for row in range(len(columns["estimated"]))
+        ]
@@ -1,21 +1,184 @@
-"""Logging helpers for the weather project."""
+"""Logging helpers for the weather project.
+
+By default records are formatted as text and written synchronously to
+stderr. Two opt-in modes are available, selected by arguments or the
+environment:
+
+- ``WEATHER_LOG_FORMAT=json`` writes one JSON object per record, including
+  the current request ID and any ``extra`` fields such as timings.
+- ``WEATHER_LOG_ASYNC=1`` hands records to a background writer through a
+  bounded queue, so logging never blocks the calling thread on I/O. Records
+  are dropped (and counted) if the writer falls behind.
+
+Access logs (the ``weather_app.access`` logger) can be sampled with
+``WEATHER_ACCESS_LOG_SAMPLE``, a fraction between 0 and 1; warnings and
+errors are always kept.
+"""
 from __future__ import annotations
 
+import atexit
+import copy
+import json
 import logging
-from typing import Optional
+import logging.handlers
+import os
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+ACCESS_LOGGER = "weather_app.access"
+DEFAULT_LOG_FORMAT = os.getenv("WEATHER_LOG_FORMAT", "text").strip().lower()
+DEFAULT_LOG_ASYNC = os.getenv("WEATHER_LOG_ASYNC", "") in {"1", "true", "yes"}
+DEFAULT_ACCESS_LOG_SAMPLE = float(os.getenv("WEATHER_ACCESS_LOG_SAMPLE", "1"))
+DEFAULT_LOG_QUEUE_SIZE = int(os.getenv("WEATHER_LOG_QUEUE_SIZE", "10000"))
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s in %(name)s: %(message)s"
+TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+request_id: ContextVar[Optional[str]] = ContextVar("weather_request_id", default=None)
+
+# Attributes every LogRecord has; anything else came from ``extra``.
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["_DroppingQueueHandler"] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the request ID of the context that logged them."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep roughly ``rate`` of records below WARNING, and all others."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with ``extra`` fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request = getattr(record, "request_id", None)
+        if request:
+            entry["request_id"] = request
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRS and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
 
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records without blocking; count the ones that don't fit."""
 
-def configure_logging(level: int = logging.INFO) -> logging.Logger:
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments here; formatting (and any traceback) is
+        # left to the writer thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _formatter(fmt: str) -> logging.Formatter:
+    if fmt == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT)
+
+
+def _start_listener(handler: logging.Handler) -> _DroppingQueueHandler:
+    global _listener, _queue_handler
+
+    queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=DEFAULT_LOG_QUEUE_SIZE))
+    # Runs on the caller's thread, where the request ID is set.
+    queue_handler.addFilter(RequestIdFilter())
+    _listener = logging.handlers.QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    _listener.start()
+    _queue_handler = queue_handler
+    return queue_handler
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    fmt: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    access_sample: Optional[float] = None,
+) -> logging.Logger:
     """Configure and return the root logger only once."""
 
     logger = logging.getLogger("weather_app")
     if not logger.handlers:
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "[%(asctime)s] %(levelname)s in %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        handler.setFormatter(_formatter(fmt or DEFAULT_LOG_FORMAT))
+        if DEFAULT_LOG_ASYNC if use_queue is None else use_queue:
+            logger.addHandler(_start_listener(handler))
+            atexit.register(shutdown_logging)
+        else:
+            handler.addFilter(RequestIdFilter())
+            logger.addHandler(handler)
+        rate = DEFAULT_ACCESS_LOG_SAMPLE if access_sample is None else access_sample
+        if rate < 1:
+            logging.getLogger(ACCESS_LOGGER).addFilter(SamplingFilter(rate))
     logger.setLevel(level)
     return logger
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the background writer, if any."""
+
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+
+
+def after_fork() -> None:
+    """Restart the background writer in a forked child.
+
+    The writer thread does not survive ``fork()``; without a new one the
+    child's records would accumulate in the queue and never be written.
+    """
+
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    handlers = _listener.handlers
+    _queue_handler.queue = queue.Queue(maxsize=DEFAULT_LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def dropped_records() -> int:
+    """Records discarded because the background writer fell behind."""
+
+    return _queue_handler.dropped if _queue_handler is not None else 0
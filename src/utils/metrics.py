@@ -0,0 +1,46 @@
+"""Process-wide counters and gauges exposed by the web services."""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class Metrics:
+    """Thread-safe registry of monotonically increasing counters and gauges.
+
+    Gauges are callables evaluated lazily whenever a snapshot is taken.
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def register_gauge(self, name: str, func: Callable[[], float]) -> None:
+        self._gauges[name] = func
+
+    def ratio(self, numerator: str, *others: str) -> float:
+        """Return ``numerator / (numerator + sum(others))``, or 0 if empty."""
+
+        hits = self.get(numerator)
+        total = hits + sum(self.get(name) for name in others)
+        return hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            values = dict(self._counters)
+        for name, func in list(self._gauges.items()):
+            values[name] = func()
+        return dict(sorted(values.items()))
+
+
+metrics = Metrics()
@@ -0,0 +1,49 @@
+"""Data models shared by the weather clients and decoders."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class WeatherData:
+    city: str
+    temperature: float
+    feels_like: float
+    pressure: int
+    humidity: int
+    wind_speed: float
+    description: str
+    icon: str
+    sunrise: int
+    sunset: int
+    clouds: int
+    precipitation: float
+    observed_at: int = 0
+    latitude: float = 0.0
+    longitude: float = 0.0
+    condition_id: int = 0
+
+    @property
+    def sunrise_time(self) -> datetime:
+        return datetime.fromtimestamp(self.sunrise)
+
+    @property
+    def sunset_time(self) -> datetime:
+        return datetime.fromtimestamp(self.sunset)
+
+
+@dataclass
+class ForecastEntry:
+    timestamp: int
+    temperature: float
+    feels_like: float
+    description: str
+    icon: str
+    condition_id: int = 0
+    humidity: int = 0
+    wind_speed: float = 0.0
+
+    @property
+    def time(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp)
@@ -0,0 +1,662 @@
+"""Weather data providers with latency tracking, racing and failover.
+
+A provider answers two kinds of lookups, ``"weather"`` (a ``WeatherData``)
+and ``"forecast"`` (3-hourly ``ForecastEntry`` items), for either
+``{"q": city}`` or ``{"lat": ..., "lon": ...}``, plus ``"lang"`` for
+languages translated upstream (only OpenWeatherMap honours it; the others
+answer in English). Available backends:
+
+``openweathermap``
+    The OpenWeatherMap 2.5 API (needs ``OPENWEATHER_API_KEY``).
+``open-meteo``
+    Open-Meteo's free forecast and geocoding APIs; WMO weather codes are
+    mapped to OpenWeatherMap condition ids so descriptions translate alike.
+``local``
+    Synthetic observations generated in-process, with configurable latency
+    and failure rate, to exercise racing and failover without a network.
+
+:class:`ProviderPool` keeps an exponentially weighted moving average of
+each provider's latency and skips a provider for ``PROVIDER_COOLDOWN``
+seconds after ``FAILURE_THRESHOLD`` consecutive failures. A plain fetch
+tries providers in the configured order and fails over on network errors,
+timeouts and 5xx answers; an error answer such as "city not found" is final.
+A raced fetch sends the request to the two fastest providers at once; the
+first answer wins and the other is cancelled. Local providers stop at once; an in-flight HTTP request runs to
+completion in the background and its answer is dropped.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import requests
+
+from src.utils.decoding import decode_current, decode_forecast
+from src.utils.exceptions import NetworkError, WeatherAPIError, WeatherError
+from src.utils.metrics import metrics
+from src.utils.models import ForecastEntry, WeatherData
+from src.utils.translations import CANONICAL_LANGUAGE
+from src.utils.transport import Transport
+from src.utils.units import CANONICAL_UNITS
+
+PROVIDER_NAMES = ("openweathermap", "open-meteo", "local")
+# Comma-separated, in order of preference.
+DEFAULT_PROVIDERS = os.getenv("WEATHER_PROVIDERS", "openweathermap")
+DEFAULT_RACE = os.getenv("WEATHER_PROVIDER_RACE", "") in {"1", "true", "yes"}
+
+LATENCY_EWMA_ALPHA = 0.2
+FAILURE_THRESHOLD = 3
+PROVIDER_COOLDOWN = 30.0
+FORECAST_STEP_HOURS = 3
+FORECAST_ENTRIES = 40
+
+
+class Cancelled(Exception):
+    """Raised inside a provider whose raced request lost."""
+
+
+class WeatherProvider(Protocol):
+    """A backend mapped into ``WeatherData``/``ForecastEntry``."""
+
+    name: str
+
+    def fetch(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        """Return the ``kind`` lookup for ``params``.
+
+        Raises ``requests`` exceptions or ``NetworkError`` when the provider
+        can't be reached, and ``WeatherAPIError`` for an error answer.
+        """
+
+
+def _check_answer(response: Any) -> None:
+    """Raise ``WeatherAPIError`` for 4xx answers other than throttling."""
+
+    status = response.status_code
+    if 400 <= status < 500 and status != 429:
+        try:
+            message = json.loads(response.content).get("message") or f"HTTP {status}"
+        except (ValueError, AttributeError):
+            message = f"HTTP {status}"
+        raise WeatherAPIError(str(message))
+    response.raise_for_status()
+
+
+# ---------------------------------------------------------------------
+# OpenWeatherMap
+# ---------------------------------------------------------------------
+class OpenWeatherMapProvider:
+    name = "openweathermap"
+    BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+    def __init__(self, transport: Transport, api_key: str) -> None:
+        self.transport = transport
+        self.api_key = api_key
+
+    def fetch(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        request_params = {
+            "appid": self.api_key,
+            "units": CANONICAL_UNITS,
+            "lang": CANONICAL_LANGUAGE,
+            **params,
+        }
+        try:
+            response = self.transport.get(f"{self.BASE_URL}/{kind}", params=request_params, timeout=timeout)
+            _check_answer(response)
+        except requests.exceptions.Timeout:
+            raise
+        except requests.exceptions.RequestException as exc:
+            raise NetworkError("Unable to reach OpenWeatherMap.") from exc
+        if kind == "weather":
+            return decode_current(response.content)
+        return decode_forecast(response.content)
+
+
+# ---------------------------------------------------------------------
+# Open-Meteo
+# ---------------------------------------------------------------------
+# WMO weather code -> (OpenWeatherMap condition id, description, icon stem).
+WMO_CONDITIONS: Dict[int, Tuple[int, str, str]] = {
+    0: (800, "clear sky", "01"),
+    1: (801, "mainly clear", "02"),
+    2: (802, "partly cloudy", "03"),
+    3: (804, "overcast clouds", "04"),
+    45: (741, "fog", "50"),
+    48: (741, "depositing rime fog", "50"),
+    51: (300, "light drizzle", "09"),
+    53: (301, "drizzle", "09"),
+    55: (302, "heavy drizzle", "09"),
+    56: (310, "light freezing drizzle", "09"),
+    57: (311, "freezing drizzle", "09"),
+    61: (500, "light rain", "10"),
+    63: (501, "moderate rain", "10"),
+    65: (502, "heavy intensity rain", "10"),
+    66: (511, "freezing rain", "13"),
+    67: (511, "freezing rain", "13"),
+    71: (600, "light snow", "13"),
+    73: (601, "snow", "13"),
+    75: (602, "heavy snow", "13"),
+    77: (611, "snow grains", "13"),
+    80: (520, "light shower rain", "09"),
+    81: (521, "shower rain", "09"),
+    82: (522, "heavy shower rain", "09"),
+    85: (620, "light shower snow", "13"),
+    86: (621, "shower snow", "13"),
+    95: (211, "thunderstorm", "11"),
+    96: (201, "thunderstorm with hail", "11"),
+    99: (202, "thunderstorm with heavy hail", "11"),
+}
+
+
+def wmo_condition(code: Optional[int], is_day: bool = True) -> Tuple[int, str, str]:
+    """Return ``(condition_id, description, icon)`` for a WMO weather code."""
+
+    condition_id, description, stem = WMO_CONDITIONS.get(int(code or 0), WMO_CONDITIONS[0])
+    return condition_id, description, f"{stem}{'d' if is_day else 'n'}"
+
+
+class OpenMeteoProvider:
+    """Open-Meteo forecast API, with city names resolved by its geocoder.
+
+    Resolved cities are remembered (up to ``max_places``), so only the first
+    lookup of a city costs a geocoding round trip.
+    """
+
+    name = "open-meteo"
+    FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+    GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
+    CURRENT_FIELDS = (
+        "temperature_2m,apparent_temperature,relative_humidity_2m,pressure_msl,"
+        "wind_speed_10m,weather_code,cloud_cover,precipitation,is_day"
+    )
+    HOURLY_FIELDS = "temperature_2m,apparent_temperature,relative_humidity_2m,wind_speed_10m,weather_code,is_day"
+
+    def __init__(self, transport: Transport, max_places: int = 4096) -> None:
+        self.transport = transport
+        self.max_places = max_places
+        self._places: Dict[str, Tuple[str, float, float]] = {}
+        self._places_lock = threading.Lock()
+
+    def fetch(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        if "q" in params:
+            name, latitude, longitude = self._resolve(str(params["q"]), timeout)
+        else:
+            latitude, longitude = float(params["lat"]), float(params["lon"])
+            name = f"{latitude:.3f}, {longitude:.3f}"
+        query: Dict[str, Any] = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timeformat": "unixtime",
+            "wind_speed_unit": "ms",
+            "timezone": "auto",
+        }
+        if kind == "weather":
+            query.update(current=self.CURRENT_FIELDS, daily="sunrise,sunset", forecast_days=1)
+        else:
+            days = math.ceil(FORECAST_ENTRIES * FORECAST_STEP_HOURS / 24) + 1
+            query.update(hourly=self.HOURLY_FIELDS, forecast_days=days)
+        payload = self._get(self.FORECAST_URL, query, timeout)
+        try:
+            if kind == "weather":
+                return self._parse_current(payload, name)
+            return self._parse_forecast(payload)
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            raise WeatherAPIError("Invalid response from Open-Meteo.") from exc
+
+    def _get(self, url: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        try:
+            response = self.transport.get(url, params=params, timeout=timeout)
+            _check_answer(response)
+        except requests.exceptions.Timeout:
+            raise
+        except requests.exceptions.RequestException as exc:
+            raise NetworkError("Unable to reach Open-Meteo.") from exc
+        try:
+            return json.loads(response.content)
+        except ValueError as exc:
+            raise WeatherAPIError("Invalid response from Open-Meteo.") from exc
+
+    def _resolve(self, city: str, timeout: float) -> Tuple[str, float, float]:
+        key = city.strip().lower()
+        with self._places_lock:
+            place = self._places.get(key)
+        if place is None:
+            payload = self._get(
+                self.GEOCODING_URL, {"name": city.strip(), "count": 1, "language": "en"}, timeout
+            )
+            results = payload.get("results") or []
+            if not results:
+                raise WeatherAPIError("city not found")
+            best = results[0]
+            place = (best.get("name", city), float(best["latitude"]), float(best["longitude"]))
+            with self._places_lock:
+                if len(self._places) >= self.max_places:
+                    self._places.pop(next(iter(self._places)))
+                self._places[key] = place
+        return place
+
+    @staticmethod
+    def _parse_current(payload: Dict[str, Any], name: str) -> WeatherData:
+        current = payload.get("current") or {}
+        daily = payload.get("daily") or {}
+        condition_id, description, icon = wmo_condition(
+            current.get("weather_code"), bool(current.get("is_day", 1))
+        )
+        return WeatherData(
+            city=name,
+            temperature=float(current.get("temperature_2m") or 0.0),
+            feels_like=float(current.get("apparent_temperature") or 0.0),
+            pressure=int(round(current.get("pressure_msl") or 0)),
+            humidity=int(current.get("relative_humidity_2m") or 0),
+            wind_speed=float(current.get("wind_speed_10m") or 0.0),
+            description=description,
+            icon=icon,
+            sunrise=int((daily.get("sunrise") or [0])[0] or 0),
+            sunset=int((daily.get("sunset") or [0])[0] or 0),
+            clouds=int(current.get("cloud_cover") or 0),
+            precipitation=float(current.get("precipitation") or 0.0),
+            observed_at=int(current.get("time") or 0),
+            latitude=float(payload.get("latitude", 0.0)),
+            longitude=float(payload.get("longitude", 0.0)),
+            condition_id=condition_id,
+        )
+
+    @staticmethod
+    def _parse_forecast(payload: Dict[str, Any]) -> List[ForecastEntry]:
+        hourly = payload.get("hourly") or {}
+        times = hourly.get("time") or []
+        now = time.time()
+        # Match OpenWeatherMap's 3-hourly steps, starting from the next hour.
+        start = next((index for index, stamp in enumerate(times) if stamp >= now), len(times))
+        entries = []
+        for index in range(start, len(times), FORECAST_STEP_HOURS):
+            condition_id, description, icon = wmo_condition(
+                hourly["weather_code"][index], bool(hourly["is_day"][index])
+            )
+            entries.append(
+                ForecastEntry(
+                    timestamp=int(times[index]),
+                    temperature=float(hourly["temperature_2m"][index] or 0.0),
+                    feels_like=float(hourly["apparent_temperature"][index] or 0.0),
+                    description=description,
+                    icon=icon,
+                    condition_id=condition_id,
+                    humidity=int(hourly["relative_humidity_2m"][index] or 0),
+                    wind_speed=float(hourly["wind_speed_10m"][index] or 0.0),
+                )
+            )
+        return entries[:FORECAST_ENTRIES]
+
+
+# ---------------------------------------------------------------------
+# Local stand-in
+# ---------------------------------------------------------------------
+class LocalProvider:
+    """In-process provider with synthetic, deterministic observations.
+
+    Each call takes ``latency`` seconds plus an exponentially distributed
+    ``jitter`` (mean, seconds) and fails with probability ``failure_rate``.
+    A cancelled call stops waiting immediately.
+    """
+
+    def __init__(
+        self,
+        name: str = "local",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.cancelled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._rng.expovariate(1 / self.jitter) if self.jitter else 0.0)
+            failed = self._rng.random() < self.failure_rate
+        if (cancel or threading.Event()).wait(min(delay, timeout)):
+            with self._lock:
+                self.cancelled += 1
+            raise Cancelled(self.name)
+        if delay > timeout:
+            raise requests.exceptions.Timeout(f"{self.name} timed out")
+        if failed:
+            raise NetworkError(f"Unable to reach {self.name}.")
+        if "q" in params:
+            name = str(params["q"]).strip().title()
+            seed = zlib.crc32(name.lower().encode())
+            latitude = (seed % 15000) / 100 - 60
+            longitude = (seed // 15000 % 36000) / 100 - 180
+        else:
+            latitude, longitude = float(params["lat"]), float(params["lon"])
+            name = f"{latitude:.3f}, {longitude:.3f}"
+            seed = zlib.crc32(name.encode())
+        if kind == "weather":
+            return self._current(name, seed, latitude, longitude)
+        return self._forecast(seed)
+
+    @staticmethod
+    def _current(name: str, seed: int, latitude: float, longitude: float) -> WeatherData:
+        rng = random.Random(seed)
+        now = int(time.time())
+        condition_id, description, icon = wmo_condition(rng.choice([0, 1, 2, 3, 61]))
+        temperature = round(rng.uniform(-5, 35), 1)
+        return WeatherData(
+            city=name,
+            temperature=temperature,
+            feels_like=round(temperature + rng.uniform(-3, 2), 1),
+            pressure=rng.randint(990, 1035),
+            humidity=rng.randint(20, 95),
+            wind_speed=round(rng.uniform(0, 12), 1),
+            description=description,
+            icon=icon,
+            sunrise=now - now % 86400 + 6 * 3600,
+            sunset=now - now % 86400 + 18 * 3600,
+            clouds=rng.randint(0, 100),
+            precipitation=0.0,
+            observed_at=now,
+            latitude=latitude,
+            longitude=longitude,
+            condition_id=condition_id,
+        )
+
+    @staticmethod
+    def _forecast(seed: int) -> List[ForecastEntry]:
+        rng = random.Random(seed)
+        start = int(time.time()) // 3600 * 3600 + 3600
+        entries = []
+        for index in range(FORECAST_ENTRIES):
+            condition_id, description, icon = wmo_condition(rng.choice([0, 1, 2, 3, 61]))
+            temperature = round(rng.uniform(-5, 35), 1)
+            entries.append(
+                ForecastEntry(
+                    timestamp=start + index * FORECAST_STEP_HOURS * 3600,
+                    temperature=temperature,
+                    feels_like=round(temperature - 1, 1),
+                    description=description,
+                    icon=icon,
+                    condition_id=condition_id,
+                    humidity=rng.randint(20, 95),
+                    wind_speed=round(rng.uniform(0, 12), 1),
+                )
+            )
+        return entries
+
+
+# ---------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------
+class ProviderHealth:
+    """Latency EWMA and failure streak of one provider."""
+
+    def __init__(self) -> None:
+        self.latency_ms: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.wins = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def success(self, elapsed: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        self._observe(elapsed * 1000)
+
+    def failure(self, elapsed: float) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        # Fast failures say nothing about speed; slow ones (timeouts) do.
+        self._observe_at_least(elapsed * 1000)
+        if self.consecutive_failures >= FAILURE_THRESHOLD:
+            self.down_until = time.monotonic() + PROVIDER_COOLDOWN
+
+    def cancelled(self, elapsed: float) -> None:
+        # A lost race shows the provider takes at least this long.
+        self._observe_at_least(elapsed * 1000)
+
+    def _observe_at_least(self, elapsed_ms: float) -> None:
+        if self.latency_ms is None or elapsed_ms > self.latency_ms:
+            self._observe(elapsed_ms)
+
+    def _observe(self, elapsed_ms: float) -> None:
+        if self.latency_ms is None:
+            self.latency_ms = elapsed_ms
+        else:
+            self.latency_ms += LATENCY_EWMA_ALPHA * (elapsed_ms - self.latency_ms)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": None if self.latency_ms is None else round(self.latency_ms, 1),
+            "requests": self.requests,
+            "failures": self.failures,
+            "wins": self.wins,
+            "available": self.available,
+        }
+
+
+class ProviderPool:
+    """Routes lookups across ``providers`` with failover and optional racing."""
+
+    def __init__(self, providers: Sequence[WeatherProvider], race_workers: int = 16) -> None:
+        if not providers:
+            raise ValueError("At least one weather provider is required.")
+        self.providers = list(providers)
+        self.health = {provider.name: ProviderHealth() for provider in self.providers}
+        self.race_workers = race_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return [provider.name for provider in self.providers]
+
+    def fetch(self, kind: str, params: Dict[str, Any], timeout: float, race: bool = False) -> Any:
+        """Return the first answer for ``kind``, failing over in order.
+
+        With ``race`` and two usable providers, the two fastest are asked at
+        once. A ``WeatherAPIError`` answer is raised as-is; when every
+        provider is unreachable, the first provider's error is raised.
+        """
+
+        candidates = self._candidates()
+        errors: List[BaseException] = []
+        deadline = time.monotonic() + timeout
+        if race and len(candidates) >= 2:
+            raced = sorted(candidates, key=self._expected_latency)[:2]
+            try:
+                return self._race(raced, kind, params, timeout)
+            except WeatherAPIError:
+                raise
+            except (WeatherError, requests.exceptions.RequestException) as exc:
+                errors.append(exc)
+            candidates = [provider for provider in candidates if provider not in raced]
+        for provider in candidates:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                return self._call(provider, kind, params, remaining)
+            except WeatherAPIError:
+                raise
+            except (WeatherError, requests.exceptions.RequestException) as exc:
+                errors.append(exc)
+        if errors:
+            raise errors[0]
+        raise requests.exceptions.Timeout("No weather provider answered in time.")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: health.stats() for name, health in self.health.items()}
+
+    def close(self) -> None:
+        """Stop the race threads; queued attempts are cancelled."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def after_fork(self) -> None:
+        """Drop the parent's race threads (call in the child)."""
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> List[WeatherProvider]:
+        available = [provider for provider in self.providers if self.health[provider.name].available]
+        # With every provider cooling down, try them all rather than none.
+        return available or list(self.providers)
+
+    def _expected_latency(self, provider: WeatherProvider) -> float:
+        # Untried providers go first so they get a latency estimate.
+        latency = self.health[provider.name].latency_ms
+        return -1.0 if latency is None else latency
+
+    def _call(
+        self,
+        provider: WeatherProvider,
+        kind: str,
+        params: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        health = self.health[provider.name]
+        started = time.perf_counter()
+        # Race attempts report from their own threads, so counters are
+        # updated under the pool lock.
+        try:
+            result = provider.fetch(kind, params, timeout, cancel)
+        except Cancelled:
+            with self._lock:
+                health.cancelled(time.perf_counter() - started)
+            raise
+        except WeatherAPIError:
+            # An error answer still shows the provider is up.
+            with self._lock:
+                health.success(time.perf_counter() - started)
+            raise
+        except (NetworkError, requests.exceptions.RequestException):
+            with self._lock:
+                health.failure(time.perf_counter() - started)
+            metrics.increment(f"provider.{provider.name}.failures")
+            raise
+        with self._lock:
+            health.success(time.perf_counter() - started)
+        return result
+
+    def _race(
+        self, providers: List[WeatherProvider], kind: str, params: Dict[str, Any], timeout: float
+    ) -> Any:
+        executor = self._race_executor()
+        cancels = {provider.name: threading.Event() for provider in providers}
+        pending: Dict[Future, WeatherProvider] = {}
+        for provider in providers:
+            # Each attempt runs in a copy of this context (request deadline,
+            # request ID).
+            context = contextvars.copy_context()
+            future = executor.submit(
+                context.run, self._call, provider, kind, params, timeout, cancels[provider.name]
+            )
+            pending[future] = provider
+        metrics.increment("provider.races")
+        first_error: Optional[BaseException] = None
+        end = time.monotonic() + timeout
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=max(end - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+                if not done:
+                    raise requests.exceptions.Timeout("No weather provider answered in time.")
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Cancelled:
+                        continue
+                    except WeatherAPIError:
+                        # An error answer settles the race like any other.
+                        raise
+                    except (WeatherError, requests.exceptions.RequestException) as exc:
+                        first_error = first_error or exc
+                        continue
+                    with self._lock:
+                        self.health[provider.name].wins += 1
+                    return result
+            raise first_error or requests.exceptions.Timeout("No weather provider answered in time.")
+        finally:
+            for future, provider in pending.items():
+                cancels[provider.name].set()
+                future.cancel()
+
+    def _race_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.race_workers, thread_name_prefix="provider-race"
+                    )
+        return self._executor
+
+
+def build_providers(
+    names: Sequence[str], transport: Transport, api_key: Optional[str]
+) -> List[WeatherProvider]:
+    """Instantiate providers by name, in the given order."""
+
+    providers: List[WeatherProvider] = []
+    for name in names:
+        if name == "openweathermap":
+            providers.append(OpenWeatherMapProvider(transport, api_key or ""))
+        elif name == "open-meteo":
+            providers.append(OpenMeteoProvider(transport))
+        elif name == "local":
+            providers.append(LocalProvider())
+        else:
+            raise ValueError(f"Unknown weather provider {name!r}; use {', '.join(PROVIDER_NAMES)}.")
+    return providers
+
+
+def parse_provider_names(value: str) -> List[str]:
+    return [name.strip().lower() for name in value.split(",") if name.strip()]
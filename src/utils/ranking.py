@@ -0,0 +1,143 @@
+"""Top-N rankings of cities by a weather metric.
+
+Observations come from the shared ``WeatherAPI`` cache, so only cities whose
+entries have expired are fetched upstream. Values are gathered into a NumPy
+array and the top ``limit`` are selected with ``argpartition``, which is
+linear in the number of cities; only the selected rows are sorted. Finished
+rankings are cached for ``WEATHER_RANK_TTL`` seconds, so a dashboard that
+refreshes the same ranking repeatedly costs a single dictionary lookup.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.analytics import DERIVED_FIELDS, derive_weather
+from src.utils.cache import TTLCache
+from src.utils.exceptions import WeatherError
+from src.utils.metrics import metrics
+from src.utils.models import WeatherData
+from src.utils.weather_api import WeatherAPI
+
+DEFAULT_RANK_TTL = float(os.getenv("WEATHER_RANK_TTL", "60"))
+
+OBSERVED_METRICS: Dict[str, Callable[[WeatherData], float]] = {
+    "temperature": lambda data: data.temperature,
+    "feels_like": lambda data: data.feels_like,
+    "humidity": lambda data: data.humidity,
+    "pressure": lambda data: data.pressure,
+    "wind_speed": lambda data: data.wind_speed,
+    "precipitation": lambda data: data.precipitation,
+    "clouds": lambda data: data.clouds,
+}
+RANK_METRICS = tuple(OBSERVED_METRICS) + DERIVED_FIELDS
+
+metrics.register_gauge(
+    "rank.cache_hit_rate", lambda: metrics.ratio("rank.cache_hits", "rank.cache_misses")
+)
+
+
+@dataclass
+class RankedCity:
+    city: str
+    value: float
+    data: WeatherData
+
+
+@dataclass
+class Ranking:
+    metric: str
+    units: str
+    ascending: bool
+    entries: List[RankedCity]
+    # City name -> error message for cities that could not be fetched.
+    errors: Dict[str, str] = field(default_factory=dict)
+    considered: int = 0
+
+
+def top_indices(values: np.ndarray, limit: int, ascending: bool = False) -> np.ndarray:
+    """Indices of the ``limit`` best ``values``, best first."""
+
+    keys = values if ascending else -values
+    if limit < len(keys):
+        candidates = np.argpartition(keys, limit - 1)[:limit]
+    else:
+        candidates = np.arange(len(keys))
+    return candidates[np.argsort(keys[candidates], kind="stable")]
+
+
+class CityRanker:
+    """Ranks cities by any observed or derived metric."""
+
+    def __init__(
+        self,
+        api: WeatherAPI,
+        ttl: float = DEFAULT_RANK_TTL,
+        maxsize: int = 256,
+        max_workers: int = 16,
+    ) -> None:
+        self.api = api
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.max_workers = max_workers
+
+    def rank(
+        self,
+        cities: Iterable[str],
+        metric: str,
+        limit: int = 10,
+        ascending: bool = False,
+        units: Optional[str] = None,
+    ) -> Ranking:
+        if metric not in RANK_METRICS:
+            raise ValueError(f"metric must be one of {', '.join(RANK_METRICS)}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        client = self.api.with_locale(units)
+        names = list({city.strip().lower(): city.strip() for city in cities if city.strip()}.values())
+
+        key = (metric, client.units, ascending, limit, tuple(sorted(name.lower() for name in names)))
+        ranking = self.cache.get(key)
+        if ranking is not None:
+            metrics.increment("rank.cache_hits")
+            return ranking
+        metrics.increment("rank.cache_misses")
+
+        ranking = self._compute(client, names, metric, limit, ascending)
+        self.cache.set(key, ranking)
+        return ranking
+
+    def _compute(
+        self, client: WeatherAPI, names: List[str], metric: str, limit: int, ascending: bool
+    ) -> Ranking:
+        fetched: List[Tuple[str, WeatherData]] = []
+        errors: Dict[str, str] = {}
+        for city, result in client.iter_current_weather(names, max_workers=self.max_workers):
+            if isinstance(result, WeatherError):
+                errors[city] = str(result)
+            else:
+                fetched.append((city, result))
+        # Results arrive in completion order; sort so ties rank stably.
+        fetched.sort(key=lambda item: item[0].lower())
+
+        records = [data for _, data in fetched]
+        if metric in OBSERVED_METRICS:
+            getter = OBSERVED_METRICS[metric]
+            values = np.fromiter((getter(data) for data in records), dtype=np.float64, count=len(records))
+        else:
+            values = np.array([row[metric] for row in derive_weather(records, client.units)], dtype=np.float64)
+
+        entries = [
+            RankedCity(city=fetched[index][0], value=float(values[index]), data=fetched[index][1])
+            for index in (top_indices(values, limit, ascending) if records else [])
+        ]
+        return Ranking(
+            metric=metric,
+            units=client.units,
+            ascending=ascending,
+            entries=entries,
+            errors=errors,
+            considered=len(records),
+        )
@@ -0,0 +1,232 @@
+"""Per-client rate limiting and fair sharing of upstream capacity.
+
+:class:`SlidingWindowLimiter` approximates a sliding window with two fixed
+windows per client: the previous window's count is weighted by how much of
+it still overlaps the sliding window. Each check is O(1) in time and memory
+per client, and requests are charged a cost (one per city looked up) rather
+than counted.
+
+:class:`FairQueue` bounds how many upstream lookups run at once and, when
+the bound is reached, hands freed slots to waiting clients in round-robin
+order, so one busy client queues behind its own requests instead of
+everyone else's.
+
+State is per process: under gunicorn each worker enforces the limits on the
+requests it serves.
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Hashable, Optional
+
+DEFAULT_RATE_LIMIT = int(os.getenv("WEATHER_RATE_LIMIT", "300"))
+DEFAULT_RATE_WINDOW = float(os.getenv("WEATHER_RATE_WINDOW", "60"))
+DEFAULT_UPSTREAM_SLOTS = int(os.getenv("WEATHER_UPSTREAM_SLOTS", "16"))
+DEFAULT_QUEUE_TIMEOUT = float(os.getenv("WEATHER_QUEUE_TIMEOUT", "10"))
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class _Window:
+    __slots__ = ("start", "current", "previous")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.current = 0
+        self.previous = 0
+
+
+class SlidingWindowLimiter:
+    """Allow each client ``limit`` units of cost per ``window`` seconds."""
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_RATE_LIMIT,
+        window: float = DEFAULT_RATE_WINDOW,
+        max_clients: int = 10_000,
+    ) -> None:
+        self.limit = limit
+        self.window = window
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[Hashable, _Window]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, client: Hashable, cost: int = 1, now: Optional[float] = None) -> RateDecision:
+        """Charge ``cost`` to ``client`` if it fits in the sliding window."""
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._clients.get(client)
+            if state is None:
+                state = self._clients[client] = _Window(now - now % self.window)
+                while len(self._clients) > self.max_clients:
+                    # Least recently seen clients are forgotten first.
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(client)
+            self._advance(state, now)
+
+            elapsed = now - state.start
+            weight = 1 - elapsed / self.window
+            used = state.previous * weight + state.current
+            allowed = used + cost <= self.limit
+            if allowed:
+                state.current += cost
+                used += cost
+            else:
+                self.rejected += 1
+            remaining = max(0, int(self.limit - used))
+            retry_after = 0.0 if allowed else self._retry_after(state, elapsed, cost)
+        return RateDecision(allowed, self.limit, remaining, self.window - elapsed, retry_after)
+
+    def _advance(self, state: _Window, now: float) -> None:
+        windows = int((now - state.start) // self.window)
+        if windows >= 1:
+            state.previous = state.current if windows == 1 else 0
+            state.current = 0
+            state.start += windows * self.window
+
+    def _retry_after(self, state: _Window, elapsed: float, cost: int) -> float:
+        """Seconds until ``cost`` would fit, assuming no other requests."""
+
+        if cost > self.limit:
+            # Never fits; report a full window so clients back off.
+            return self.window
+        headroom = self.limit - state.current - cost
+        if headroom >= 0 and state.previous:
+            # The previous window's weight decays linearly to zero.
+            return max(0.0, self.window * (1 - headroom / state.previous) - elapsed)
+        # Wait for this window's count to become the (decaying) previous one.
+        until_next = self.window - elapsed
+        headroom = self.limit - cost
+        if state.current <= headroom:
+            return until_next
+        return until_next + self.window * (1 - headroom / state.current)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "window": self.window,
+            "clients": len(self._clients),
+            "rejected": self.rejected,
+        }
+
+
+class _Waiter:
+    __slots__ = ("weight", "granted")
+
+    def __init__(self, weight: int) -> None:
+        self.weight = weight
+        self.granted = False
+
+
+class FairQueue:
+    """``capacity`` weighted slots shared round-robin between clients.
+
+    A request holds ``weight`` slots while it runs. When slots are short,
+    waiting requests are queued per client and the client at the head of
+    the rotation is served next; a heavy request at the head is not
+    overtaken, so it cannot be starved by a stream of light ones.
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_UPSTREAM_SLOTS, timeout: float = DEFAULT_QUEUE_TIMEOUT
+    ) -> None:
+        self.capacity = capacity
+        self.timeout = timeout
+        self._available = capacity
+        self._queues: "OrderedDict[Hashable, Deque[_Waiter]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self.timeouts = 0
+
+    def acquire(self, client: Hashable, weight: int = 1, timeout: Optional[float] = None) -> int:
+        """Wait for slots and return how many were taken, or 0 on timeout.
+
+        Pass the return value to :meth:`release` when the work is done.
+        """
+
+        weight = max(1, min(weight, self.capacity))
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._cond:
+            if not self._queues and self._available >= weight:
+                self._available -= weight
+                return weight
+            waiter = _Waiter(weight)
+            self._queues.setdefault(client, deque()).append(waiter)
+            self._dispatch()
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._withdraw(client, waiter)
+                    self.timeouts += 1
+                    return 0
+                self._cond.wait(remaining)
+            return weight
+
+    def release(self, weight: int) -> None:
+        if not weight:
+            return
+        with self._cond:
+            self._available += weight
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        granted = False
+        while self._queues:
+            client, waiters = next(iter(self._queues.items()))
+            waiter = waiters[0]
+            if waiter.weight > self._available:
+                break
+            waiters.popleft()
+            waiter.granted = True
+            granted = True
+            self._available -= waiter.weight
+            if waiters:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+        if granted:
+            self._cond.notify_all()
+
+    def _withdraw(self, client: Hashable, waiter: _Waiter) -> None:
+        waiters = self._queues.get(client)
+        if waiters is None:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del self._queues[client]
+        # The head may have changed to a request that fits now.
+        self._dispatch()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "in_use": self.capacity - self._available,
+                "waiting": sum(len(waiters) for waiters in self._queues.values()),
+                "waiting_clients": len(self._queues),
+                "timeouts": self.timeouts,
+            }
@@ -0,0 +1,218 @@
+"""Speech synthesis and recognition behind small, swappable interfaces.
+
+The real engines (``pyttsx3`` and ``speech_recognition``) are imported and
+initialized on first use, so importing the voice app is cheap and the
+pipeline can be driven by stubs in benchmarks. :class:`PhraseCache` renders
+fixed phrases such as prompts and error messages to audio once and replays
+them afterwards, from memory and from a directory that outlives the process.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Protocol, Set, Union
+
+from src.utils.exceptions import VoiceInputError
+
+
+class Synthesizer(Protocol):
+    def say(self, text: str) -> None:
+        """Speak ``text``, blocking until it has been spoken."""
+
+    def render(self, text: str) -> Optional[bytes]:
+        """Return ``text`` as WAV audio, or None if the engine can't."""
+
+    def play(self, audio: bytes) -> None:
+        """Play audio previously returned by :meth:`render`."""
+
+    def voice_key(self) -> str:
+        """Identify the engine and voice, so audio is only reused for them."""
+
+
+class Recognizer(Protocol):
+    def listen(self, before_listening: Optional[Callable[[], None]] = None) -> str:
+        """Capture one utterance and return its text.
+
+        Raises ``VoiceInputError`` when nothing intelligible was heard.
+        """
+
+
+class Pyttsx3Synthesizer:
+    """Offline text-to-speech through ``pyttsx3``."""
+
+    def __init__(self) -> None:
+        self._engine = None
+        # pyttsx3 engines are not re-entrant.
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            import pyttsx3
+
+            self._engine = pyttsx3.init()
+        return self._engine
+
+    def voice_key(self) -> str:
+        with self._lock:
+            voice = self.engine.getProperty("voice")
+            rate = self.engine.getProperty("rate")
+        return f"pyttsx3/{voice}/{rate}"
+
+    def say(self, text: str) -> None:
+        with self._lock:
+            self.engine.say(text)
+            self.engine.runAndWait()
+
+    def render(self, text: str) -> Optional[bytes]:
+        try:
+            import pyaudio  # noqa: F401  (needed by play())
+        except ImportError:
+            return None
+        handle, path = tempfile.mkstemp(suffix=".wav")
+        os.close(handle)
+        try:
+            with self._lock:
+                self.engine.save_to_file(text, path)
+                self.engine.runAndWait()
+            with open(path, "rb") as stream:
+                audio = stream.read()
+            # Some drivers write AIFF regardless of the suffix; only WAV is played.
+            wave.open(io.BytesIO(audio)).close()
+            return audio
+        except (OSError, EOFError, wave.Error):
+            return None
+        finally:
+            os.unlink(path)
+
+    def play(self, audio: bytes) -> None:
+        import pyaudio
+
+        with wave.open(io.BytesIO(audio)) as clip:
+            player = pyaudio.PyAudio()
+            try:
+                stream = player.open(
+                    format=player.get_format_from_width(clip.getsampwidth()),
+                    channels=clip.getnchannels(),
+                    rate=clip.getframerate(),
+                    output=True,
+                )
+                stream.write(clip.readframes(clip.getnframes()))
+                stream.stop_stream()
+                stream.close()
+            finally:
+                player.terminate()
+
+
+class GoogleRecognizer:
+    """Microphone capture plus Google's free web speech API."""
+
+    def __init__(self, timeout: float = 5, phrase_time_limit: float = 5) -> None:
+        self.timeout = timeout
+        self.phrase_time_limit = phrase_time_limit
+        self._recognizer = None
+
+    @property
+    def recognizer(self):
+        if self._recognizer is None:
+            import speech_recognition as sr
+
+            self._recognizer = sr.Recognizer()
+        return self._recognizer
+
+    def listen(self, before_listening: Optional[Callable[[], None]] = None) -> str:
+        import speech_recognition as sr
+
+        with sr.Microphone() as source:
+            if before_listening is not None:
+                before_listening()
+            audio = self.recognizer.listen(
+                source, timeout=self.timeout, phrase_time_limit=self.phrase_time_limit
+            )
+        try:
+            return self.recognizer.recognize_google(audio)
+        except sr.UnknownValueError as exc:
+            raise VoiceInputError("Could not understand audio.") from exc
+        except sr.RequestError as exc:
+            raise VoiceInputError("Speech API unavailable.") from exc
+
+
+class PhraseCache:
+    """Speaks through ``synthesizer``, replaying fixed phrases once rendered.
+
+    Only phrases spoken with ``cache=True`` are rendered and kept; dynamic
+    text such as a weather summary is always synthesized live. With a
+    ``directory``, rendered audio is also written there, keyed by engine,
+    voice and text, so later runs of a one-shot app replay it too.
+    """
+
+    def __init__(
+        self,
+        synthesizer: Synthesizer,
+        maxsize: int = 32,
+        directory: Union[str, Path, None] = None,
+    ) -> None:
+        self.synthesizer = synthesizer
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        self._audio: "OrderedDict[str, bytes]" = OrderedDict()
+        self._unrenderable: Set[str] = set()
+
+    def say(self, text: str, cache: bool = False) -> None:
+        audio = self._cached_audio(text) if cache else None
+        if audio is None:
+            self.synthesizer.say(text)
+        else:
+            self.synthesizer.play(audio)
+
+    def _cached_audio(self, text: str) -> Optional[bytes]:
+        audio = self._audio.get(text)
+        if audio is not None:
+            self._audio.move_to_end(text)
+            return audio
+        if text in self._unrenderable:
+            return None
+        path = self._path(text)
+        audio = self._read(path) if path is not None else None
+        if audio is None:
+            audio = self.synthesizer.render(text)
+            if audio is None:
+                self._unrenderable.add(text)
+                return None
+            if path is not None:
+                self._write(path, audio)
+        self._audio[text] = audio
+        while len(self._audio) > self.maxsize:
+            self._audio.popitem(last=False)
+        return audio
+
+    def _path(self, text: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        digest = hashlib.sha256(f"{self.synthesizer.voice_key()}\0{text}".encode()).hexdigest()
+        return self.directory / f"{digest[:32]}.wav"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[bytes]:
+        try:
+            return path.read_bytes() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write(path: Path, audio: bytes) -> None:
+        # Written whole and renamed, so a reader never sees a partial clip.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(handle, "wb") as stream:
+                stream.write(audio)
+            os.replace(tmp, path)
+        except OSError:
+            pass
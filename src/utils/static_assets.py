@@ -0,0 +1,111 @@
+"""Precompressed, content-fingerprinted static assets for the web app."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple, Union
+
+try:  # Brotli is optional; gzip is always available.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Content codings the client accepts (q > 0); ``*`` stands in for gzip."""
+
+    qualities: Dict[str, float] = {}
+    for token in accept_encoding.split(","):
+        name, *params = (part.strip() for part in token.split(";"))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    accepted = {name for name, quality in qualities.items() if quality > 0}
+    # A listed coding takes precedence over the wildcard.
+    if "*" in accepted and "gzip" not in qualities:
+        accepted.add("gzip")
+    return accepted
+
+
+@dataclass(frozen=True)
+class PrecompressedAsset:
+    """A response body with its compressed variants and a strong ETag.
+
+    ``etag`` is the unquoted entity tag derived from the content hash.
+    """
+
+    body: bytes
+    content_type: str
+    etag: str
+    gzip: bytes
+    br: Optional[bytes] = None
+
+    @classmethod
+    def build(cls, body: Union[str, bytes], content_type: str) -> "PrecompressedAsset":
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        compressed_br = brotli.compress(body, quality=11) if brotli is not None else None
+        return cls(
+            body=body,
+            content_type=content_type,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            gzip=gzip.compress(body, compresslevel=9, mtime=0),
+            br=compressed_br,
+        )
+
+    def negotiate(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Return ``(body, content_encoding)`` for the client's Accept-Encoding."""
+
+        accepted = accepted_encodings(accept_encoding)
+        if self.br is not None and "br" in accepted and len(self.br) < len(self.body):
+            return self.br, "br"
+        if "gzip" in accepted and len(self.gzip) < len(self.body):
+            return self.gzip, "gzip"
+        return self.body, None
+
+
+class AssetBundle:
+    """Loads every file under ``root`` once, keyed by a fingerprinted name.
+
+    ``css/app.css`` is served as ``css/app.<hash>.css``; since the name
+    changes whenever the content does, responses can be cached forever.
+    """
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self._urls: Dict[str, str] = {}
+        self._assets: Dict[str, PrecompressedAsset] = {}
+        for path in sorted(self.root.rglob("*")):
+            if path.is_file():
+                self._add(path)
+
+    def _add(self, path: Path) -> None:
+        name = path.relative_to(self.root).as_posix()
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+        asset = PrecompressedAsset.build(path.read_bytes(), content_type)
+        stem, dot, suffix = name.rpartition(".")
+        fingerprint = asset.etag[:12]
+        fingerprinted = f"{stem}.{fingerprint}.{suffix}" if dot else f"{name}.{fingerprint}"
+        self._urls[name] = fingerprinted
+        self._assets[fingerprinted] = asset
+
+    def url(self, name: str) -> str:
+        """Return the public URL of ``name`` (e.g. ``"js/app.js"``)."""
+
+        return f"/static/{self._urls[name]}"
+
+    def get(self, fingerprinted_name: str) -> Optional[PrecompressedAsset]:
+        return self._assets.get(fingerprinted_name)
@@ -0,0 +1,156 @@
+"""Shared live-weather pollers with fan-out to many subscribers."""
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from src.utils.exceptions import WeatherError
+from src.utils.weather_api import WeatherAPI, WeatherData
+
+Serializer = Callable[[WeatherData], Dict[str, Any]]
+
+
+class Subscription:
+    """A single client's view onto a set of cities.
+
+    Events are dictionaries of the form ``{"city": ..., "changed": {...}}``
+    or ``{"city": ..., "error": ...}`` and are read with :meth:`get`.
+    """
+
+    def __init__(self, hub: "SubscriptionHub", cities: List[str], maxsize: int = 100) -> None:
+        self.hub = hub
+        self.cities = cities
+        self._events: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the next event, or ``None`` if nothing arrived in time."""
+
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        try:
+            self._events.put_nowait(event)
+        except queue.Full:
+            # A stalled client must not block the poller; it will get the
+            # next change instead.
+            pass
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class _CityPoller(threading.Thread):
+    """Refreshes one city on a fixed interval and publishes changed fields."""
+
+    def __init__(self, hub: "SubscriptionHub", city: str) -> None:
+        super().__init__(name=f"weather-poller:{city}", daemon=True)
+        self.hub = hub
+        self.city = city
+        self.subscribers: Set[Subscription] = set()
+        self.snapshot: Dict[str, Any] = {}
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            self.poll()
+            self.stopped.wait(self.hub.interval)
+
+    def poll(self) -> None:
+        try:
+            data = self.hub.api.get_current_weather(self.city)
+        except WeatherError as exc:
+            self.hub.publish(self, {"city": self.city, "error": str(exc)})
+            return
+
+        fields = self.hub.serializer(data)
+        changed = {
+            name: value
+            for name, value in fields.items()
+            if self.snapshot.get(name) != value
+        }
+        self.snapshot = fields
+        if changed:
+            self.hub.publish(self, {"city": self.city, "changed": changed})
+
+
+class SubscriptionHub:
+    """Runs one poller per watched city, however many clients watch it.
+
+    Pollers refresh at ``interval`` seconds (the API cache TTL by default),
+    so upstream cost grows with the number of distinct cities rather than
+    with the number of viewers. A poller stops once its last subscriber
+    leaves.
+    """
+
+    def __init__(
+        self,
+        api: WeatherAPI,
+        serializer: Serializer,
+        interval: Optional[float] = None,
+    ) -> None:
+        self.api = api
+        self.serializer = serializer
+        self.interval = interval if interval is not None else api.cache.ttl
+        self._pollers: Dict[str, _CityPoller] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, cities: Iterable[str]) -> Subscription:
+        names = list(dict.fromkeys(city.strip().lower() for city in cities if city.strip()))
+        subscription = Subscription(self, names)
+        with self._lock:
+            for name in names:
+                poller = self._pollers.get(name)
+                if poller is None:
+                    poller = _CityPoller(self, name)
+                    self._pollers[name] = poller
+                    poller.subscribers.add(subscription)
+                    poller.start()
+                else:
+                    poller.subscribers.add(subscription)
+                    if poller.snapshot:
+                        # Late joiners start from the current state.
+                        subscription.publish({"city": name, "changed": dict(poller.snapshot)})
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for name in subscription.cities:
+                poller = self._pollers.get(name)
+                if poller is None:
+                    continue
+                poller.subscribers.discard(subscription)
+                if not poller.subscribers:
+                    poller.stopped.set()
+                    del self._pollers[name]
+
+    def publish(self, poller: _CityPoller, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(poller.subscribers)
+        for subscription in subscribers:
+            subscription.publish(event)
+
+    def stop(self) -> None:
+        """Stop every poller, e.g. on shutdown."""
+
+        with self._lock:
+            pollers = list(self._pollers.values())
+            self._pollers.clear()
+        for poller in pollers:
+            poller.stopped.set()
+
+    def after_fork(self) -> None:
+        """Forget pollers inherited from the parent process (call in the child)."""
+
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "cities": len(self._pollers),
+                "subscribers": sum(len(p.subscribers) for p in self._pollers.values()),
+            }
@@ -0,0 +1,121 @@
+"""TinyLFU cache admission: frequency estimates from a count-min sketch.
+
+Every cache lookup is recorded in a small count-min sketch. When the cache
+is full, a new key is only admitted if it has been requested more often
+than the entry it would evict, so a scan of one-off cities (a large
+``/multi-weather`` call, say) can't flush the popular ones. Counters are
+halved every ``10 * capacity`` recordings so the estimates follow shifts in
+popularity.
+
+The sketch also tracks the most frequent keys seen, which callers can use
+to prefetch or keep hot entries warm.
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Tuple
+
+# Counters saturate here, as in the 4-bit counters of the TinyLFU paper.
+MAX_COUNT = 15
+
+
+class CountMinSketch:
+    """Approximate counts of hashable keys in ``depth * width`` counters.
+
+    Uses conservative update: only the smallest of a key's counters are
+    incremented, which keeps over-estimates from hash collisions low.
+    """
+
+    def __init__(self, width: int, depth: int = 4) -> None:
+        # A power of two so row indices are a mask away.
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.depth = depth
+        self._mask = self.width - 1
+        self._table = bytearray(self.width * depth)
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        # Double hashing: row i probes first + i * second.
+        first = hash(key)
+        second = ((first >> 32) ^ (first * 0x9E3779B1)) | 1
+        mask, width = self._mask, self.width
+        return [((first + row * second) & mask) + row * width for row in range(self.depth)]
+
+    def estimate(self, key: Hashable) -> int:
+        table = self._table
+        return min([table[index] for index in self._indexes(key)])
+
+    def increment(self, key: Hashable) -> int:
+        """Count one occurrence of ``key`` and return its new estimate."""
+
+        table = self._table
+        indexes = self._indexes(key)
+        current = min([table[index] for index in indexes])
+        if current < MAX_COUNT:
+            for index in indexes:
+                if table[index] == current:
+                    table[index] = current + 1
+            current += 1
+        return current
+
+    def halve(self) -> None:
+        self._table = bytearray(count >> 1 for count in self._table)
+
+
+class TinyLFU:
+    """Admission policy for a cache of ``capacity`` entries."""
+
+    def __init__(self, capacity: int, top_k: int = 32) -> None:
+        self.sketch = CountMinSketch(max(capacity, 16))
+        self.sample_size = 10 * max(capacity, 16)
+        self.top_k = top_k
+        self.admitted = 0
+        self.rejected = 0
+        self._recorded = 0
+        self._top: Dict[Hashable, int] = {}
+        self._top_floor = 0
+
+    def record(self, key: Hashable) -> None:
+        """Count an access to ``key`` (hit or miss)."""
+
+        self._track(key, self.sketch.increment(key))
+        self._recorded += 1
+        if self._recorded >= self.sample_size:
+            self._age()
+
+    def admit(self, candidate: Hashable, victim: Hashable) -> bool:
+        """Return True if ``candidate`` should replace ``victim``."""
+
+        admitted = self.sketch.estimate(candidate) > self.sketch.estimate(victim)
+        if admitted:
+            self.admitted += 1
+        else:
+            self.rejected += 1
+        return admitted
+
+    def heavy_hitters(self, limit: int = 10) -> List[Tuple[Hashable, int]]:
+        """Return up to ``limit`` of the most requested keys with estimates."""
+
+        ranked = sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        return {"admitted": self.admitted, "rejected": self.rejected}
+
+    def _track(self, key: Hashable, count: int) -> None:
+        # Tracked keys are counted exactly, so their order isn't limited by
+        # the saturating sketch counters.
+        top = self._top
+        if key in top:
+            top[key] += 1
+        elif len(top) < self.top_k:
+            top[key] = count
+            self._top_floor = min(top.values())
+        elif count > self._top_floor:
+            del top[min(top, key=top.__getitem__)]
+            top[key] = count
+            self._top_floor = min(top.values())
+
+    def _age(self) -> None:
+        self.sketch.halve()
+        self._recorded //= 2
+        self._top = {key: count >> 1 for key, count in self._top.items() if count >> 1}
+        self._top_floor = min(self._top.values(), default=0)
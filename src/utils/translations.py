@@ -0,0 +1,168 @@
+"""Local weather-condition descriptions keyed by OpenWeatherMap condition ID.
+
+Observations are fetched in English once and translated here, so a single
+cached entry serves every language with a table below. See
+https://openweathermap.org/weather-conditions for the ID list. IDs missing
+from a language table fall back to that language's group description
+(thunderstorm, drizzle, rain, ...) and finally to the English text. Other
+languages are translated upstream (see :func:`translated_locally`).
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+CANONICAL_LANGUAGE = "en"
+
+# Keyed by ``condition_id // 100``; every table lists 800 ("clear") explicitly.
+GROUPS: Dict[str, Dict[int, str]] = {
+    "es": {2: "tormenta", 3: "llovizna", 5: "lluvia", 6: "nieve", 7: "niebla", 8: "nubes"},
+    "fr": {2: "orage", 3: "bruine", 5: "pluie", 6: "neige", 7: "brume", 8: "nuageux"},
+    "de": {2: "Gewitter", 3: "Nieselregen", 5: "Regen", 6: "Schnee", 7: "Dunst", 8: "Bewölkt"},
+    "hi": {2: "आंधी", 3: "बूंदा बांदी", 5: "बारिश", 6: "बर्फबारी", 7: "धुंध", 8: "बादल"},
+}
+
+CONDITIONS: Dict[str, Dict[int, str]] = {
+    "es": {
+        200: "tormenta con lluvia ligera",
+        201: "tormenta con lluvia",
+        202: "tormenta con lluvia intensa",
+        211: "tormenta",
+        212: "tormenta fuerte",
+        300: "llovizna ligera",
+        301: "llovizna",
+        302: "llovizna intensa",
+        500: "lluvia ligera",
+        501: "lluvia moderada",
+        502: "lluvia de gran intensidad",
+        503: "lluvia muy fuerte",
+        511: "lluvia helada",
+        520: "chubasco ligero",
+        521: "chubasco",
+        600: "nevada ligera",
+        601: "nieve",
+        602: "nevada intensa",
+        611: "aguanieve",
+        701: "neblina",
+        711: "humo",
+        721: "bruma",
+        741: "niebla",
+        781: "tornado",
+        800: "cielo claro",
+        801: "algo de nubes",
+        802: "nubes dispersas",
+        803: "nubes rotas",
+        804: "nubes",
+    },
+    "fr": {
+        200: "orage et pluie fine",
+        201: "orage et pluie",
+        202: "orage et fortes pluies",
+        211: "orage",
+        212: "fort orage",
+        300: "bruine légère",
+        301: "bruine",
+        302: "forte bruine",
+        500: "légère pluie",
+        501: "pluie modérée",
+        502: "forte pluie",
+        503: "pluie très forte",
+        511: "pluie verglaçante",
+        520: "légère averse",
+        521: "averse de pluie",
+        600: "légère chute de neige",
+        601: "neige",
+        602: "forte chute de neige",
+        611: "neige fondue",
+        701: "brume",
+        711: "fumée",
+        721: "brume sèche",
+        741: "brouillard",
+        781: "tornade",
+        800: "ciel dégagé",
+        801: "peu nuageux",
+        802: "partiellement nuageux",
+        803: "nuageux",
+        804: "couvert",
+    },
+    "de": {
+        200: "Gewitter mit leichtem Regen",
+        201: "Gewitter mit Regen",
+        202: "Gewitter mit Starkregen",
+        211: "Gewitter",
+        212: "schweres Gewitter",
+        300: "leichter Nieselregen",
+        301: "Nieselregen",
+        302: "starker Nieselregen",
+        500: "leichter Regen",
+        501: "mäßiger Regen",
+        502: "starker Regen",
+        503: "sehr starker Regen",
+        511: "Eisregen",
+        520: "leichte Regenschauer",
+        521: "Regenschauer",
+        600: "mäßiger Schnee",
+        601: "Schnee",
+        602: "starker Schneefall",
+        611: "Schneeregen",
+        701: "trüb",
+        711: "Rauch",
+        721: "Dunst",
+        741: "Nebel",
+        781: "Tornado",
+        800: "Klarer Himmel",
+        801: "ein paar Wolken",
+        802: "Mäßig bewölkt",
+        803: "Überwiegend bewölkt",
+        804: "Bedeckt",
+    },
+    "hi": {
+        200: "हल्की बारिश के साथ आंधी",
+        201: "बारिश के साथ आंधी",
+        202: "भारी बारिश के साथ आंधी",
+        211: "आंधी",
+        212: "तेज आंधी",
+        300: "हल्की बूंदा बांदी",
+        301: "बूंदा बांदी",
+        500: "हल्की बारिश",
+        501: "मध्यम बारिश",
+        502: "भारी बारिश",
+        503: "बहुत भारी बारिश",
+        520: "हल्की बौछार",
+        521: "बौछार",
+        600: "हल्की बर्फबारी",
+        601: "बर्फबारी",
+        602: "भारी बर्फबारी",
+        701: "कुहासा",
+        711: "धुआं",
+        721: "धुंध",
+        741: "कोहरा",
+        800: "साफ आसमान",
+        801: "कुछ बादल",
+        802: "छितरे हुए बादल",
+        803: "टूटे हुए बादल",
+        804: "घने बादल",
+    },
+}
+
+
+def translated_locally(language: str) -> bool:
+    """Whether ``language`` is served from English data and the tables here."""
+
+    language = (language or CANONICAL_LANGUAGE).lower()
+    return language == CANONICAL_LANGUAGE or language in CONDITIONS
+
+
+def describe(condition_id: int, language: str, fallback: str) -> str:
+    """Return the description of ``condition_id`` in ``language``.
+
+    ``fallback`` (the canonical English text) is returned for English,
+    unknown languages and unknown IDs.
+    """
+
+    language = (language or CANONICAL_LANGUAGE).lower()
+    if language == CANONICAL_LANGUAGE or language not in CONDITIONS or not condition_id:
+        return fallback
+    text = CONDITIONS[language].get(condition_id)
+    if text is not None:
+        return text
+    return GROUPS[language].get(condition_id // 100, fallback)
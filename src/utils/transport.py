@@ -0,0 +1,327 @@
+"""HTTP transports for ``WeatherAPI``: live, record and replay.
+
+The mode is selected with ``WEATHER_TRANSPORT`` (``live``, ``record`` or
+``replay``). Recorded exchanges are stored in a SQLite archive
+(``WEATHER_ARCHIVE``) keyed by URL and query parameters, with the API key
+stripped. Replay can add latency via ``WEATHER_REPLAY_LATENCY``: a number of
+milliseconds, or ``recorded`` to reproduce the latency seen when recording.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TRANSPORT_MODES = ("live", "record", "replay")
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    elapsed_ms REAL NOT NULL,
+    recorded_at INTEGER NOT NULL
+)
+"""
+
+# Never written to the archive or used in lookup keys.
+SECRET_PARAMS = frozenset({"appid"})
+# Matched case-insensitively upstream, so normalized in lookup keys.
+FOLDED_PARAMS = frozenset({"q"})
+
+
+def request_key(url: str, params: Optional[Mapping[str, Any]]) -> str:
+    """Return a stable archive key for a GET request."""
+
+    items = sorted(
+        (name, str(value).strip().lower() if name in FOLDED_PARAMS else str(value))
+        for name, value in (params or {}).items()
+        if name not in SECRET_PARAMS and value is not None
+    )
+    return f"{url}?{urlencode(items)}"
+
+
+class Transport(Protocol):
+    """Anything that can perform the GET requests ``WeatherAPI`` needs."""
+
+    offline: bool
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 15) -> Any:
+        ...
+
+    def after_fork(self) -> None:
+        """Re-create connections after ``fork()``; called in the child."""
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Connection-reuse counters; empty for transports without a pool."""
+
+    def close(self) -> None:
+        """Release pooled connections and open files."""
+
+
+class TransportResponse:
+    """Minimal stand-in for ``requests.Response`` used by replayed requests."""
+
+    def __init__(self, status_code: int, content: bytes, url: str = "") -> None:
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=None
+            )
+
+
+class LiveTransport:
+    """Sends requests to the network through pooled ``requests`` sessions.
+
+    Each session mounts an ``HTTPAdapter`` holding up to ``pool_maxsize``
+    keep-alive connections per host, sized for the number of threads that
+    share the transport (Flask request threads plus any fan-out). With
+    ``per_thread=True`` every thread gets its own session instead of sharing
+    one, for callers that don't want to rely on ``Session`` thread-safety;
+    a session is closed once its thread has exited. A caller-supplied
+    ``session`` is used as-is and never closed here.
+    """
+
+    offline = False
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_maxsize: int = 32,
+        per_thread: bool = False,
+    ) -> None:
+        self.pool_maxsize = pool_maxsize
+        self.per_thread = per_thread and session is None
+        self._external_session = session
+        self._sessions_lock = threading.Lock()
+        self._reset()
+
+    @property
+    def session(self) -> requests.Session:
+        if not self.per_thread:
+            return self._shared
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+            self._live_sessions()
+            with self._sessions_lock:
+                self._thread_sessions.append((threading.current_thread(), session))
+        return session
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 15):
+        return self.session.get(url, params=params, timeout=timeout)
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Connections opened vs. requests sent across all pooled sessions."""
+
+        opened = requests_sent = 0
+        sessions = self._live_sessions()
+        # One adapter is mounted for both schemes; count each once.
+        adapters = {id(a): a for session in sessions for a in session.adapters.values()}
+        for adapter in adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    requests_sent += pool.num_requests
+        return {
+            "sessions": len(sessions),
+            "connections_opened": opened,
+            "requests": requests_sent,
+            "connection_reuse_rate": 1 - opened / requests_sent if requests_sent else 0.0,
+        }
+
+    def after_fork(self) -> None:
+        # Pooled sockets must never be shared between processes.
+        self._sessions_lock = threading.Lock()
+        if self._external_session is not None:
+            for adapter in self._external_session.adapters.values():
+                adapter.close()
+        self._reset()
+
+    def close(self) -> None:
+        for session in self._live_sessions():
+            if session is not self._external_session:
+                session.close()
+        with self._sessions_lock:
+            self._thread_sessions = []
+        self._local = threading.local()
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+        # Per-thread sessions with the thread that owns each one.
+        self._thread_sessions: List[Tuple[threading.Thread, requests.Session]] = []
+        self._shared = self._external_session or (None if self.per_thread else self._new_session())
+
+    def _live_sessions(self) -> List[requests.Session]:
+        """Sessions in use; those of exited threads are closed and dropped."""
+
+        with self._sessions_lock:
+            exited = [session for thread, session in self._thread_sessions if not thread.is_alive()]
+            self._thread_sessions = [entry for entry in self._thread_sessions if entry[0].is_alive()]
+            sessions = [session for _, session in self._thread_sessions]
+        for session in exited:
+            session.close()
+        return sessions if self._shared is None else [self._shared, *sessions]
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+class Archive:
+    """Compact, indexed store of recorded request/response pairs."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(ARCHIVE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def after_fork(self) -> None:
+        # SQLite connections must not be used across fork().
+        self._open()
+
+    def put(self, key: str, status: int, body: bytes, elapsed_ms: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO exchanges VALUES (?, ?, ?, ?, ?)",
+                (key, status, zlib.compress(body, 6), elapsed_ms, int(time.time())),
+            )
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body, elapsed_ms FROM exchanges WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, body, elapsed_ms = row
+        return status, zlib.decompress(body), elapsed_ms
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class RecordingTransport:
+    """Forwards to another transport and archives every exchange."""
+
+    offline = False
+
+    def __init__(self, archive: Archive, inner: Optional[Transport] = None) -> None:
+        self.archive = archive
+        self.inner = inner or LiveTransport()
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 15):
+        started = time.perf_counter()
+        response = self.inner.get(url, params=params, timeout=timeout)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.archive.put(request_key(url, params), response.status_code, response.content, elapsed_ms)
+        return response
+
+    def after_fork(self) -> None:
+        self.archive.after_fork()
+        self.inner.after_fork()
+
+    def pool_stats(self) -> Dict[str, float]:
+        return self.inner.pool_stats()
+
+    def close(self) -> None:
+        self.inner.close()
+        self.archive.close()
+
+
+class ReplayTransport:
+    """Serves responses from an archive without touching the network.
+
+    ``latency`` is ``None`` for no delay, a number of milliseconds, or the
+    string ``"recorded"`` to sleep for the originally observed latency.
+    """
+
+    offline = True
+
+    def __init__(self, archive: Archive, latency: Union[None, float, str] = None) -> None:
+        self.archive = archive
+        self.latency = latency
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 15):
+        key = request_key(url, params)
+        entry = self.archive.get(key)
+        if entry is None:
+            raise requests.exceptions.ConnectionError(f"No recorded response for {key}")
+        status, body, elapsed_ms = entry
+
+        delay_ms = elapsed_ms if self.latency == "recorded" else float(self.latency or 0)
+        if delay_ms:
+            time.sleep(min(delay_ms / 1000, timeout))
+        return TransportResponse(status, body, url=url)
+
+    def after_fork(self) -> None:
+        self.archive.after_fork()
+
+    def pool_stats(self) -> Dict[str, float]:
+        return {}
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def parse_latency(value: str) -> Union[None, float, str]:
+    value = value.strip().lower()
+    if not value:
+        return None
+    if value == "recorded":
+        return value
+    return float(value)
+
+
+def transport_from_env(session: Optional[requests.Session] = None) -> Transport:
+    """Build the transport selected by ``WEATHER_TRANSPORT``."""
+
+    from src.config.settings import get_settings
+
+    settings = get_settings()
+    mode = settings.transport
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"WEATHER_TRANSPORT must be one of {', '.join(TRANSPORT_MODES)}")
+
+    live = LiveTransport(
+        session,
+        pool_maxsize=settings.http_pool_size,
+        per_thread=settings.http_per_thread_sessions,
+    )
+    if mode == "live":
+        return live
+    archive = Archive(settings.transport_archive)
+    if mode == "record":
+        return RecordingTransport(archive, live)
+    return ReplayTransport(archive, latency=parse_latency(settings.replay_latency))
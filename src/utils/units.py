@@ -0,0 +1,73 @@
+"""Local unit conversion from the canonical metric observations.
+
+``WeatherAPI`` always fetches and caches data in metric units (°C, m/s,
+hPa, mm) and converts to the caller's unit system on the way out. Every
+supported system is an affine transform of the metric values, so forecast
+series are converted as NumPy columns in a single vectorized pass.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.models import ForecastEntry, WeatherData
+
+CANONICAL_UNITS = "metric"
+
+# units -> ((temperature scale, temperature offset), wind speed scale)
+UNIT_SYSTEMS: Dict[str, Tuple[Tuple[float, float], float]] = {
+    "metric": ((1.0, 0.0), 1.0),  # °C, m/s
+    "imperial": ((9 / 5, 32.0), 2.2369362921),  # °F, mph
+    "standard": ((1.0, 273.15), 1.0),  # K, m/s
+}
+
+TEMPERATURE_SYMBOLS = {"metric": "°C", "imperial": "°F", "standard": "K"}
+WIND_SPEED_SYMBOLS = {"metric": "m/s", "imperial": "mph", "standard": "m/s"}
+
+
+def normalize_units(units: Optional[str]) -> str:
+    units = (units or CANONICAL_UNITS).lower()
+    if units not in UNIT_SYSTEMS:
+        raise ValueError(f"units must be one of {', '.join(UNIT_SYSTEMS)}")
+    return units
+
+
+def convert_temperatures(values: Sequence[float], units: str) -> np.ndarray:
+    """Metric temperatures converted to ``units``, rounded to 2 decimals."""
+
+    (scale, offset), _ = UNIT_SYSTEMS[units]
+    return np.round(np.asarray(values, dtype=np.float64) * scale + offset, 2)
+
+
+def convert_weather(data: WeatherData, units: str) -> WeatherData:
+    """Return ``data`` (in metric units) converted to ``units``."""
+
+    if units == CANONICAL_UNITS:
+        return data
+    temperature, feels_like = convert_temperatures((data.temperature, data.feels_like), units).tolist()
+    _, wind_scale = UNIT_SYSTEMS[units]
+    return replace(
+        data,
+        temperature=temperature,
+        feels_like=feels_like,
+        wind_speed=round(data.wind_speed * wind_scale, 2),
+    )
+
+
+def convert_forecast(entries: Sequence[ForecastEntry], units: str) -> List[ForecastEntry]:
+    """Convert a metric forecast series to ``units`` column-wise."""
+
+    if units == CANONICAL_UNITS or not entries:
+        return list(entries)
+    # Temperature and feels-like columns are converted together.
+    temperatures = np.array([(entry.temperature, entry.feels_like) for entry in entries], dtype=np.float64)
+    converted = convert_temperatures(temperatures, units).tolist()
+    _, wind_scale = UNIT_SYSTEMS[units]
+    winds = np.fromiter((entry.wind_speed for entry in entries), dtype=np.float64, count=len(entries))
+    winds = np.round(winds * wind_scale, 2).tolist()
+    return [
+        replace(entry, temperature=temp, feels_like=feels, wind_speed=wind)
+        for entry, (temp, feels), wind in zip(entries, converted, winds)
+    ]
@@ -1,163 +1,488 @@
 """Wrapper around the OpenWeatherMap API."""
 from __future__ import annotations
 
+import contextvars
+import copy
 import os
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import requests
 
-from src.utils.exceptions import (
-    MissingAPIKeyError,
-    NetworkError,
-    WeatherAPIError,
+from src.utils import geohash
+from src.utils.admission import set_deadline, upstream_timeout
+from src.utils.cache import DEFAULT_CACHE_ADMISSION, DEFAULT_CACHE_TTL, TTLCache
+from src.utils.decoding import decode_onecall, parse_current, parse_forecast_entry
+from src.utils.exceptions import DeadlineExceeded, MissingAPIKeyError, NetworkError, WeatherError
+from src.utils.metrics import metrics
+from src.utils.models import ForecastEntry, WeatherData
+from src.utils.providers import (
+    DEFAULT_PROVIDERS,
+    DEFAULT_RACE,
+    OpenWeatherMapProvider,
+    ProviderPool,
+    WeatherProvider,
+    build_providers,
+    parse_provider_names,
 )
+from src.utils.transport import Transport, transport_from_env
+from src.utils.translations import CANONICAL_LANGUAGE, describe, translated_locally
+from src.utils.units import CANONICAL_UNITS, convert_forecast, convert_weather, normalize_units
 
+# Upper bound for one upstream call; a request deadline can only shorten it.
+UPSTREAM_TIMEOUT = 15.0
+# Precision 5 geohash tiles are roughly 4.9 km x 4.9 km.
+DEFAULT_GEOHASH_PRECISION = int(os.getenv("WEATHER_GEOHASH_PRECISION", "5"))
+# One Call needs its own OpenWeatherMap subscription, so it is opt-in.
+DEFAULT_ONECALL = os.getenv("WEATHER_ONECALL", "") in {"1", "true", "yes"}
+# Threads shared by every multi-city fan-out and bundle fetch of a client.
+DEFAULT_FETCH_WORKERS = int(os.getenv("WEATHER_FETCH_WORKERS", "16"))
 
-# ---------------------------------------------------------------------
-# Data models
-# ---------------------------------------------------------------------
-@dataclass
-class WeatherData:
-    city: str
-    temperature: float
-    feels_like: float
-    pressure: int
-    humidity: int
-    wind_speed: float
-    description: str
-    icon: str
-    sunrise: int
-    sunset: int
-    clouds: int
-    precipitation: float
-
-    @property
-    def sunrise_time(self) -> datetime:
-        return datetime.fromtimestamp(self.sunrise)
-
-    @property
-    def sunset_time(self) -> datetime:
-        return datetime.fromtimestamp(self.sunset)
-
-
-@dataclass
-class ForecastEntry:
-    timestamp: int
-    temperature: float
-    feels_like: float
-    description: str
-    icon: str
-
-    @property
-    def time(self) -> datetime:
-        return datetime.fromtimestamp(self.timestamp)
+metrics.register_gauge(
+    "geotile.hit_rate", lambda: metrics.ratio("geotile.hits", "geotile.misses")
+)
 
 
 # ---------------------------------------------------------------------
 # API client
 # ---------------------------------------------------------------------
 class WeatherAPI:
-    """Simple OpenWeatherMap API client."""
+    """Weather client backed by OpenWeatherMap or other providers.
+
+    Upstream requests always use canonical metric units, and the cache
+    stores that form; ``units`` are applied locally to each result. Likewise
+    English data is translated locally for the languages in
+    :mod:`src.utils.translations`, so one cache entry serves all of them.
+    Any other language is requested upstream and cached separately.
+
+    Lookups go through a :class:`ProviderPool` built from ``providers`` (by
+    default the ``WEATHER_PROVIDERS`` list), which fails over between them.
+    With ``race``, single-city lookups ask the two fastest providers at once;
+    multi-city fan-out never races. Concurrent fetches run on one
+    long-lived pool of ``fetch_workers`` threads; call :meth:`close` when
+    the client is no longer needed.
+    """
 
-    BASE_URL = "https://api.openweathermap.org/data/2.5"
+    BASE_URL = OpenWeatherMapProvider.BASE_URL
+    ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
 
     def __init__(
         self,
         session: Optional[requests.Session] = None,
         units: str = "metric",
         language: str = "en",
+        cache: Optional[TTLCache] = None,
+        transport: Optional[Transport] = None,
+        geohash_precision: int = DEFAULT_GEOHASH_PRECISION,
+        onecall: bool = DEFAULT_ONECALL,
+        providers: Optional[Sequence[WeatherProvider]] = None,
+        race: bool = DEFAULT_RACE,
+        fetch_workers: int = DEFAULT_FETCH_WORKERS,
     ) -> None:
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
+        self.transport = transport or transport_from_env(session)
+        names = parse_provider_names(DEFAULT_PROVIDERS) if providers is None else []
 
         if not self.api_key:
-            raise MissingAPIKeyError(
-                "OPENWEATHER_API_KEY is required. "
-                "Set it in Render → Environment Variables."
-            )
+            if not self.transport.offline and "openweathermap" in names:
+                raise MissingAPIKeyError(
+                    "OPENWEATHER_API_KEY is required. "
+                    "Set it in Render → Environment Variables."
+                )
+            # Replayed requests never leave the process, so no key is needed.
+            self.api_key = "replay"
+        self.providers = ProviderPool(
+            providers if providers is not None else build_providers(names, self.transport, self.api_key)
+        )
+        self.race = race
 
-        self.session = session or requests.Session()
-        self.units = units
-        self.language = language
+        self.units = normalize_units(units)
+        self.language = (language or CANONICAL_LANGUAGE).lower()
+        self.cache = (
+            cache
+            if cache is not None
+            else TTLCache(ttl=DEFAULT_CACHE_TTL, admission=DEFAULT_CACHE_ADMISSION)
+        )
+        self.listeners: List[Callable[[WeatherData, Optional[str]], None]] = []
+        self.geohash_precision = geohash_precision
+        self.onecall = onecall
+        self.fetch_workers = fetch_workers
+        # Threads are only started once work is submitted.
+        self._executor = self._new_executor()
 
     # ------------------------------------------------------------------
     # Public helpers
     # ------------------------------------------------------------------
     def get_current_weather(self, city: str) -> WeatherData:
-        payload = self._request("weather", {"q": city})
-        return self._parse_current(payload)
+        data = self.cache.get(self._cache_key("weather", city))
+        if data is None:
+            return self._fetch_current_weather(city)
+        return self._localize(data)
 
     def get_hourly_forecast(self, city: str, hours: int = 12) -> List[ForecastEntry]:
-        payload = self._request("forecast", {"q": city})
-        entries = [self._parse_forecast_entry(item) for item in payload.get("list", [])]
-        return entries[:hours]
+        key = self._cache_key("forecast", city)
+        entries = self.cache.get(key)
+        if entries is None:
+            entries = self._fetch("forecast", {"q": city})
+            self.cache.set(key, entries)
+        return self._localize_forecast(entries[:hours])
+
+    def get_weather_bundle(
+        self, city: str, hours: int = 12
+    ) -> Tuple[WeatherData, List[ForecastEntry]]:
+        """Return current weather and the forecast for ``city`` together.
+
+        Whatever is cached is reused. If both parts are missing and the
+        city's coordinates are known from an earlier lookup, a One Call
+        request (when enabled) fetches both in one round trip; otherwise the
+        missing parts are fetched concurrently. Known coordinates are also
+        sent with those requests, so the city is only resolved once.
+        """
+
+        weather_key = self._cache_key("weather", city)
+        forecast_key = self._cache_key("forecast", city)
+        data = self.cache.get(weather_key)
+        entries = self.cache.get(forecast_key)
+        if data is None or entries is None:
+            known = data or self.cache.get_stale(weather_key)
+            if known is not None and not (known.latitude or known.longitude):
+                known = None
+            onecall = self.onecall and "openweathermap" in self.providers.names
+            if onecall and known is not None and data is None and entries is None:
+                metrics.increment("bundle.onecall")
+                params = {"lat": known.latitude, "lon": known.longitude, "exclude": "minutely,daily,alerts"}
+                data, entries = decode_onecall(self._request("onecall", params), known.city)
+                self.cache.set(weather_key, data)
+                self.cache.set(forecast_key, entries)
+                self._notify(data, city)
+            else:
+                metrics.increment("bundle.split")
+                data, entries = self._fetch_bundle(city, data, entries, known)
+        return self._localize(data), self._localize_forecast(entries[:hours])
+
+    def get_stale_weather(self, city: str) -> Optional[WeatherData]:
+        """Return cached weather for ``city`` even if expired, without fetching."""
+
+        data = self.cache.get_stale(self._cache_key("weather", city))
+        return None if data is None else self._localize(data)
+
+    def get_stale_forecast(self, city: str, hours: int = 12) -> Optional[List[ForecastEntry]]:
+        entries = self.cache.get_stale(self._cache_key("forecast", city))
+        return None if entries is None else self._localize_forecast(entries[:hours])
+
+    def hot_cities(self, limit: int = 10) -> List[str]:
+        """Most requested cities, for prefetching; empty for an LRU cache."""
+
+        keys = self.cache.heavy_hitters(limit * 2)
+        return [key[1] for key, _ in keys if key[0] == "weather"][:limit]
+
+    def after_fork(self) -> None:
+        """Re-create connections inherited from a pre-fork parent process."""
+
+        self.transport.after_fork()
+        self.providers.after_fork()
+        # The parent's fetch threads don't exist in the child.
+        self._executor = self._new_executor()
+
+    def close(self) -> None:
+        """Stop the fetch and race threads and release connections; queued lookups are cancelled."""
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.providers.close()
+        self.transport.close()
+
+    def with_locale(
+        self, units: Optional[str] = None, language: Optional[str] = None
+    ) -> "WeatherAPI":
+        """Return a view of this client that shares its cache and transport."""
+
+        view = copy.copy(self)
+        view.units = normalize_units(units or self.units)
+        view.language = (language or self.language).lower()
+        return view
+
+    def get_current_weather_by_coords(self, latitude: float, longitude: float) -> WeatherData:
+        """Return current weather for the geohash tile containing the point.
+
+        Lookups are keyed by tile, so every point within the same tile shares
+        one cached upstream call made for the tile centre.
+        """
+
+        tile = self._tile(latitude, longitude)
+        key = self._cache_key("weather@tile", tile)
+        data = self.cache.get(key)
+        if data is None:
+            metrics.increment("geotile.misses")
+            data = self._fetch("weather", self._tile_params(tile))
+            self.cache.set(key, data)
+            self._notify(data)
+        else:
+            metrics.increment("geotile.hits")
+        return self._localize(data)
+
+    def get_hourly_forecast_by_coords(
+        self, latitude: float, longitude: float, hours: int = 12
+    ) -> List[ForecastEntry]:
+        tile = self._tile(latitude, longitude)
+        key = self._cache_key("forecast@tile", tile)
+        entries = self.cache.get(key)
+        if entries is None:
+            metrics.increment("geotile.misses")
+            entries = self._fetch("forecast", self._tile_params(tile))
+            self.cache.set(key, entries)
+        else:
+            metrics.increment("geotile.hits")
+        return self._localize_forecast(entries[:hours])
+
+    def add_listener(self, listener: Callable[[WeatherData, Optional[str]], None]) -> None:
+        """Call ``listener`` with every observation fetched from upstream.
+
+        The second argument is the city as the caller asked for it, which
+        may differ from the name upstream reports (``None`` for lookups by
+        coordinates).
+        """
+
+        self.listeners.append(listener)
+
+    def iter_current_weather(
+        self,
+        cities: Iterable[str],
+        max_workers: int = 8,
+        rate: float = 0.0,
+        city_deadline: Optional[float] = None,
+    ) -> Iterator[Tuple[str, Union[WeatherData, WeatherError]]]:
+        """Fetch ``cities`` concurrently, yielding results as they complete.
+
+        Each item is ``(city, result)`` where ``result`` is either the
+        ``WeatherData`` or the ``WeatherError`` raised for that city. At most
+        ``max_workers`` lookups run at once on the client's shared fetch
+        threads and at most ``2 * max_workers`` cities are read ahead, so
+        arbitrarily long city iterables are consumed lazily. A positive
+        ``rate`` caps upstream lookups started per second; finished results
+        are still yielded while the next lookup waits for its turn. With
+        ``city_deadline``, each lookup gets that many seconds from when it
+        starts instead of sharing the caller's deadline, for streams that
+        outlast one request deadline.
+        """
+
+        city_iter = iter(cities)
+        pending: Dict[Future, str] = {}
+        ready: List[Tuple[str, WeatherData]] = []
+        # A cache miss waiting for the rate limit before it is submitted.
+        held: List[str] = []
+        interval = 1.0 / rate if rate > 0 else 0.0
+        next_start = time.monotonic()
+
+        def fetch(city: str) -> WeatherData:
+            if city_deadline is not None:
+                # Runs in the task's copied context, so the caller's is untouched.
+                set_deadline(city_deadline)
+            return self._fetch_current_weather(city, False)
+
+        def fill() -> None:
+            nonlocal next_start
+            while len(pending) < max_workers and len(pending) + len(ready) < max_workers * 2:
+                if held:
+                    city = held.pop()
+                else:
+                    city = next(city_iter, None)
+                    if city is None:
+                        return
+                    # Cached cities are answered inline; only misses use a thread.
+                    data = self.cache.get(self._cache_key("weather", city))
+                    if data is not None:
+                        ready.append((city, self._localize(data)))
+                        continue
+                if interval:
+                    now = time.monotonic()
+                    if now < next_start:
+                        held.append(city)
+                        return
+                    next_start = max(next_start, now) + interval
+                # Each task runs in a copy of this context so the request
+                # deadline applies to it.
+                context = contextvars.copy_context()
+                pending[
+                    self._executor.submit(context.run, fetch, city)
+                ] = city
+
+        try:
+            fill()
+            while pending or ready or held:
+                if ready:
+                    batch = ready[:]
+                    ready.clear()
+                    yield from batch
+                    fill()
+                    continue
+                # Wake up for the held city's turn if nothing finishes first.
+                delay = max(next_start - time.monotonic(), 0.0) if held else None
+                if not pending:
+                    time.sleep(delay or 0.0)
+                    fill()
+                    continue
+                done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+                for future in done:
+                    city = pending.pop(future)
+                    try:
+                        result: Union[WeatherData, WeatherError] = future.result()
+                    except WeatherError as exc:
+                        result = exc
+                    yield city, result
+                fill()
+        finally:
+            # Abandoned generators (e.g. a disconnected client) must not
+            # keep fetching cities nobody will read.
+            for future in pending:
+                future.cancel()
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}/{endpoint}"
+    def _tile(self, latitude: float, longitude: float) -> str:
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError("Latitude must be within ±90 and longitude within ±180.")
+        return geohash.encode(latitude, longitude, self.geohash_precision)
+
+    @staticmethod
+    def _tile_params(tile: str) -> Dict[str, Any]:
+        latitude, longitude = geohash.center(tile)
+        return {"lat": round(latitude, 4), "lon": round(longitude, 4)}
+
+    def _notify(self, data: WeatherData, city: Optional[str] = None) -> None:
+        for listener in self.listeners:
+            listener(data, city)
+
+    def _fetch_bundle(
+        self,
+        city: str,
+        data: Optional[WeatherData],
+        entries: Optional[List[ForecastEntry]],
+        known: Optional[WeatherData],
+    ) -> Tuple[WeatherData, List[ForecastEntry]]:
+        """Fetch whichever of current weather and forecast is missing, in parallel."""
+
+        if known is not None:
+            params: Dict[str, Any] = {"lat": known.latitude, "lon": known.longitude}
+        else:
+            params = {"q": city}
+
+        def fetch_forecast() -> List[ForecastEntry]:
+            fetched = self._fetch("forecast", params)
+            self.cache.set(self._cache_key("forecast", city), fetched)
+            return fetched
+
+        def fetch_current() -> WeatherData:
+            fetched = self._fetch("weather", params)
+            if known is not None:
+                # Coordinates resolve to the nearest station, not the city.
+                fetched = replace(fetched, city=known.city)
+            self.cache.set(self._cache_key("weather", city), fetched)
+            self._notify(fetched, city)
+            return fetched
+
+        if data is not None:
+            return data, fetch_forecast()
+        if entries is not None:
+            return fetch_current(), entries
+        # The copied context carries the request deadline into the thread.
+        forecast = self._executor.submit(contextvars.copy_context().run, fetch_forecast)
+        try:
+            data = fetch_current()
+        except BaseException:
+            forecast.cancel()
+            raise
+        return data, forecast.result()
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="weather-fetch")
+
+    def _fetch_current_weather(self, city: str, race: bool = True) -> WeatherData:
+        """Fetch, cache and localize ``city`` after a cache miss."""
+
+        data = self._fetch("weather", {"q": city}, race=race)
+        self.cache.set(self._cache_key("weather", city), data)
+        self._notify(data, city)
+        return self._localize(data)
+
+    @property
+    def _upstream_language(self) -> str:
+        return CANONICAL_LANGUAGE if translated_locally(self.language) else self.language
+
+    def _cache_key(self, endpoint: str, city: str) -> Tuple[str, str]:
+        language = self._upstream_language
+        if language != CANONICAL_LANGUAGE:
+            # Translated upstream, so each such language has its own entries.
+            endpoint = f"{endpoint}:{language}"
+        return (endpoint, city.strip().lower())
+
+    def _localize(self, data: WeatherData) -> WeatherData:
+        data = convert_weather(data, self.units)
+        if self.language != CANONICAL_LANGUAGE:
+            data = replace(
+                data, description=describe(data.condition_id, self.language, data.description)
+            )
+        return data
+
+    def _localize_forecast(self, entries: List[ForecastEntry]) -> List[ForecastEntry]:
+        entries = convert_forecast(entries, self.units)
+        if self.language != CANONICAL_LANGUAGE:
+            entries = [
+                replace(
+                    entry,
+                    description=describe(entry.condition_id, self.language, entry.description),
+                )
+                for entry in entries
+            ]
+        return entries
+
+    def _upstream_timeout(self) -> float:
+        try:
+            return upstream_timeout(UPSTREAM_TIMEOUT)
+        except DeadlineExceeded:
+            metrics.increment("deadline.exceeded")
+            raise
+
+    def _fetch(self, kind: str, params: Dict[str, Any], race: bool = True) -> Any:
+        """Look up ``kind`` (``"weather"`` or ``"forecast"``) through the providers."""
+
+        timeout = self._upstream_timeout()
+        if self._upstream_language != CANONICAL_LANGUAGE:
+            params = {**params, "lang": self._upstream_language}
+        try:
+            return self.providers.fetch(kind, params, timeout, race=race and self.race)
+        except requests.exceptions.Timeout as exc:
+            if timeout < UPSTREAM_TIMEOUT:
+                metrics.increment("deadline.exceeded")
+                raise DeadlineExceeded("Request deadline exceeded.") from exc
+            raise NetworkError("Timed out waiting for the weather provider.") from exc
+
+    def _request(self, endpoint: str, params: Dict[str, Any]) -> bytes:
+        """Perform a GET against an OpenWeatherMap ``endpoint`` and return the raw body."""
+
+        url = self.ONECALL_URL if endpoint == "onecall" else f"{self.BASE_URL}/{endpoint}"
         request_params = {
             "appid": self.api_key,
-            "units": self.units,
-            "lang": self.language,
+            "units": CANONICAL_UNITS,
+            "lang": self._upstream_language,
             **params,
         }
 
+        timeout = self._upstream_timeout()
         try:
-            response = self.session.get(url, params=request_params, timeout=15)
+            response = self.transport.get(url, params=request_params, timeout=timeout)
             response.raise_for_status()
+        except requests.exceptions.Timeout as exc:
+            if timeout < UPSTREAM_TIMEOUT:
+                metrics.increment("deadline.exceeded")
+                raise DeadlineExceeded("Request deadline exceeded.") from exc
+            raise NetworkError("Unable to reach OpenWeatherMap.") from exc
         except requests.exceptions.RequestException as exc:
             raise NetworkError("Unable to reach OpenWeatherMap.") from exc
 
-        payload = response.json()
-        if payload.get("cod") not in (200, "200"):
-            raise WeatherAPIError(payload.get("message", "Unknown error"))
-
-        return payload
-
-    @staticmethod
-    def _parse_current(payload: Dict[str, Any]) -> WeatherData:
-        weather = payload.get("weather", [{}])[0]
-        main = payload.get("main", {})
-        wind = payload.get("wind", {})
-        sys_info = payload.get("sys", {})
-        rain = payload.get("rain", {})
-        snow = payload.get("snow", {})
-
-        precipitation = (
-            rain.get("1h")
-            or rain.get("3h")
-            or snow.get("1h")
-            or snow.get("3h")
-            or 0.0
-        )
-
-        return WeatherData(
-            city=payload.get("name", "Unknown"),
-            temperature=float(main.get("temp", 0.0)),
-            feels_like=float(main.get("feels_like", 0.0)),
-            pressure=int(main.get("pressure", 0)),
-            humidity=int(main.get("humidity", 0)),
-            wind_speed=float(wind.get("speed", 0.0)),
-            description=weather.get("description", ""),
-            icon=weather.get("icon", "01d"),
-            sunrise=int(sys_info.get("sunrise", 0)),
-            sunset=int(sys_info.get("sunset", 0)),
-            clouds=int(payload.get("clouds", {}).get("all", 0)),
-            precipitation=float(precipitation),
-        )
+        return response.content
 
-    @staticmethod
-    def _parse_forecast_entry(payload: Dict[str, Any]) -> ForecastEntry:
-        weather = payload.get("weather", [{}])[0]
-        main = payload.get("main", {})
-
-        return ForecastEntry(
-            timestamp=int(payload.get("dt", 0)),
-            temperature=float(main.get("temp", 0.0)),
-            feels_like=float(main.get("feels_like", 0.0)),
-            description=weather.get("description", ""),
-            icon=weather.get("icon", "01d"),
-        )
+    _parse_current = staticmethod(parse_current)
+    _parse_forecast_entry = staticmethod(parse_forecast_entry)
@@ -0,0 +1,229 @@
+const $ = (sel) => document.querySelector(sel);
+const currentBtn = $("#btn-current");
+const multiBtn = $("#btn-multi");
+const forecastBtn = $("#btn-forecast");
+const aiBtn = $("#btn-ai");
+const detectBtn = $("#btn-detect");
+const liveBtn = $("#btn-live");
+const locateBtn = $("#btn-locate");
+
+const status = (id, message, type = "") => {
+  const el = $(id);
+  el.textContent = message;
+  el.className = `status ${type}`;
+};
+
+const renderWeather = (data) => {
+  if (!data) return "";
+  return `
+    <div class="stat">
+      <h3>${data.city}</h3>
+      <p>Temp: ${data.temperature.toFixed(1)}°C (feels ${data.feels_like.toFixed(1)}°C)</p>
+      <p>Humidity: ${data.humidity}% | Pressure: ${data.pressure} hPa</p>
+      <p>Wind: ${data.wind_speed.toFixed(1)} m/s | Clouds: ${data.clouds}%</p>
+      <p>${data.description}</p>
+      <p>Sunrise: ${data.sunrise} · Sunset: ${data.sunset}</p>
+    </div>`;
+};
+
+currentBtn.addEventListener("click", async () => {
+  const city = $("#current-city").value.trim();
+  if (!city) return status("#current-status", "Enter a city.", "error");
+  status("#current-status", "Fetching...");
+  try {
+    const res = await fetch(`/weather?city=${encodeURIComponent(city)}`);
+    const payload = await res.json();
+    if (!res.ok) throw new Error(payload.error || "Server error");
+    $("#current-results").innerHTML = renderWeather(payload);
+    status("#current-status", "Updated", "success");
+  } catch (err) {
+    status("#current-status", err.message, "error");
+  }
+});
+
+locateBtn.addEventListener("click", () => {
+  if (!navigator.geolocation) return status("#current-status", "Geolocation unavailable.", "error");
+  status("#current-status", "Locating...");
+  navigator.geolocation.getCurrentPosition(
+    async ({ coords }) => {
+      try {
+        const url = new URL("/weather", window.location.origin);
+        url.searchParams.set("lat", coords.latitude.toFixed(5));
+        url.searchParams.set("lon", coords.longitude.toFixed(5));
+        const res = await fetch(url);
+        const payload = await res.json();
+        if (!res.ok) throw new Error(payload.error || "Server error");
+        $("#current-results").innerHTML = renderWeather(payload);
+        status("#current-status", "Updated for your location", "success");
+      } catch (err) {
+        status("#current-status", err.message, "error");
+      }
+    },
+    (err) => status("#current-status", err.message, "error"),
+    { maximumAge: 300000, timeout: 10000 }
+  );
+});
+
+const renderCityEntry = (entry) => {
+  if (entry.error) {
+    return `<div class="city-card"><strong>${entry.city}</strong><p class="status error">${entry.error}</p></div>`;
+  }
+  return `<div class="city-card">${renderWeather(entry.data)}</div>`;
+};
+
+multiBtn.addEventListener("click", async () => {
+  const raw = $("#multi-cities").value;
+  const cities = raw.split(",").map((c) => c.trim()).filter(Boolean);
+  if (!cities.length) return status("#multi-status", "Enter at least one city.", "error");
+  status("#multi-status", "Fetching...");
+  const results = $("#multi-results");
+  results.innerHTML = "";
+  try {
+    const res = await fetch("/multi-weather", {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Accept: "application/x-ndjson",
+      },
+      body: JSON.stringify({ cities }),
+    });
+    if (!res.ok) {
+      const payload = await res.json();
+      throw new Error(payload.error || "Server error");
+    }
+    // Render each city card as soon as its line arrives.
+    let received = 0;
+    const append = (line) => {
+      if (!line.trim()) return;
+      results.insertAdjacentHTML("beforeend", renderCityEntry(JSON.parse(line)));
+      received += 1;
+      status("#multi-status", `Fetched ${received} of ${cities.length}...`);
+    };
+    if (!res.body || !window.TextDecoder) {
+      (await res.text()).split("\n").forEach(append);
+    } else {
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        lines.forEach(append);
+      }
+      append(buffer + decoder.decode());
+    }
+    status("#multi-status", "Done", "success");
+  } catch (err) {
+    status("#multi-status", err.message, "error");
+  }
+});
+
+let liveSource = null;
+const liveState = {};
+
+liveBtn.addEventListener("click", () => {
+  const cities = $("#live-cities").value.split(",").map((c) => c.trim()).filter(Boolean);
+  if (liveSource) liveSource.close();
+  $("#live-results").innerHTML = "";
+  Object.keys(liveState).forEach((key) => delete liveState[key]);
+  if (!cities.length) return status("#live-status", "Enter at least one city.", "error");
+
+  const url = new URL("/subscribe", window.location.origin);
+  url.searchParams.set("cities", cities.join(","));
+  liveSource = new EventSource(url);
+  status("#live-status", "Connecting...");
+  liveSource.onopen = () => status("#live-status", "Live", "success");
+  liveSource.onerror = () => status("#live-status", "Reconnecting...", "error");
+  liveSource.addEventListener("weather", (event) => {
+    const update = JSON.parse(event.data);
+    const id = `live-${update.city.replace(/[^a-z0-9]+/gi, "-")}`;
+    let card = document.getElementById(id);
+    if (!card) {
+      card = document.createElement("div");
+      card.id = id;
+      card.className = "city-card";
+      $("#live-results").appendChild(card);
+    }
+    if (update.error) {
+      card.innerHTML = `<strong>${update.city}</strong><p class="status error">${update.error}</p>`;
+      return;
+    }
+    // Only changed fields are pushed; merge them into the last state.
+    liveState[update.city] = { ...(liveState[update.city] || {}), ...update.changed };
+    card.innerHTML = renderWeather(liveState[update.city]);
+  });
+});
+
+const renderForecast = (city, forecast) => {
+  const rows = forecast
+    .map(
+      (item) =>
+        `<tr><td>${item.time}</td><td>${item.temperature.toFixed(1)}°C</td><td>${item.feels_like.toFixed(1)}°C</td><td>${item.description}</td></tr>`
+    )
+    .join("");
+  return `
+    <h3>${city}</h3>
+    <table>
+      <thead><tr><th>Time</th><th>Temp</th><th>Feels Like</th><th>Description</th></tr></thead>
+      <tbody>${rows}</tbody>
+    </table>`;
+};
+
+forecastBtn.addEventListener("click", async () => {
+  const city = $("#forecast-city").value.trim();
+  const hours = $("#forecast-hours").value;
+  status("#forecast-status", "Fetching forecast...");
+  try {
+    const url = new URL(`/forecast`, window.location.origin);
+    if (city) url.searchParams.set("city", city);
+    url.searchParams.set("hours", hours);
+    const res = await fetch(url);
+    const payload = await res.json();
+    if (!res.ok) throw new Error(payload.error || "Server error");
+    $("#forecast-results").innerHTML = renderForecast(payload.city, payload.forecast);
+    status("#forecast-status", "Forecast loaded", "success");
+  } catch (err) {
+    status("#forecast-status", err.message, "error");
+  }
+});
+
+aiBtn.addEventListener("click", async () => {
+  const city = $("#ai-city").value.trim();
+  if (!city) return status("#ai-status", "Enter a city.", "error");
+  status("#ai-status", "Consulting AI...");
+  try {
+    const res = await fetch("/ai-advice", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ city }),
+    });
+    const payload = await res.json();
+    if (!res.ok) throw new Error(payload.error || "Server error");
+    $("#ai-result").innerHTML = `<p>${payload.advice}</p>`;
+    status("#ai-status", "Advice ready", "success");
+  } catch (err) {
+    status("#ai-status", err.message, "error");
+  }
+});
+
+detectBtn.addEventListener("click", async () => {
+  status("#detect-status", "Detecting...");
+  try {
+    // One request detects the city and returns its weather and forecast.
+    const url = new URL("/bundle", window.location.origin);
+    url.searchParams.set("hours", $("#forecast-hours").value);
+    const res = await fetch(url);
+    const payload = await res.json();
+    if (!res.ok) throw new Error(payload.error || "Could not detect");
+    $("#current-city").value = payload.city;
+    $("#forecast-city").value = payload.city;
+    $("#current-results").innerHTML = renderWeather(payload.weather);
+    $("#forecast-results").innerHTML = renderForecast(payload.city, payload.forecast);
+    status("#detect-status", `Detected: ${payload.city}`, "success");
+  } catch (err) {
+    status("#detect-status", err.message, "error");
+  }
+});
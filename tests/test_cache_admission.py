@@ -0,0 +1,89 @@
+"""TinyLFU admission in ``TTLCache``."""
+from __future__ import annotations
+
+import pytest
+
+from src.utils.cache import TTLCache
+
+# Integer keys hash the same in every run, so sketch collisions are stable.
+HOT = range(4)
+SCAN = range(1000, 1100)
+
+
+def lookup(cache: TTLCache, key: int) -> None:
+    if cache.get(key) is None:
+        cache.set(key, f"value {key}")
+
+
+def warm(cache: TTLCache, rounds: int = 5) -> None:
+    for _ in range(rounds):
+        for key in HOT:
+            lookup(cache, key)
+
+
+def cached_keys(cache: TTLCache) -> set:
+    return {key for key, _, _ in cache.entries()}
+
+
+def test_frequent_keys_survive_a_scan():
+    cache = TTLCache(maxsize=len(HOT), ttl=60, admission="tinylfu")
+    warm(cache)
+
+    for key in SCAN:
+        lookup(cache, key)
+
+    assert cached_keys(cache) == set(HOT)
+    assert cache.stats()["rejected"] == len(SCAN)
+    assert cache.stats()["admitted"] == 0
+
+
+def test_lru_admits_everything():
+    cache = TTLCache(maxsize=len(HOT), ttl=60, admission="lru")
+    warm(cache)
+
+    for key in SCAN:
+        lookup(cache, key)
+
+    assert cached_keys(cache) == set(SCAN[-len(HOT):])
+    assert "rejected" not in cache.stats()
+
+
+def test_key_requested_more_often_than_the_victim_is_admitted():
+    cache = TTLCache(maxsize=len(HOT), ttl=60, admission="tinylfu")
+    warm(cache, rounds=2)
+    newcomer = SCAN[0]
+
+    for _ in range(3):
+        lookup(cache, newcomer)
+
+    assert newcomer in cached_keys(cache)
+    assert cache.stats()["admitted"] == 1
+    # The least recently used entry made room.
+    assert HOT[0] not in cached_keys(cache)
+
+
+def test_expired_victim_is_replaced_regardless_of_frequency():
+    cache = TTLCache(maxsize=2, ttl=60, admission="tinylfu")
+    for _ in range(5):
+        cache.get("stale")
+    cache.set("stale", "old", ttl=-1)
+    cache.set("fresh", "value")
+
+    cache.set("newcomer", "value")
+
+    assert cached_keys(cache) == {"fresh", "newcomer"}
+
+
+def test_heavy_hitters_are_ranked_by_requests():
+    cache = TTLCache(maxsize=8, ttl=60, admission="tinylfu")
+    for key, requests in ((1, 5), (2, 9), (3, 2)):
+        for _ in range(requests):
+            lookup(cache, key)
+
+    assert cache.heavy_hitters(limit=2) == [(2, 9), (1, 5)]
+    assert TTLCache(admission="lru").heavy_hitters() == []
+
+
+def test_unknown_admission_policy_is_rejected():
+    with pytest.raises(ValueError):
+        TTLCache(admission="lfu")
@@ -0,0 +1,99 @@
+"""Writing and mapping back warm-start cache snapshots."""
+from __future__ import annotations
+
+import time
+
+from src.utils.cache import TTLCache
+from src.utils.cache_snapshot import CacheSnapshotter, read_snapshot, write_snapshot
+from src.utils.models import ForecastEntry, WeatherData
+
+
+def weather(city: str) -> WeatherData:
+    return WeatherData(city, 21.5, 20.0, 1012, 60, 3.2, "clear sky", "01d", 1, 2, 10, 0.4)
+
+
+def forecast() -> list:
+    return [ForecastEntry(1_700_000_000 + hour * 3600, 18.0 + hour, 17.0, "rain", "10d") for hour in range(3)]
+
+
+def test_round_trip_keeps_values_and_expiry_times(tmp_path):
+    path = tmp_path / "cache.bin"
+    expires_at = time.time() + 120
+    entries = [
+        (("weather", "lima"), expires_at, weather("Lima")),
+        (("forecast", "lima"), expires_at + 1, forecast()),
+    ]
+
+    assert write_snapshot(path, entries) == 2
+
+    assert list(read_snapshot(path)) == entries
+
+
+def test_unsupported_entries_are_not_written(tmp_path):
+    path = tmp_path / "cache.bin"
+    expires_at = time.time() + 120
+
+    written = write_snapshot(
+        path,
+        [
+            ("lima", expires_at, weather("Lima")),
+            (("weather", "oslo"), expires_at, {"city": "Oslo"}),
+            (("weather", "rome"), expires_at, weather("Rome")),
+        ],
+    )
+
+    assert written == 1
+    assert [key for key, _, _ in read_snapshot(path)] == [("weather", "rome")]
+
+
+def test_entries_expiring_before_keep_after_are_skipped(tmp_path):
+    path = tmp_path / "cache.bin"
+    now = time.time()
+    write_snapshot(
+        path,
+        [
+            (("weather", "old"), now - 10, weather("Old")),
+            (("weather", "new"), now + 10, weather("New")),
+        ],
+    )
+
+    assert [key for key, _, _ in read_snapshot(path, keep_after=now)] == [("weather", "new")]
+
+
+def test_missing_or_foreign_snapshots_yield_nothing(tmp_path):
+    foreign = tmp_path / "foreign.bin"
+    foreign.write_bytes(b"not a cache snapshot at all")
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+
+    assert list(read_snapshot(tmp_path / "missing.bin")) == []
+    assert list(read_snapshot(foreign)) == []
+    assert list(read_snapshot(empty)) == []
+
+
+def test_snapshotter_restores_a_saved_cache(tmp_path):
+    path = tmp_path / "cache.bin"
+    cache = TTLCache(maxsize=8, ttl=60, stale_ttl=30)
+    cache.set(("weather", "lima"), weather("Lima"))
+    cache.set(("weather", "gone"), weather("Gone"), ttl=-60)
+    saver = CacheSnapshotter(cache, path)
+
+    assert saver.save() == 1
+
+    restored = TTLCache(maxsize=8, ttl=60, stale_ttl=30)
+    assert CacheSnapshotter(restored, path).load() == 1
+    assert restored.get(("weather", "lima")) == weather("Lima")
+    assert restored.entries()[0][1] == cache.entries()[0][1]
+
+
+def test_save_carries_over_entries_from_other_processes(tmp_path):
+    path = tmp_path / "cache.bin"
+    first = TTLCache(maxsize=8, ttl=60)
+    first.set(("weather", "lima"), weather("Lima"))
+    CacheSnapshotter(first, path).save()
+
+    second = TTLCache(maxsize=8, ttl=60)
+    second.set(("weather", "oslo"), weather("Oslo"))
+    assert CacheSnapshotter(second, path).save() == 2
+
+    assert {key for key, _, _ in read_snapshot(path)} == {("weather", "lima"), ("weather", "oslo")}
@@ -0,0 +1,122 @@
+"""Racing, failover and latency tracking of ``ProviderPool``."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional
+
+import pytest
+
+from src.utils.exceptions import NetworkError, WeatherAPIError
+from src.utils.providers import FAILURE_THRESHOLD, LocalProvider, ProviderPool
+
+TIMEOUT = 2.0
+
+
+class RejectingProvider:
+    """Answers every lookup with an error, like an unknown city upstream."""
+
+    name = "rejecting"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        timeout: float,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        self.calls += 1
+        raise WeatherAPIError("city not found")
+
+
+def test_race_returns_the_faster_provider_and_cancels_the_other():
+    fast = LocalProvider("fast", latency=0.01)
+    slow = LocalProvider("slow", latency=1.0)
+    pool = ProviderPool([slow, fast])
+
+    data = pool.fetch("weather", {"q": "Lima"}, TIMEOUT, race=True)
+
+    assert data.city == "Lima"
+    assert pool.health["fast"].wins == 1
+    assert pool.health["slow"].wins == 0
+    # The loser stops waiting once it is cancelled.
+    for _ in range(100):
+        if slow.cancelled:
+            break
+        threading.Event().wait(0.01)
+    assert slow.cancelled == 1
+
+
+def test_race_prefers_the_two_fastest_providers():
+    fast = LocalProvider("fast", latency=0.01)
+    medium = LocalProvider("medium", latency=0.05)
+    slow = LocalProvider("slow", latency=0.2)
+    pool = ProviderPool([slow, medium, fast])
+    # Give every provider a latency estimate.
+    for provider in (slow, medium, fast):
+        pool._call(provider, "weather", {"q": "Lima"}, TIMEOUT)
+    calls = slow.calls
+
+    pool.fetch("weather", {"q": "Oslo"}, TIMEOUT, race=True)
+
+    assert slow.calls == calls
+    assert pool.health["fast"].latency_ms < pool.health["medium"].latency_ms < pool.health["slow"].latency_ms
+
+
+def test_failover_falls_through_to_the_next_provider():
+    broken = LocalProvider("broken", failure_rate=1.0)
+    backup = LocalProvider("backup")
+    pool = ProviderPool([broken, backup])
+
+    data = pool.fetch("weather", {"q": "Lima"}, TIMEOUT)
+
+    assert data.city == "Lima"
+    assert (broken.calls, backup.calls) == (1, 1)
+    assert pool.health["broken"].failures == 1
+    assert pool.health["backup"].failures == 0
+
+
+def test_failing_provider_is_skipped_after_repeated_failures():
+    broken = LocalProvider("broken", failure_rate=1.0)
+    backup = LocalProvider("backup")
+    pool = ProviderPool([broken, backup])
+
+    for _ in range(FAILURE_THRESHOLD + 2):
+        pool.fetch("weather", {"q": "Lima"}, TIMEOUT)
+
+    assert broken.calls == FAILURE_THRESHOLD
+    assert not pool.health["broken"].available
+
+
+def test_error_answer_is_not_retried_on_other_providers():
+    rejecting = RejectingProvider()
+    backup = LocalProvider("backup")
+    pool = ProviderPool([rejecting, backup])
+
+    with pytest.raises(WeatherAPIError, match="city not found"):
+        pool.fetch("weather", {"q": "Nowhere"}, TIMEOUT)
+
+    assert backup.calls == 0
+    # An error answer still shows the provider is up.
+    assert pool.health["rejecting"].failures == 0
+
+
+def test_first_error_is_raised_when_every_provider_fails():
+    pool = ProviderPool([LocalProvider("a", failure_rate=1.0), LocalProvider("b", failure_rate=1.0)])
+
+    with pytest.raises(NetworkError, match="Unable to reach a"):
+        pool.fetch("weather", {"q": "Lima"}, TIMEOUT)
+
+
+def test_close_stops_the_race_threads():
+    pool = ProviderPool([LocalProvider("a", latency=0.01), LocalProvider("b", latency=0.01)])
+    pool.fetch("weather", {"q": "Lima"}, TIMEOUT, race=True)
+    executor = pool._executor
+
+    pool.close()
+
+    assert pool._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
@@ -0,0 +1,170 @@
+"""Sliding-window limits and round-robin upstream slots."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import List
+
+import pytest
+
+from src.utils.rate_limit import FairQueue, SlidingWindowLimiter
+
+START = 600.0  # on a window boundary
+
+
+def test_requests_are_charged_their_cost():
+    limiter = SlidingWindowLimiter(limit=10, window=60)
+
+    first = limiter.acquire("a", cost=6, now=START)
+    second = limiter.acquire("a", cost=5, now=START + 1)
+
+    assert first.allowed and first.remaining == 4
+    assert not second.allowed
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_clients_have_separate_budgets():
+    limiter = SlidingWindowLimiter(limit=10, window=60)
+
+    limiter.acquire("a", cost=10, now=START)
+
+    assert not limiter.acquire("a", now=START).allowed
+    assert limiter.acquire("b", now=START).allowed
+
+
+def test_previous_window_decays_linearly():
+    limiter = SlidingWindowLimiter(limit=10, window=60)
+    limiter.acquire("a", cost=6, now=START)
+
+    # Fully overlapping: 6 still counts.
+    assert not limiter.acquire("a", cost=5, now=START + 60).allowed
+    # Half way through the next window only 3 counts.
+    assert limiter.acquire("a", cost=5, now=START + 90).allowed
+
+
+def test_retry_after_is_when_the_cost_fits():
+    limiter = SlidingWindowLimiter(limit=10, window=60)
+    limiter.acquire("a", cost=6, now=START)
+
+    decision = limiter.acquire("a", cost=5, now=START)
+
+    # 6 decays to 5 ten seconds into the next window.
+    assert decision.retry_after == pytest.approx(70)
+    assert limiter.acquire("a", cost=5, now=START + decision.retry_after).allowed
+
+
+def test_cost_above_the_limit_waits_a_full_window():
+    limiter = SlidingWindowLimiter(limit=10, window=60)
+
+    decision = limiter.acquire("a", cost=11, now=START)
+
+    assert not decision.allowed
+    assert decision.retry_after == 60
+
+
+def test_decision_headers():
+    limiter = SlidingWindowLimiter(limit=10, window=60)
+
+    allowed = limiter.acquire("a", cost=4, now=START + 15).headers()
+    rejected = limiter.acquire("a", cost=7, now=START + 15).headers()
+
+    assert allowed == {"RateLimit-Limit": "10", "RateLimit-Remaining": "6", "RateLimit-Reset": "45"}
+    assert rejected["RateLimit-Remaining"] == "6"
+    # 4 decays to 3 a quarter of the way into the next window.
+    assert rejected["Retry-After"] == "60"
+
+
+def test_least_recently_seen_clients_are_forgotten():
+    limiter = SlidingWindowLimiter(limit=10, window=60, max_clients=2)
+    limiter.acquire("a", cost=10, now=START)
+    limiter.acquire("b", now=START)
+    limiter.acquire("c", now=START)
+
+    assert limiter.stats()["clients"] == 2
+    assert limiter.acquire("a", cost=10, now=START).allowed
+
+
+def _wait_until(condition, timeout: float = 2.0) -> None:
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.005)
+
+
+def test_free_slots_are_taken_without_waiting():
+    queue = FairQueue(capacity=3, timeout=1)
+
+    assert queue.acquire("a", weight=2) == 2
+    assert queue.acquire("b") == 1
+    assert queue.stats()["in_use"] == 3
+
+    queue.release(2)
+    queue.release(1)
+    assert queue.stats()["in_use"] == 0
+
+
+def test_weight_is_capped_at_capacity():
+    queue = FairQueue(capacity=2, timeout=1)
+
+    assert queue.acquire("a", weight=5) == 2
+
+
+def test_freed_slots_go_round_robin_between_clients():
+    queue = FairQueue(capacity=1, timeout=5)
+    held = queue.acquire("busy")
+    order: List[str] = []
+    lock = threading.Lock()
+
+    def request(client: str, name: str) -> None:
+        queue.acquire(client)
+        with lock:
+            order.append(name)
+
+    threads = []
+    # The busy client queues three requests before the quiet one arrives.
+    for client, name in (("busy", "busy-1"), ("busy", "busy-2"), ("busy", "busy-3"), ("quiet", "quiet-1")):
+        thread = threading.Thread(target=request, args=(client, name))
+        thread.start()
+        threads.append(thread)
+        waiting = len(threads)
+        _wait_until(lambda: queue.stats()["waiting"] == waiting)
+
+    queue.release(held)
+    for granted in range(1, 5):
+        _wait_until(lambda: len(order) == granted)
+        queue.release(1)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["busy-1", "quiet-1", "busy-2", "busy-3"]
+
+
+def test_heavy_request_at_the_head_is_not_overtaken():
+    queue = FairQueue(capacity=2, timeout=5)
+    held = queue.acquire("a")
+    granted: List[str] = []
+
+    heavy = threading.Thread(target=lambda: granted.append("heavy") if queue.acquire("b", weight=2) else None)
+    heavy.start()
+    _wait_until(lambda: queue.stats()["waiting"] == 1)
+
+    # One slot is free, but the light request queues behind the heavy one.
+    assert queue.acquire("c", timeout=0.05) == 0
+    queue.release(held)
+    heavy.join()
+
+    assert granted == ["heavy"]
+
+
+def test_timed_out_waiters_leave_the_queue():
+    queue = FairQueue(capacity=1, timeout=0.05)
+    queue.acquire("a")
+
+    assert queue.acquire("b") == 0
+    assert queue.stats() == {
+        "capacity": 1,
+        "in_use": 1,
+        "waiting": 0,
+        "waiting_clients": 0,
+        "timeouts": 1,
+    }